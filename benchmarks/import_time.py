@@ -0,0 +1,120 @@
+"""Measures the import time of cloudgeass modules against a budget.
+
+Each module is imported in a fresh Python interpreter with `-X importtime`
+and the cumulative import time reported by the interpreter is collected.
+The median of repeated runs is compared against a per-module budget, so
+changes that bring heavy dependencies back to the import chain (and hurt
+cold starts on AWS Lambda) are caught early.
+
+Usage:
+    python -m benchmarks.import_time --repeat 7 --output import_time.json
+
+___
+"""
+
+# Importing libraries
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+# Import time budget (in milliseconds) for each cloudgeass module
+IMPORT_TIME_BUDGETS_MS = {
+    "cloudgeass.aws.factory": 30,
+    "cloudgeass.aws.base": 30,
+    "cloudgeass.aws.s3": 50,
+    "cloudgeass.aws.ec2": 50,
+    "cloudgeass.aws.secrets": 50
+}
+
+# Dependencies that must never be loaded just by importing cloudgeass
+HEAVY_DEPENDENCIES = ("pandas", "pyarrow", "boto3", "botocore", "requests")
+
+
+def measure_import_time(module_name: str, repeat: int = 5) -> dict:
+    """Measures the cumulative import time of a module in fresh interpreters.
+
+    Args:
+        module_name (str): The module to be imported.
+        repeat (int): How many fresh interpreters are used to measure.
+
+    Returns:
+        A dictionary with the median and all measured times in milliseconds
+        and the heavy dependencies loaded by the import.
+    """
+
+    check_code = (
+        f"import sys, {module_name}; "
+        f"print(','.join(m for m in {HEAVY_DEPENDENCIES!r} "
+        "if m in sys.modules))"
+    )
+
+    times_ms = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", check_code],
+            capture_output=True, text=True, check=True
+        )
+
+        # Lines follow the format "import time: self | cumulative | name"
+        for line in result.stderr.splitlines():
+            fields = [f.strip() for f in line.split("|")]
+            if len(fields) == 3 and fields[2] == module_name:
+                times_ms.append(int(fields[1]) / 1000)
+
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+
+    return {
+        "median_ms": statistics.median(times_ms),
+        "times_ms": times_ms,
+        "heavy_dependencies_loaded": loaded
+    }
+
+
+def run(repeat: int = 5) -> dict:
+    """Measures all modules with a budget and flags the ones over it.
+
+    Args:
+        repeat (int): How many fresh interpreters are used for each module.
+
+    Returns:
+        A dictionary with the measurements of each module.
+    """
+
+    results = {}
+    for module_name, budget_ms in IMPORT_TIME_BUDGETS_MS.items():
+        measurement = measure_import_time(module_name, repeat=repeat)
+        measurement["budget_ms"] = budget_ms
+        over_budget = measurement["median_ms"] > budget_ms
+        measurement["within_budget"] = not (
+            over_budget or measurement["heavy_dependencies_loaded"]
+        )
+        results[module_name] = measurement
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None,
+                        help="Optional path of a JSON file with the results")
+    args = parser.parse_args()
+
+    results = run(repeat=args.repeat)
+    for module_name, measurement in results.items():
+        status = "ok" if measurement["within_budget"] else "OVER BUDGET"
+        print(f"{module_name:<28} {measurement['median_ms']:>8.2f} ms "
+              f"(budget {measurement['budget_ms']} ms) {status}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 0 if all(m["within_budget"] for m in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Benchmarks listing, reporting and partition lookups on synthetic buckets.
+
+Buckets with thousands to millions of keys are served by the stub backend
+of `cloudgeass.testing.backends`, so results reflect the cost of botocore
+parsing, pagination and cloudgeass processing (e.g. building DataFrames and
+parsing partitions) without any network noise. For each bucket size and method the
+benchmark collects:
+
+- latency of each repeated call and their median
+- throughput in listed keys per second
+- peak memory allocated by Python during a call (measured with tracemalloc
+  on a separate call, since tracing slows everything down)
+
+Results are saved as JSON together with the environment and git commit, so
+runs of different releases can be compared.
+
+Usage:
+    python -m benchmarks.listing --keys 10000 100000 1000000 --output listing.json
+
+___
+"""
+
+# Importing libraries
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+
+from cloudgeass.testing.backends import StubS3Backend, SyntheticBucket
+
+
+# Bucket sizes (number of keys) measured by default
+DEFAULT_KEY_COUNTS = (10_000, 100_000, 1_000_000)
+
+# Methods measured for each bucket size
+BENCHMARKED_METHODS = (
+    "bucket_objects_report",
+    "all_buckets_objects_report",
+    "get_last_date_partition"
+)
+
+
+def git_commit() -> str:
+    """Returns the current git commit hash or None outside a git repo."""
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    """Describes where the benchmark ran."""
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine()
+    }
+
+
+def measure(func, n_keys: int, repeat: int = 3) -> dict:
+    """Measures latency, throughput and peak memory of a callable.
+
+    Args:
+        func (Callable): The callable to be measured (no arguments).
+        n_keys (int): How many keys each call processes.
+        repeat (int): How many timed calls are made.
+
+    Returns:
+        A dictionary with the measurements.
+    """
+
+    # Warming up botocore models and lazy imports before timing anything
+    func()
+
+    latencies_s = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies_s.append(time.perf_counter() - start)
+
+    # Measuring memory on a separate call as tracemalloc distorts timings
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median_s = statistics.median(latencies_s)
+    return {
+        "keys": n_keys,
+        "repeat": repeat,
+        "latencies_s": latencies_s,
+        "median_s": median_s,
+        "min_s": min(latencies_s),
+        "max_s": max(latencies_s),
+        "throughput_keys_per_s": n_keys / median_s if median_s else None,
+        "peak_memory_mb": peak_bytes / 2 ** 20
+    }
+
+
+def run(
+    key_counts: tuple = DEFAULT_KEY_COUNTS,
+    n_buckets: int = 4,
+    repeat: int = 3,
+    methods: tuple = BENCHMARKED_METHODS
+) -> dict:
+    """Runs the benchmark for each bucket size.
+
+    Args:
+        key_counts (tuple): Total number of keys of each scenario.
+        n_buckets (int): How many buckets share the keys on
+            `all_buckets_objects_report` scenarios.
+        repeat (int): How many timed calls are made for each method.
+        methods (tuple): The S3Client methods to be measured.
+
+    Returns:
+        A dictionary with the environment and the results of each scenario.
+    """
+
+    results = {}
+    for n_keys in key_counts:
+        # A single bucket holds all keys on single-bucket scenarios
+        single = StubS3Backend([SyntheticBucket("bench-bucket", n_keys)])
+        s3_single = single.s3_client()
+
+        # Keys are spread across many buckets on the all buckets scenario
+        many = StubS3Backend([
+            SyntheticBucket(f"bench-bucket-{i:02d}", n_keys // n_buckets)
+            for i in range(n_buckets)
+        ])
+        s3_many = many.s3_client()
+
+        calls = {
+            "bucket_objects_report": partial(
+                s3_single.bucket_objects_report,
+                bucket_name="bench-bucket"
+            ),
+            "all_buckets_objects_report": s3_many.all_buckets_objects_report,
+            "get_last_date_partition": partial(
+                s3_single.get_last_date_partition,
+                bucket_name="bench-bucket",
+                table_prefix="table/"
+            )
+        }
+
+        results[str(n_keys)] = {
+            method: measure(calls[method], n_keys=n_keys, repeat=repeat)
+            for method in methods
+        }
+
+    return {"environment": environment(), "results": results}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--keys", type=int, nargs="+",
+                        default=list(DEFAULT_KEY_COUNTS),
+                        help="Bucket sizes to measure (e.g. 10000 10000000)")
+    parser.add_argument("--buckets", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--methods", nargs="+", choices=BENCHMARKED_METHODS,
+                        default=list(BENCHMARKED_METHODS))
+    parser.add_argument("--output", default=None,
+                        help="Optional path of a JSON file with the results")
+    args = parser.parse_args()
+
+    report = run(key_counts=args.keys, n_buckets=args.buckets,
+                 repeat=args.repeat, methods=args.methods)
+    for n_keys, scenario in report["results"].items():
+        for method, measurement in scenario.items():
+            print(f"{method:<28} {int(n_keys):>10} keys "
+                  f"{measurement['median_s']:>9.3f} s "
+                  f"{measurement['throughput_keys_per_s']:>12.0f} keys/s "
+                  f"{measurement['peak_memory_mb']:>9.1f} MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
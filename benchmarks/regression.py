@@ -0,0 +1,315 @@
+"""Fails when the throughput of cloudgeass hot paths regresses.
+
+Each run measures the throughput of a set of scenarios served by the stubbed
+backends of `cloudgeass.testing.backends` (so no network access or AWS
+credentials are needed):
+
+- `list_objects`: keys per second listed by `S3Client.bucket_objects_report`
+- `read_objects`: objects per second read by `S3Client.read_objects`
+- `get_secret_string`: secrets per second retrieved by
+  `SecretsManagerClient.get_secret_string`
+
+Scenarios are measured in interleaved rounds. Each round also times a
+pure-Python calibration workload, and throughputs are divided by the
+calibration speed of the same round, so runs taken while the machine is
+slower or faster (CPU frequency scaling, noisy neighbours) stay comparable.
+Each scenario is summarized by the median and median absolute deviation
+(MAD) of its relative throughput.
+
+Runs are stored in a JSON history keyed by git commit and the new run is
+compared against a baseline run. A scenario only regresses when its median
+relative throughput drops by more than both the tolerance and the noise
+observed between repeats, so noisy machines don't produce false alarms.
+
+Usage:
+    python -m benchmarks.regression --repeat 7 --baseline <commit>
+
+___
+"""
+
+# Importing libraries
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from functools import partial
+
+from benchmarks.listing import environment, git_commit
+from cloudgeass.testing.backends import (
+    StubS3Backend,
+    StubSecretsManagerBackend,
+    SyntheticBucket
+)
+from cloudgeass.testing.data import fake_payload
+
+
+# Where run results are stored by default
+DEFAULT_HISTORY_PATH = os.path.join(".benchmarks", "history.json")
+
+# A regression must be larger than this fraction of the baseline median
+DEFAULT_TOLERANCE = 0.15
+
+# ...and larger than this many (scaled) MADs of the noisier run
+DEFAULT_NOISE_FACTOR = 3.0
+
+# Scales the MAD to estimate the standard deviation of normal samples
+MAD_SCALE = 1.4826
+
+
+def _list_objects_scenario() -> tuple:
+    n_keys = 20_000
+    backend = StubS3Backend([SyntheticBucket("bench-bucket", n_keys)])
+    s3 = backend.s3_client()
+
+    return partial(s3.bucket_objects_report, bucket_name="bench-bucket"), \
+        n_keys
+
+
+def _read_objects_scenario() -> tuple:
+    n_objects = 256
+    backend = StubS3Backend([])
+    body = fake_payload(format="csv", n_rows=200)
+    keys = [f"table/part-{i:05d}.csv" for i in range(n_objects)]
+    for key in keys:
+        backend.put_body("bench-bucket", key, body)
+    s3 = backend.s3_client()
+
+    return partial(s3.read_objects, bucket_name="bench-bucket", keys=keys), \
+        n_objects
+
+
+def _get_secret_string_scenario() -> tuple:
+    n_calls = 500
+    secret_ids = [f"bench-secret-{i:03d}" for i in range(50)]
+    backend = StubSecretsManagerBackend(
+        {secret_id: '{"user": "bench"}' for secret_id in secret_ids}
+    )
+    sm = backend.secrets_client()
+
+    def get_secrets():
+        for i in range(n_calls):
+            sm.get_secret_string(secret_ids[i % len(secret_ids)])
+
+    return get_secrets, n_calls
+
+
+# Scenarios by name: each builder returns a callable and the items it handles
+SCENARIOS = {
+    "list_objects": _list_objects_scenario,
+    "read_objects": _read_objects_scenario,
+    "get_secret_string": _get_secret_string_scenario
+}
+
+
+def summarize(values: list) -> dict:
+    """Summarizes repeated measurements by their median and MAD."""
+
+    median = statistics.median(values)
+    return {
+        "values": values,
+        "median": median,
+        "mad": statistics.median(abs(v - median) for v in values)
+    }
+
+
+def _calibration() -> None:
+    # A fixed pure-Python workload used to normalize the machine speed
+    values = {}
+    for i in range(200_000):
+        values[i % 1000] = str(i)
+
+
+def run_scenarios(scenarios: list = list(SCENARIOS), repeat: int = 7) -> dict:
+    """Measures the throughput (items per second) of the given scenarios.
+
+    Args:
+        scenarios (list): Names of the scenarios to be measured.
+        repeat (int): How many rounds of timed calls are made.
+
+    Returns:
+        A dictionary with the summary of the relative throughput of each
+        scenario and the median of its absolute throughput ("items_per_s").
+    """
+
+    calls = {name: SCENARIOS[name]() for name in scenarios}
+
+    # Warming up botocore models and lazy imports before timing anything
+    for func, _ in calls.values():
+        func()
+
+    throughputs = {name: [] for name in calls}
+    relative = {name: [] for name in calls}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _calibration()
+        calibration_speed = 1 / (time.perf_counter() - start)
+
+        for name, (func, items) in calls.items():
+            start = time.perf_counter()
+            func()
+            throughput = items / (time.perf_counter() - start)
+            throughputs[name].append(throughput)
+            relative[name].append(throughput / calibration_speed)
+
+    return {
+        name: dict(summarize(relative[name]),
+                   items_per_s=statistics.median(throughputs[name]))
+        for name in calls
+    }
+
+
+def compare_runs(
+    baseline: dict,
+    current: dict,
+    tolerance: float = DEFAULT_TOLERANCE,
+    noise_factor: float = DEFAULT_NOISE_FACTOR
+) -> dict:
+    """Compares the scenarios of a run against a baseline run.
+
+    Args:
+        baseline (dict): Scenario summaries of the baseline run.
+        current (dict): Scenario summaries of the new run.
+        tolerance (float): The relative drop of the median throughput
+            always accepted (e.g. 0.15 for 15%).
+        noise_factor (float): How many scaled MADs of the noisier run are
+            treated as noise.
+
+    Returns:
+        A dictionary with the comparison of each scenario found in both
+        runs. Each status is "regression", "improvement" or "unchanged".
+    """
+
+    comparison = {}
+    for name in current:
+        if name not in baseline:
+            continue
+
+        base, new = baseline[name], current[name]
+        noise = noise_factor * MAD_SCALE * max(base["mad"], new["mad"])
+        threshold = max(tolerance * base["median"], noise)
+        delta = new["median"] - base["median"]
+
+        if delta < -threshold:
+            status = "regression"
+        elif delta > threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+
+        comparison[name] = {
+            "baseline_median": base["median"],
+            "current_median": new["median"],
+            "baseline_items_per_s": base.get("items_per_s"),
+            "current_items_per_s": new.get("items_per_s"),
+            "change_pct": 100 * delta / base["median"],
+            "threshold": threshold,
+            "status": status
+        }
+
+    return comparison
+
+
+def run_key() -> str:
+    """Returns the key of the current run (the commit, flagged if dirty)."""
+
+    commit = git_commit() or "unknown"
+    try:
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"]).returncode
+    except OSError:
+        dirty = 0
+
+    return f"{commit}-dirty" if dirty else commit
+
+
+def load_history(path: str) -> dict:
+    """Loads the history of runs (an empty one if the file doesn't exist)."""
+
+    if not os.path.exists(path):
+        return {"runs": {}}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_history(history: dict, path: str) -> None:
+    """Saves the history of runs as JSON."""
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2)
+
+
+def latest_run_key(history: dict, exclude: str = None) -> str:
+    """Returns the key of the most recent stored run except `exclude`."""
+
+    runs = [(run["environment"]["timestamp"], key)
+            for key, run in history["runs"].items() if key != exclude]
+
+    return max(runs)[1] if runs else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS),
+                        default=list(SCENARIOS))
+    parser.add_argument("--history", default=DEFAULT_HISTORY_PATH,
+                        help="JSON file with the results of previous runs")
+    parser.add_argument("--baseline", default=None,
+                        help="Run key (commit) to compare against. Defaults "
+                             "to the most recent stored run")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--noise-factor", type=float,
+                        default=DEFAULT_NOISE_FACTOR)
+    parser.add_argument("--no-save", action="store_true",
+                        help="Don't store this run in the history")
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    key = run_key()
+    current = run_scenarios(args.scenarios, repeat=args.repeat)
+
+    baseline_key = args.baseline or latest_run_key(history, exclude=key)
+    if baseline_key is not None and baseline_key not in history["runs"]:
+        print(f"Baseline {baseline_key} not found in {args.history}")
+        return 2
+
+    # Taken before saving, as the current run may replace the same key
+    baseline = history["runs"][baseline_key]["scenarios"] \
+        if baseline_key is not None else None
+
+    if not args.no_save:
+        history["runs"][key] = {
+            "environment": environment(),
+            "scenarios": current
+        }
+        save_history(history, args.history)
+
+    if baseline is None:
+        for name, summary in current.items():
+            print(f"{name:<20} {summary['items_per_s']:>12.0f} items/s")
+        print("No baseline to compare against yet")
+        return 0
+
+    comparison = compare_runs(
+        baseline=baseline,
+        current=current,
+        tolerance=args.tolerance,
+        noise_factor=args.noise_factor
+    )
+    print(f"Comparing {key} against {baseline_key}")
+    for name, result in comparison.items():
+        print(f"{name:<20} {result['baseline_items_per_s']:>12.0f} -> "
+              f"{result['current_items_per_s']:>12.0f} items/s "
+              f"({result['change_pct']:+.1f}%) {result['status'].upper()}")
+
+    regressions = [r for r in comparison.values()
+                   if r["status"] == "regression"]
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
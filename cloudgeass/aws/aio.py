@@ -0,0 +1,532 @@
+"""
+Module: cloudgeass.aws.aio
+
+The module provides asyncio variants of cloudgeass service classes, so
+applications running on an event loop can call AWS without blocking it.
+Their methods are awaitable equivalents of the ones of `S3Client` and
+`SecretsManagerClient`, so thousands of calls can run concurrently on a
+single thread.
+
+Async clients are built on aiobotocore, an optional dependency installed
+with `pip install cloudgeass[aio]`. It's only imported when the first
+client is opened.
+
+Examples:
+    ```python
+    # Importing the class
+    import asyncio
+    from cloudgeass.aws.aio import AsyncS3Client
+
+    async def main():
+        async with AsyncS3Client() as s3:
+            buckets = await s3.list_buckets()
+            async for df_page in s3.bucket_objects_report(buckets[0]):
+                print(df_page.shape)
+
+    asyncio.run(main())
+    ```
+
+___
+"""
+
+# Importing libraries
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+
+from cloudgeass.aws.factory import _apply_client_hooks
+from cloudgeass.aws.profiles import (
+    get_performance_config,
+    get_max_pool_connections
+)
+from cloudgeass.aws.s3 import S3Client, objects_report_batch
+from cloudgeass.utils.lazy import lazy_import
+from cloudgeass.utils.log import log_config
+from cloudgeass.utils.tracing import traced, span
+
+# aiobotocore is an optional dependency, only imported when a client is opened
+aiobotocore_session = lazy_import("aiobotocore.session")
+aiobotocore_config = lazy_import("aiobotocore.config")
+
+
+class AsyncBaseClient():
+    """Base class for asyncio cloudgeass service classes.
+
+    Async service classes (e.g. `AsyncS3Client`) inherit from this class and
+    just set the `service_name` class attribute. The aiobotocore client is
+    opened on the first awaited call and shared by every coroutine of the
+    object. Its connection pool holds up to `max_workers` connections, so
+    concurrent calls beyond it wait for a free connection instead of
+    opening new ones.
+
+    Objects are bound to the event loop that opened their client. They must
+    be closed when they are no longer needed, either by `close()` or by using
+    them as async context managers.
+
+    Args:
+        logger_level (int, optional):
+            The logger level to be configured on the class logger object
+
+        performance_profile (str, optional):
+            A named performance profile from `cloudgeass.aws.profiles` (e.g.
+            "high_throughput", "low_latency" or "lambda"). A `config`
+            keyword argument, if given, takes precedence over the profile.
+
+    Attributes:
+        logger (logging.Logger):
+            A logger object to log steps according to a predefined logger level
+
+        client_kwargs (dict):
+            Keyword arguments used to create the client (e.g. `region_name`,
+            `endpoint_url`, `config` or `profile_name`)
+
+        max_workers (int):
+            The connection pool size of the client
+    """
+
+    # The aiobotocore service name handled by the class
+    service_name = None
+
+    def __init__(
+        self,
+        logger_level=logging.INFO,
+        performance_profile: str = None,
+        **client_kwargs
+    ):
+        self.logger_level = logger_level
+        self.logger = log_config(logger_level=logger_level)
+
+        # Applying the performance profile on the botocore config
+        self.performance_profile = performance_profile
+        if performance_profile is not None:
+            client_kwargs["config"] = get_performance_config(
+                performance_profile=performance_profile,
+                config=client_kwargs.get("config")
+            )
+
+        # The client is only opened on the first awaited call
+        self.client_kwargs = client_kwargs
+        self._client = None
+        self._exit_stack = None
+        self._lock = None
+
+    @property
+    def max_workers(self) -> int:
+        """The connection pool size of the client."""
+
+        return get_max_pool_connections(self.client_kwargs.get("config"))
+
+    async def __aenter__(self):
+        await self.get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def get_client(self):
+        """
+        Returns the aiobotocore client of the object, opening it if needed.
+
+        Returns:
+            aiobotocore.client.AioBaseClient: A client shared by all
+            coroutines of the object.
+        """
+
+        if self._client is None:
+            # Locks are bound to the loop running when they are first used
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+
+            async with self._lock:
+                if self._client is None:
+                    await self._open_client()
+
+        return self._client
+
+    async def _open_client(self) -> None:
+        client_kwargs = dict(self.client_kwargs)
+        session = aiobotocore_session.AioSession(
+            profile=client_kwargs.pop("profile_name", None)
+        )
+
+        # The connection pool of aiohttp is sized by max_pool_connections,
+        # and merging keeps the options set on the botocore config
+        config = client_kwargs.get("config")
+        if config is not None and \
+                not isinstance(config, aiobotocore_config.AioConfig):
+            client_kwargs["config"] = aiobotocore_config.AioConfig().merge(
+                config
+            )
+
+        # The client is closed if hooks can't be applied on it
+        async with contextlib.AsyncExitStack() as exit_stack:
+            client = await exit_stack.enter_async_context(
+                session.create_client(self.service_name, **client_kwargs)
+            )
+
+            # Async clients emit the same tracing spans and metrics of clients
+            _apply_client_hooks(client)
+
+            self._client = client
+            self._exit_stack = exit_stack.pop_all()
+
+    async def close(self) -> None:
+        """Closes the client and its connections (it's reopened if needed)."""
+
+        if self._exit_stack is not None:
+            exit_stack = self._exit_stack
+            self._client, self._exit_stack = None, None
+            await exit_stack.aclose()
+
+
+class AsyncS3Client(AsyncBaseClient):
+    """Handles S3 operations on asyncio event loops.
+
+    This class provides awaitable equivalents of some `S3Client` methods.
+    Its coroutines can be freely gathered: all of them share the same
+    client and connection pool.
+
+    Examples:
+        ```python
+        # Importing the class
+        import asyncio
+        from cloudgeass.aws.aio import AsyncS3Client
+
+        async def main():
+            async with AsyncS3Client() as s3:
+                return await asyncio.gather(*(
+                    s3.get_last_date_partition(
+                        bucket_name="some-bucket",
+                        table_prefix=table
+                    )
+                    for table in ["orders", "customers", "payments"]
+                ))
+
+        last_partitions = asyncio.run(main())
+        ```
+
+    Args:
+        logger_level (int, optional):
+            The logger level to be configured on the class logger object
+
+        performance_profile (str, optional):
+            A named botocore performance profile ("high_throughput",
+            "low_latency" or "lambda") from `cloudgeass.aws.profiles`
+
+    Methods:
+        list_buckets() -> list:
+            Lists the names of all S3 buckets associated with the client.
+
+        bucket_objects_report() -> AsyncIterator[pd.DataFrame]:
+            Yields a report of objects within a bucket, page by page.
+
+        get_date_partition_value_from_prefix() -> int:
+            Extracts the date partition value from a given URI prefix.
+
+        get_last_date_partition() -> int:
+            Retrieves the last date partition from a table in a S3 bucket.
+    """
+
+    # The aiobotocore service name handled by the class
+    service_name = "s3"
+
+    # Parsing partitions doesn't call AWS, so it's the same of S3Client
+    get_date_partition_value_from_prefix = \
+        S3Client.get_date_partition_value_from_prefix
+
+    @traced("AsyncS3Client.list_buckets")
+    async def list_buckets(self) -> list:
+        """
+        Lists the names of all S3 buckets associated with the client.
+
+        Returns:
+            list: A list of bucket names.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.aio import AsyncS3Client
+
+            # Getting the list of buckets within a coroutine
+            async with AsyncS3Client() as s3:
+                buckets = await s3.list_buckets()
+            ```
+        """
+
+        client = await self.get_client()
+
+        self.logger.debug("Retrieving the list of S3 bucket names")
+        response = await client.list_buckets()
+        buckets = [b["Name"] for b in response["Buckets"]]
+        self.logger.debug(f"There are {len(buckets)} buckets in the list")
+
+        return buckets
+
+    async def bucket_objects_report(
+        self,
+        bucket_name: str,
+        prefix: str = "",
+        as_batches: bool = False
+    ):
+        """
+        Yields a report of objects within a S3 bucket, page by page.
+
+        Each listing page (up to 1000 objects) is yielded as soon as it's
+        received, with the same columns of `S3Client.bucket_objects_report()`,
+        so the event loop is only held while a single page is converted.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            prefix (str, optional): A prefix to filter objects.
+            as_batches (bool, optional): Whether pages are yielded as Arrow
+                record batches instead of pandas DataFrames.
+
+        Yields:
+            pd.DataFrame | pa.RecordBatch: The report of a listing page.
+            Empty pages are skipped.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+
+        Examples:
+            ```python
+            # Importing the class
+            import pandas as pd
+            from cloudgeass.aws.aio import AsyncS3Client
+
+            # Building a complete report within a coroutine
+            async with AsyncS3Client() as s3:
+                df_objects_report = pd.concat([
+                    df_page async for df_page in s3.bucket_objects_report(
+                        bucket_name="some-bucket-name",
+                        prefix="some-optional-prefix"
+                    )
+                ])
+            ```
+        """
+
+        # Pages are listed by a task, so the listing span is opened and
+        # closed on its own context instead of the one consuming pages
+        queue = asyncio.Queue(maxsize=1)
+        producer = asyncio.ensure_future(
+            self._put_report_batches(queue, bucket_name, prefix)
+        )
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+
+                if isinstance(batch, Exception):
+                    raise batch
+
+                yield batch if as_batches else batch.to_pandas()
+
+        finally:
+            producer.cancel()
+
+    async def _put_report_batches(
+        self,
+        queue: asyncio.Queue,
+        bucket_name: str,
+        prefix: str
+    ) -> None:
+        """
+        Lists a bucket and puts a report batch of each page on a queue.
+
+        The queue ends with None when the listing is complete or with the
+        exception that stopped it.
+
+        Args:
+            queue (asyncio.Queue): The queue read by the consumer of pages.
+            bucket_name (str): The name of the S3 bucket.
+            prefix (str): A prefix to filter objects.
+        """
+
+        try:
+            with span("AsyncS3Client.bucket_objects_report",
+                      bucket=bucket_name, prefix=prefix):
+                client = await self.get_client()
+
+                self.logger.debug("Retrieving objects from "
+                                  f"{bucket_name}/{prefix}")
+                paginator = client.get_paginator("list_objects_v2")
+                async for page in paginator.paginate(Bucket=bucket_name,
+                                                     Prefix=prefix):
+                    contents = page.get("Contents", [])
+                    if contents:
+                        await queue.put(
+                            objects_report_batch(bucket_name, contents)
+                        )
+
+        except asyncio.CancelledError:
+            # Consumers cancel the listing when they stop reading pages
+            raise
+
+        except Exception as e:
+            self.logger.error("Error on calling client.list_objects_v2() "
+                              f"method with Bucket={bucket_name} and "
+                              f"prefix={prefix}. Exception: {e}")
+            await queue.put(e)
+
+        else:
+            await queue.put(None)
+
+    @traced("AsyncS3Client.get_last_date_partition")
+    async def get_last_date_partition(
+        self,
+        bucket_name: str,
+        table_prefix: str,
+        partition_mode: str = "name=value",
+        date_partition_name: str = "anomesdia",
+        date_partition_idx: int = -2
+    ) -> int:
+        """
+        Retrieves the last date partition from a table in a S3 bucket.
+
+        Partition values are parsed as listing pages arrive, so no report is
+        built. See `S3Client.get_last_date_partition()` for details on how
+        partitions are found.
+
+        Args:
+            bucket_name (str):
+                The name of the S3 bucket.
+
+            table_prefix (str):
+                The table name used as a prefix filter
+
+            partition_mode (str, optional):
+                The mode for extracting the partition value.
+                Options are "name=value" (default) or "value".
+
+            date_partition_name (str, optional):
+                The name of the date partition in the URI.
+
+            date_partition_idx (int, optional):
+                The index of the date partition in the URI when using "value"
+                mode.
+
+        Returns:
+            int: The last date partition value.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+            ValueError: If there are no objects under the table prefix.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.aio import AsyncS3Client
+
+            # Getting the last date partition value within a coroutine
+            async with AsyncS3Client() as s3:
+                last_partition = await s3.get_last_date_partition(
+                    bucket_name="my-bucket",
+                    table_prefix="my-table-name"
+                )
+            ```
+        """
+
+        partition_values = []
+        async for batch in self.bucket_objects_report(
+            bucket_name=bucket_name,
+            prefix=table_prefix,
+            as_batches=True
+        ):
+            keys = batch.column("Key").to_pylist()
+            with span("AsyncS3Client.get_last_date_partition."
+                      "parse_partitions", keys=len(keys)):
+                partition_values.extend(
+                    self.get_date_partition_value_from_prefix(
+                        prefix_uri=key,
+                        partition_mode=partition_mode,
+                        date_partition_name=date_partition_name,
+                        date_partition_idx=date_partition_idx
+                    )
+                    for key in keys
+                )
+
+        if not partition_values:
+            raise ValueError(f"There are no objects on {bucket_name}/"
+                             f"{table_prefix} to get a date partition from")
+
+        self.logger.debug("Getting the last partition value")
+        return max(partition_values)
+
+
+class AsyncSecretsManagerClient(AsyncBaseClient):
+    """Handles Secrets Manager operations on asyncio event loops.
+
+    Examples:
+        ```python
+        # Importing the class
+        from cloudgeass.aws.aio import AsyncSecretsManagerClient
+
+        # Getting a secret string within a coroutine
+        async with AsyncSecretsManagerClient() as sm:
+            secret_string = await sm.get_secret_string(
+                secret_id="some-secret-id"
+            )
+        ```
+
+    Args:
+        logger_level (int, optional):
+            The logger level to be configured on the class logger object
+
+        performance_profile (str, optional):
+            A named botocore performance profile ("high_throughput",
+            "low_latency" or "lambda") from `cloudgeass.aws.profiles`
+
+    Methods:
+        get_secret_string() -> str:
+            Retrieves a secret string from Secrets Manager based on a secret ID
+    """
+
+    # The aiobotocore service name handled by the class
+    service_name = "secretsmanager"
+
+    @traced("AsyncSecretsManagerClient.get_secret_string")
+    async def get_secret_string(self, secret_id: str) -> str:
+        """
+        Retrieves the secret string for a given secret ID.
+
+        Args:
+            secret_id (str):
+                The ID of the secret to retrieve.
+
+        Returns:
+            str: The secret string associated with the provided secret ID.
+
+        Raises:
+            Exception: If there is an error while retrieving the secret string.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.aio import AsyncSecretsManagerClient
+
+            # Getting the secret string within a coroutine
+            async with AsyncSecretsManagerClient() as sm:
+                secret_string = await sm.get_secret_string("your_secret_id")
+            ```
+        """
+
+        client = await self.get_client()
+
+        self.logger.debug(f"Retrieving secret string for secret {secret_id}")
+        try:
+            response = await client.get_secret_value(SecretId=secret_id)
+            return response["SecretString"]
+
+        except Exception as e:
+            self.logger.error("Error on trying to retrieve the secret string "
+                              f"of secret {secret_id}. Exception: {e}")
+            raise e
@@ -0,0 +1,179 @@
+"""
+Module: cloudgeass.aws.base
+
+The module provides a base class shared by all cloudgeass service classes. It
+handles the logger configuration and the lazy initialization of boto3 clients
+and resources.
+
+___
+"""
+
+# Importing libraries
+import logging
+import threading
+
+from cloudgeass.aws.factory import get_client, get_resource, add_client_hook
+from cloudgeass.aws.instrumentation import (
+    BOTOCORE_LIMITER_FEEDBACK,
+    BOTOCORE_TRACING
+)
+from cloudgeass.aws.profiles import (
+    get_performance_config,
+    get_max_pool_connections
+)
+from cloudgeass.utils.log import log_config
+
+
+# Every AWS call made by cloudgeass clients is wrapped in a tracing span
+add_client_hook(BOTOCORE_TRACING)
+
+# Throttled attempts retried by botocore are fed to concurrency limiters
+add_client_hook(BOTOCORE_LIMITER_FEEDBACK)
+
+
+class BaseClient():
+    """Base class for cloudgeass service classes.
+
+    Service classes (e.g. `S3Client`) inherit from this class and just set
+    the `service_name` class attribute. Both the boto3 client and resource
+    are created lazily, only when they are accessed for the first time, so
+    building a cloudgeass object costs nearly nothing and the resource model
+    is only loaded by code paths that actually need it.
+
+    Objects are safe to share across threads. The low-level boto3 client is
+    thread-safe, so all threads share a single client (created once, under
+    a lock, and then read without locking). Resources aren't thread-safe, so
+    each thread gets its own resource.
+
+    Args:
+        logger_level (int, optional):
+            The logger level to be configured on the class logger object
+
+        performance_profile (str, optional):
+            A named performance profile from `cloudgeass.aws.profiles` (e.g.
+            "high_throughput", "low_latency" or "lambda"). A `config`
+            keyword argument, if given, takes precedence over the profile.
+
+    Attributes:
+        logger (logging.Logger):
+            A logger object to log steps according to a predefined logger level
+
+        client (botocore.client.BaseClient):
+            A boto3 client for the service, created on first access
+
+        resource (boto3.resources.base.ServiceResource):
+            A boto3 resource for the service, created on first access by
+            each thread
+
+        client_kwargs (dict):
+            Keyword arguments used to create both client and resource
+
+        max_workers (int):
+            The connection pool size of the client, used to size the thread
+            pools of parallel features
+
+    Tip: Using cloudgeass objects on process pools
+        Objects can be pickled, so they can be sent to `multiprocessing`
+        and `concurrent.futures.ProcessPoolExecutor` workers or to Dask
+        tasks. Only their configuration (logger level, performance profile
+        and client keyword arguments such as `region_name` and
+        `profile_name`) is pickled: boto3 clients, resources and the logger
+        are rebuilt on first access in each worker process. Clients assigned
+        by hand (e.g. stubs) aren't pickled either.
+    """
+
+    # The boto3 service name handled by the class
+    service_name = None
+
+    # Attributes holding live objects, rebuilt after unpickling
+    _transient_attributes = ("_client", "_local", "_lock", "logger")
+
+    def __init__(
+        self,
+        logger_level=logging.INFO,
+        performance_profile: str = None,
+        **client_kwargs
+    ):
+        self.logger_level = logger_level
+
+        # Applying the performance profile on the botocore config
+        self.performance_profile = performance_profile
+        if performance_profile is not None:
+            client_kwargs["config"] = get_performance_config(
+                performance_profile=performance_profile,
+                config=client_kwargs.get("config")
+            )
+
+        # Boto3 client and resource are only created on first access
+        self.client_kwargs = client_kwargs
+        self._init_transient_attributes()
+
+    def _init_transient_attributes(self) -> None:
+        # Live objects are only created on first access
+        for name in self._transient_attributes:
+            setattr(self, name, None)
+
+        # Setting up a logger object
+        self.logger = log_config(logger_level=self.logger_level)
+
+        # Guards lazy attributes shared by all threads
+        self._lock = threading.Lock()
+
+        # Holds the resource of each thread
+        self._local = threading.local()
+
+    def __getstate__(self) -> dict:
+        """Returns the configuration of the object to be pickled."""
+
+        return {name: value for name, value in self.__dict__.items()
+                if name not in self._transient_attributes}
+
+    def __setstate__(self, state: dict) -> None:
+        """Restores a pickled object, creating clients on first access."""
+
+        self.__dict__.update(state)
+        self._init_transient_attributes()
+
+    @property
+    def max_workers(self) -> int:
+        """The connection pool size used to size parallel features."""
+
+        return get_max_pool_connections(self.client_kwargs.get("config"))
+
+    @property
+    def client(self):
+        """A boto3 client for the service, created on first access."""
+
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = get_client(self.service_name,
+                                              **self.client_kwargs)
+
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
+    @property
+    def resource(self):
+        """A boto3 resource for the service, created on first access by each
+        thread."""
+
+        if self._resource is None:
+            self._local.resource = get_resource(self.service_name,
+                                                **self.client_kwargs)
+
+        return self._local.resource
+
+    @resource.setter
+    def resource(self, resource):
+        # Assigned resources are only used by the thread that assigned them
+        self._local.resource = resource
+
+    @property
+    def _resource(self):
+        """The resource of the calling thread (None if not created yet)."""
+
+        return getattr(self._local, "resource", None)
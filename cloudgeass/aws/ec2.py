@@ -45,22 +45,24 @@ ___
 """
 
 # Importing libraries
-import boto3
 import string
 import random
-import requests
 import os
 import time
-import logging
 
-from cloudgeass.utils.log import log_config
+from cloudgeass.aws.base import BaseClient
+from cloudgeass.utils.lazy import lazy_import
+from cloudgeass.utils.tracing import traced, span
 
 
 # Defining a variable with a website URL used to get the local IP address
 LOCAL_IP_URL = "https://checkip.amazonaws.com"
 
+# Heavy dependencies are only imported when a method needs them
+requests = lazy_import("requests")
 
-class EC2Client():
+
+class EC2Client(BaseClient):
     """Handles operations using ec2 client and resource from boto3.
 
     This class provides attributes and methods that can improve the way on how
@@ -87,6 +89,10 @@ class EC2Client():
         logger_level (int, optional):
             The logger level to be configured on the class logger object
 
+        performance_profile (str, optional):
+            A named botocore performance profile ("high_throughput",
+            "low_latency" or "lambda") from `cloudgeass.aws.profiles`
+
     Attributes:
         logger (logging.Logger):
             A logger object to log steps according to a predefined logger level
@@ -113,24 +119,25 @@ class EC2Client():
     Tip: About the key word argument **client_kwargs:
         Users can get customized client and resource attributes for the given
         service passing additional keyword arguments. Under the hood, both
-        client and resource class attributes are initialized as following:
+        client and resource class attributes are lazily initialized on first
+        access as following:
 
         ```python
         # Setting up a boto3 client and resource
-        self.client = boto3.client("ec2", **client_kwargs)
-        self.resource = boto3.resource("ec2", **client_kwargs)
+        self.client = get_client("ec2", **client_kwargs)
+        self.resource = get_resource("ec2", **client_kwargs)
         ```
-    """
 
-    def __init__(self, logger_level=logging.INFO, **client_kwargs):
-        # Setting up a logger object
-        self.logger_level = logger_level
-        self.logger = log_config(logger_level=self.logger_level)
+        Clients are taken from a process-wide cache (see
+        `cloudgeass.aws.factory`), so objects created with the same
+        arguments share the same warm boto3 client and connection pool. An
+        AWS profile can be chosen with the `profile_name` keyword argument.
+    """
 
-        # Setting up a boto3 client and resource
-        self.client = boto3.client("ec2", **client_kwargs)
-        self.resource = boto3.resource("ec2", **client_kwargs)
+    # The boto3 service name handled by the class
+    service_name = "ec2"
 
+    @traced("EC2Client.get_default_vpc_id")
     def get_default_vpc_id(self) -> str:
         """
         Retrieves the default VPC ID from the AWS account.
@@ -162,6 +169,7 @@ class EC2Client():
             if vpc["IsDefault"]:
                 return vpc["VpcId"]
 
+    @traced("EC2Client.create_security_group_for_local_ssh_access")
     def create_security_group_for_local_ssh_access(
         self,
         sg_name: str = "ssh-local-connection-sg",
@@ -263,7 +271,9 @@ class EC2Client():
         # Setting up igress rules
         try:
             # Getting the IP address of the runner machine in CIDR format
-            local_machine_ip = requests.get(LOCAL_IP_URL).text.strip()
+            with span("EC2Client.create_security_group_for_local_ssh_access"
+                      ".get_local_ip"):
+                local_machine_ip = requests.get(LOCAL_IP_URL).text.strip()
 
             # Creating a ingress rule to allow SSH traffic from local IP
             _ = self.client.authorize_security_group_ingress(
@@ -292,6 +302,7 @@ class EC2Client():
         # Returning the response of security group creation call
         return sg_response
 
+    @traced("EC2Client.create_key_pair")
     def create_key_pair(
         self,
         key_name: str = "local-connection-kp",
@@ -418,12 +429,14 @@ class EC2Client():
         # Saving the key material (if applicable)
         if save_file:
             file_name = f"{key_name}.{key_format}"
-            with open(os.path.join(path_to_save_file, file_name), "w") as f:
+            with span("EC2Client.create_key_pair.save_key_file"), \
+                    open(os.path.join(path_to_save_file, file_name), "w") as f:
                 f.write(kp_response["KeyMaterial"])
 
         # Returning the response of key pai creation call
         return kp_response
 
+    @traced("EC2Client.create_ec2_instance")
     def create_ec2_instance(
         self,
         image_id: str = "ami-04cb4ca688797756f",
@@ -508,19 +521,20 @@ class EC2Client():
         self.logger.debug(f"Checking the instance {instance_id} status and "
                           "waiting until it's running")
 
-        status_response = self.client.describe_instance_status()
-        for instance in status_response["InstanceStatuses"]:
-            if instance["InstanceId"] == instance_id:
-                # Getting the status of the new instance
-                status = instance["InstanceState"]["Name"]
-                while status.strip().lower() != "running":
-                    # Wait some time until next status check
-                    self.logger.debug(f"The instance is still {status}")
-                    time.sleep(status_check_sleep_time)
+        with span("EC2Client.create_ec2_instance.wait_until_running"):
+            status_response = self.client.describe_instance_status()
+            for instance in status_response["InstanceStatuses"]:
+                if instance["InstanceId"] == instance_id:
+                    # Getting the status of the new instance
                     status = instance["InstanceState"]["Name"]
-
-                self.logger.debug(f"The instance {instance_id} is now running "
-                                  "and ready to connect ")
-                break
+                    while status.strip().lower() != "running":
+                        # Wait some time until next status check
+                        self.logger.debug(f"The instance is still {status}")
+                        time.sleep(status_check_sleep_time)
+                        status = instance["InstanceState"]["Name"]
+
+                    self.logger.debug(f"The instance {instance_id} is now "
+                                      "running and ready to connect ")
+                    break
 
         return ec2_response
@@ -0,0 +1,258 @@
+"""Provides a process-wide cache of boto3 sessions and clients.
+
+Creating boto3 sessions and clients is expensive: each call loads service
+models from disk and builds its own connection pool. This module keeps a
+single session per AWS profile and a single client per service, profile and
+configuration, so every cloudgeass object created in the same process (e.g.
+in worker threads or along warm Lambda invocations) reuses the same warm
+clients and connection pools.
+
+Boto3 clients are thread-safe and can be freely shared. Resources, on the
+other hand, are not thread-safe and are created on every call to
+`get_resource()`, reusing the cached session and its loaded models.
+
+Client hooks (see `add_client_hook()`) are callables applied to every client
+built by this module, including the ones already cached and the low-level
+clients of resources. They are used to attach botocore event handlers (e.g.
+instrumentation) to every cloudgeass client.
+
+___
+"""
+
+# Importing libraries
+from __future__ import annotations
+
+import copy
+import threading
+
+from cloudgeass.utils.lazy import lazy_import
+
+# Heavy dependencies are only imported when a session is first created
+boto3 = lazy_import("boto3")
+
+
+# Caches of boto3 sessions and clients and a lock to build them safely
+_SESSIONS = {}
+_CLIENTS = {}
+_CLIENT_HOOKS = []
+_CACHE_LOCK = threading.Lock()
+
+
+def _freeze(value):
+    """Converts a value in a hashable representation to build cache keys.
+
+    Args:
+        value (Any): A client keyword argument value (e.g. a botocore Config).
+
+    Returns:
+        A hashable representation of the value.
+    """
+
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+
+    # botocore.config.Config keeps the options given by the user
+    if hasattr(value, "_user_provided_options"):
+        return (type(value).__name__, _freeze(value._user_provided_options))
+
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _unshared(client_kwargs: dict) -> dict:
+    """Copies the botocore Config given to boto3, which changes it in place.
+
+    Otherwise, the cache key of a configuration would change once a client
+    is created with it (e.g. "max_attempts" retries become
+    "total_max_attempts").
+    """
+
+    if client_kwargs.get("config") is None:
+        return client_kwargs
+
+    return dict(client_kwargs, config=copy.deepcopy(client_kwargs["config"]))
+
+
+def get_session(profile_name: str = None) -> boto3.Session:
+    """Returns a cached boto3 session for the given AWS profile.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.aws.factory import get_session
+
+        session = get_session(profile_name="some-profile")
+        ```
+
+    Args:
+        profile_name (str): An optional AWS profile name.
+
+    Returns:
+        A boto3 session shared by the whole process.
+    """
+
+    session = _SESSIONS.get(profile_name)
+    if session is None:
+        with _CACHE_LOCK:
+            session = _SESSIONS.get(profile_name)
+            if session is None:
+                session = boto3.Session(profile_name=profile_name)
+                _SESSIONS[profile_name] = session
+
+    return session
+
+
+def get_client(
+    service_name: str,
+    profile_name: str = None,
+    **client_kwargs
+):
+    """Returns a cached boto3 client for the given service and configuration.
+
+    Clients are cached by service name, profile name and every keyword
+    argument (region name, endpoint URL, botocore Config and so on), so
+    equal configurations always share the same client and connection pool.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.aws.factory import get_client
+
+        client = get_client("s3", region_name="us-east-1")
+        ```
+
+    Args:
+        service_name (str): The AWS service name (e.g. "s3").
+        profile_name (str): An optional AWS profile name.
+        **client_kwargs: Keyword arguments accepted by `boto3.client()`.
+
+    Returns:
+        A boto3 client shared by the whole process.
+    """
+
+    cache_key = (service_name, profile_name, _freeze(client_kwargs))
+    client = _CLIENTS.get(cache_key)
+    if client is None:
+        session = get_session(profile_name=profile_name)
+        with _CACHE_LOCK:
+            client = _CLIENTS.get(cache_key)
+            if client is None:
+                client = session.client(service_name,
+                                        **_unshared(client_kwargs))
+                _apply_client_hooks(client)
+                _CLIENTS[cache_key] = client
+
+    return client
+
+
+def get_resource(
+    service_name: str,
+    profile_name: str = None,
+    **client_kwargs
+):
+    """Returns a new boto3 resource built from the cached session.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.aws.factory import get_resource
+
+        resource = get_resource("s3", region_name="us-east-1")
+        ```
+
+    Args:
+        service_name (str): The AWS service name (e.g. "s3").
+        profile_name (str): An optional AWS profile name.
+        **client_kwargs: Keyword arguments accepted by `boto3.resource()`.
+
+    Returns:
+        A boto3 resource. Resources aren't thread-safe and must not be shared
+        between threads.
+    """
+
+    session = get_session(profile_name=profile_name)
+    with _CACHE_LOCK:
+        resource = session.resource(service_name, **_unshared(client_kwargs))
+        _apply_client_hooks(resource.meta.client)
+
+    return resource
+
+
+def _apply_client_hooks(client) -> None:
+    """Applies all registered client hooks on a boto3 client."""
+
+    for hook in _CLIENT_HOOKS:
+        hook(client)
+
+
+def add_client_hook(hook) -> None:
+    """Registers a callable to be applied on every cloudgeass boto3 client.
+
+    The hook is immediately applied on all cached clients and then on every
+    client or resource created by this module.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.aws.factory import add_client_hook
+
+        def log_calls(client):
+            client.meta.events.register("before-call", print)
+
+        add_client_hook(log_calls)
+        ```
+
+    Args:
+        hook (Callable): A callable that receives a boto3 client.
+    """
+
+    with _CACHE_LOCK:
+        if hook in _CLIENT_HOOKS:
+            return
+
+        _CLIENT_HOOKS.append(hook)
+        for client in _CLIENTS.values():
+            hook(client)
+
+
+def remove_client_hook(hook) -> None:
+    """Stops applying a client hook on new clients.
+
+    Args:
+        hook (Callable): A callable registered with `add_client_hook()`.
+    """
+
+    with _CACHE_LOCK:
+        if hook in _CLIENT_HOOKS:
+            _CLIENT_HOOKS.remove(hook)
+
+
+def cached_clients() -> list:
+    """Returns all boto3 clients currently cached by this module."""
+
+    with _CACHE_LOCK:
+        return list(_CLIENTS.values())
+
+
+def clear_cache() -> None:
+    """Removes all cached sessions and clients.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.aws.factory import clear_cache
+
+        # Forcing new sessions and clients (e.g. after rotating credentials)
+        clear_cache()
+        ```
+    """
+
+    with _CACHE_LOCK:
+        _SESSIONS.clear()
+        _CLIENTS.clear()
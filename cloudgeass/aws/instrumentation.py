@@ -0,0 +1,359 @@
+"""
+Module: cloudgeass.aws.instrumentation
+
+The module hooks botocore's event system on every boto3 client used by
+cloudgeass. It provides:
+
+- tracing spans around every AWS call, emitted through the active tracer
+  of `cloudgeass.utils.tracing` (always hooked, no-op unless a tracer is
+  active);
+- feedback of throttled attempts retried by botocore to the concurrency
+  limiters of `cloudgeass.utils.concurrency` (always hooked);
+- an opt-in metrics layer that records, for each service and operation:
+
+    - latency histograms of whole calls (including retries)
+    - call counts by status (success or error)
+    - retry and throttling counts
+    - bytes sent and received
+
+Metrics are stored in a `cloudgeass.utils.metrics.MetricsRegistry`, which
+offers both a snapshot API and a Prometheus text exporter.
+
+Examples:
+    ```python
+    # Importing the functions
+    from cloudgeass.aws.instrumentation import enable_instrumentation
+    from cloudgeass.aws.s3 import S3Client
+
+    # Enabling instrumentation on every cloudgeass client
+    registry = enable_instrumentation()
+
+    s3 = S3Client()
+    df_report = s3.bucket_objects_report(bucket_name="some-bucket")
+
+    print(registry.snapshot())
+    print(registry.to_prometheus())
+    ```
+
+___
+"""
+
+# Importing libraries
+import time
+
+from cloudgeass.aws.factory import (
+    add_client_hook,
+    remove_client_hook,
+    cached_clients
+)
+from cloudgeass.utils.concurrency import (
+    THROTTLING_ERROR_CODES,
+    record_retried_throttle
+)
+from cloudgeass.utils.metrics import REGISTRY, MetricsRegistry
+from cloudgeass.utils.tracing import span, tracing_enabled
+
+
+# Names of the metrics recorded by the instrumentation
+CALL_DURATION_METRIC = "cloudgeass_aws_call_duration_seconds"
+CALLS_METRIC = "cloudgeass_aws_calls_total"
+RETRIES_METRIC = "cloudgeass_aws_retries_total"
+THROTTLES_METRIC = "cloudgeass_aws_throttles_total"
+BYTES_SENT_METRIC = "cloudgeass_aws_bytes_sent_total"
+BYTES_RECEIVED_METRIC = "cloudgeass_aws_bytes_received_total"
+
+# Keys used to keep call state in botocore's request context
+_STARTED_AT_KEY = "cloudgeass_started_at"
+_SPAN_KEY = "cloudgeass_span"
+
+
+def _operation_labels(event_name: str) -> dict:
+    """Extracts service and operation labels from a botocore event name."""
+
+    parts = event_name.split(".")
+    return {
+        "service": parts[1] if len(parts) > 1 else "unknown",
+        "operation": parts[2] if len(parts) > 2 else "unknown"
+    }
+
+
+def _content_length(headers) -> int:
+    content_length = headers.get("Content-Length") \
+        or headers.get("content-length")
+    try:
+        return int(content_length or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class BotocoreInstrumentation():
+    """Records metrics of boto3 calls by hooking botocore events.
+
+    Args:
+        registry (MetricsRegistry, optional):
+            The registry where metrics are recorded.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self.registry = registry
+        self._handlers = (
+            ("before-call", self._before_call),
+            ("before-send", self._before_send),
+            ("response-received", self._response_received),
+            ("after-call", self._after_call),
+            ("after-call-error", self._after_call_error)
+        )
+
+    def _unique_id(self, event_name: str) -> str:
+        return f"cloudgeass-instrumentation-{id(self)}-{event_name}"
+
+    def instrument(self, client) -> None:
+        """Registers the metric handlers on a boto3 client (only once).
+
+        Args:
+            client (botocore.client.BaseClient): The client to instrument.
+        """
+
+        for event_name, handler in self._handlers:
+            client.meta.events.register(
+                event_name, handler,
+                unique_id=self._unique_id(event_name)
+            )
+
+    def uninstrument(self, client) -> None:
+        """Removes the metric handlers from a boto3 client.
+
+        Args:
+            client (botocore.client.BaseClient): The instrumented client.
+        """
+
+        for event_name, handler in self._handlers:
+            client.meta.events.unregister(
+                event_name, handler,
+                unique_id=self._unique_id(event_name)
+            )
+
+    def __call__(self, client) -> None:
+        # Allows the object to be registered as a factory client hook
+        self.instrument(client)
+
+    def _before_call(self, context=None, **kwargs) -> None:
+        if context is not None:
+            context[_STARTED_AT_KEY] = time.perf_counter()
+
+    def _before_send(self, request=None, event_name="", **kwargs) -> None:
+        body = getattr(request, "body", None)
+        if isinstance(body, (bytes, bytearray, str)):
+            size = len(body)
+        else:
+            size = _content_length(getattr(request, "headers", {}))
+
+        if size:
+            self.registry.inc(BYTES_SENT_METRIC,
+                              _operation_labels(event_name), size)
+
+    def _response_received(
+        self,
+        response_dict=None,
+        parsed_response=None,
+        event_name="",
+        **kwargs
+    ) -> None:
+        # Emitted once per HTTP attempt, so retried throttles are counted
+        if response_dict is None:
+            return
+
+        labels = _operation_labels(event_name)
+
+        body = response_dict.get("body")
+        if isinstance(body, (bytes, bytearray)):
+            size = len(body)
+        else:
+            size = _content_length(response_dict.get("headers", {}))
+
+        if size:
+            self.registry.inc(BYTES_RECEIVED_METRIC, labels, size)
+
+        error = (parsed_response or {}).get("Error", {})
+        error_code = str(error.get("Code", ""))
+        status_code = response_dict.get("status_code")
+        if error_code in THROTTLING_ERROR_CODES or status_code in (429, 503):
+            self.registry.inc(THROTTLES_METRIC, labels)
+
+    def _record_call(self, event_name, context, metadata, status) -> None:
+        labels = _operation_labels(event_name)
+
+        started_at = (context or {}).get(_STARTED_AT_KEY)
+        if started_at is not None:
+            self.registry.observe(CALL_DURATION_METRIC, labels,
+                                  time.perf_counter() - started_at)
+
+        self.registry.inc(CALLS_METRIC, dict(labels, status=status))
+
+        retries = (metadata or {}).get("RetryAttempts", 0)
+        if retries:
+            self.registry.inc(RETRIES_METRIC, labels, retries)
+
+    def _after_call(
+        self,
+        http_response=None,
+        parsed=None,
+        context=None,
+        event_name="",
+        **kwargs
+    ) -> None:
+        # Error responses from AWS (e.g. 4xx) are also emitted as after-call
+        status_code = getattr(http_response, "status_code", 200)
+        status = "error" if status_code >= 300 else "success"
+
+        metadata = (parsed or {}).get("ResponseMetadata", {})
+        self._record_call(event_name, context, metadata, status)
+
+    def _after_call_error(
+        self,
+        exception=None,
+        context=None,
+        event_name="",
+        **kwargs
+    ) -> None:
+        response = getattr(exception, "response", None) or {}
+        metadata = response.get("ResponseMetadata", {})
+
+        # Only emitted by botocore when no response was received at all
+        self._record_call(event_name, context, metadata, "error")
+
+
+class BotocoreTracing():
+    """Wraps every request sent by boto3 in a span of the active tracer.
+
+    Spans are named "aws.<service>.<operation>" and are children of the
+    cloudgeass method span that made the call. Nothing is done while the
+    active tracer is a NoopTracer.
+
+    Spans are started on `request-created`, which botocore only emits once
+    the call is guarded by `after-call-error`, so every started span is
+    finished even if the call fails. Spans end on the first `after-call`
+    and `after-call-error` handlers, which later handlers can't skip by
+    raising. Calls answered by `before-call` handlers (e.g. stubs) send no
+    request and have no span.
+    """
+
+    def __init__(self):
+        self._handlers = (
+            ("request-created", self._request_created, "register"),
+            ("after-call", self._after_call, "register_first"),
+            ("after-call-error", self._after_call_error, "register_first")
+        )
+
+    def __call__(self, client) -> None:
+        # Allows the object to be registered as a factory client hook
+        for event_name, handler, register in self._handlers:
+            getattr(client.meta.events, register)(
+                event_name, handler,
+                unique_id=f"cloudgeass-tracing-{event_name}"
+            )
+
+    def _request_created(self, request=None, event_name="", **kwargs):
+        context = getattr(request, "context", None)
+        if context is None or not tracing_enabled():
+            return None
+
+        # Retried attempts create their requests again on the same span
+        if _SPAN_KEY in context:
+            return None
+
+        labels = _operation_labels(event_name)
+        span_context = span(
+            f"aws.{labels['service']}.{labels['operation']}",
+            **{f"aws.{k}": v for k, v in labels.items()}
+        )
+        span_context.__enter__()
+        context[_SPAN_KEY] = span_context
+
+        return None
+
+    def _after_call(self, http_response=None, context=None, **kwargs):
+        span_context = (context or {}).pop(_SPAN_KEY, None)
+        if span_context is not None:
+            span_context.__exit__(None, None, None)
+
+    def _after_call_error(self, exception=None, context=None, **kwargs):
+        span_context = (context or {}).pop(_SPAN_KEY, None)
+        if span_context is not None:
+            span_context.__exit__(type(exception), exception,
+                                  getattr(exception, "__traceback__", None))
+
+
+# The tracing hook applied on every cloudgeass client by BaseClient
+BOTOCORE_TRACING = BotocoreTracing()
+
+
+class BotocoreLimiterFeedback():
+    """Feeds throttled attempts retried by botocore to concurrency limiters.
+
+    botocore emits `needs-retry` after every attempt of a call, before it
+    decides whether to retry it. Throttled attempts made within a limiter
+    slot shrink the limits of its key right away, so limiters don't wait
+    for botocore to give up before reacting.
+    """
+
+    def __call__(self, client) -> None:
+        # Allows the object to be registered as a factory client hook
+        client.meta.events.register(
+            "needs-retry", self._needs_retry,
+            unique_id="cloudgeass-limiter-feedback-needs-retry"
+        )
+
+    def _needs_retry(self, response=None, **kwargs) -> None:
+        # Attempts without a response (e.g. connection errors) aren't
+        # throttles, and returning None never changes retry decisions
+        if response is not None:
+            record_retried_throttle(response[1])
+
+        return None
+
+
+# The limiter feedback hook applied on every cloudgeass client by BaseClient
+BOTOCORE_LIMITER_FEEDBACK = BotocoreLimiterFeedback()
+
+
+# The active instrumentation (if enabled)
+_INSTRUMENTATION = None
+
+
+def enable_instrumentation(registry: MetricsRegistry = None):
+    """Enables metrics on every boto3 client used by cloudgeass.
+
+    All cached clients are instrumented right away and every client created
+    afterwards by `cloudgeass.aws.factory` is instrumented on creation.
+
+    Args:
+        registry (MetricsRegistry, optional):
+            The registry where metrics are recorded. Defaults to the
+            process-wide `cloudgeass.utils.metrics.REGISTRY`.
+
+    Returns:
+        The registry where metrics are being recorded.
+    """
+
+    global _INSTRUMENTATION
+
+    disable_instrumentation()
+    _INSTRUMENTATION = BotocoreInstrumentation(registry or REGISTRY)
+    add_client_hook(_INSTRUMENTATION)
+
+    return _INSTRUMENTATION.registry
+
+
+def disable_instrumentation() -> None:
+    """Disables metrics and removes their handlers from cached clients."""
+
+    global _INSTRUMENTATION
+
+    if _INSTRUMENTATION is None:
+        return
+
+    remove_client_hook(_INSTRUMENTATION)
+    for client in cached_clients():
+        _INSTRUMENTATION.uninstrument(client)
+    _INSTRUMENTATION = None
@@ -0,0 +1,115 @@
+"""
+Module: cloudgeass.aws.profiles
+
+The module provides named performance profiles for botocore clients. Each
+profile tunes the connection pool size, the retry mode, TCP keepalive and
+timeouts together, so users don't need to find out a good combination of
+`botocore.config.Config` options for common workloads.
+
+Profiles:
+    - high_throughput:
+        Large connection pool and adaptive retries for concurrent workloads
+        (e.g. reports over many buckets or parallel uploads).
+
+    - low_latency:
+        Short timeouts and few retries in standard mode, failing fast instead
+        of waiting on client side rate limiting.
+
+    - lambda:
+        A moderate connection pool and adaptive retries with timeouts that
+        fit short-lived AWS Lambda invocations.
+
+___
+"""
+
+# Importing libraries
+from cloudgeass.utils.lazy import lazy_import
+
+# Heavy dependencies are only imported when a config is built
+botocore_config = lazy_import("botocore.config")
+
+
+# botocore's default connection pool size
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+# Options of each named performance profile
+PERFORMANCE_PROFILES = {
+    "high_throughput": {
+        "max_pool_connections": 64,
+        "retries": {"mode": "adaptive", "max_attempts": 10},
+        "tcp_keepalive": True,
+        "connect_timeout": 10,
+        "read_timeout": 120
+    },
+    "low_latency": {
+        "max_pool_connections": 32,
+        "retries": {"mode": "standard", "max_attempts": 3},
+        "tcp_keepalive": True,
+        "connect_timeout": 2,
+        "read_timeout": 10
+    },
+    "lambda": {
+        "max_pool_connections": 16,
+        "retries": {"mode": "adaptive", "max_attempts": 5},
+        "tcp_keepalive": True,
+        "connect_timeout": 3,
+        "read_timeout": 30
+    }
+}
+
+
+def get_performance_config(performance_profile: str, config=None):
+    """Builds a botocore Config object for a named performance profile.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.aws.profiles import get_performance_config
+
+        config = get_performance_config("high_throughput")
+        ```
+
+    Args:
+        performance_profile (str):
+            One of the keys of PERFORMANCE_PROFILES.
+
+        config (botocore.config.Config, optional):
+            A user config whose options take precedence over the profile.
+
+    Returns:
+        A botocore.config.Config object with the profile options.
+
+    Raises:
+        ValueError: If the performance profile doesn't exist.
+    """
+
+    profile_prep = performance_profile.strip().lower()
+    if profile_prep not in PERFORMANCE_PROFILES:
+        raise ValueError("Invalid value for performance_profile argument "
+                         f"({performance_profile}). Acceptable values are "
+                         f"{list(PERFORMANCE_PROFILES.keys())}")
+
+    profile_config = botocore_config.Config(
+        **PERFORMANCE_PROFILES[profile_prep]
+    )
+    if config is not None:
+        profile_config = profile_config.merge(config)
+
+    return profile_config
+
+
+def get_max_pool_connections(config=None) -> int:
+    """Returns the connection pool size set by a botocore Config object.
+
+    Parallel features use this value to size their thread pools, so they
+    never have more concurrent requests than available connections.
+
+    Args:
+        config (botocore.config.Config, optional): A botocore config.
+
+    Returns:
+        The max_pool_connections option or botocore's default value.
+    """
+
+    return getattr(config, "max_pool_connections", None) or \
+        DEFAULT_MAX_POOL_CONNECTIONS
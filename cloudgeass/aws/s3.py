@@ -8,15 +8,324 @@ ___
 """
 
 # Importing libraries
-import boto3
-import logging
-import pandas as pd
-
-from cloudgeass.utils.log import log_config
+from __future__ import annotations
+
+import hashlib
+import heapq
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+from array import array
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import count, repeat
+
+from cloudgeass.aws.base import BaseClient
+from cloudgeass.aws.factory import get_client
+from cloudgeass.utils.arrow import SpillBuffer, read_ipc_file, write_ipc_file
+from cloudgeass.utils.keyindex import DEFAULT_FALSE_POSITIVE_RATE, KeyIndex
+from cloudgeass.utils.keyspace import branch_midpoint, key_ranges
+from cloudgeass.utils.lazy import lazy_import
+from cloudgeass.utils.patterns import compile_key_pattern, pushdown_prefix
 from cloudgeass.utils.prep import categorize_file_size
+from cloudgeass.utils.compression import (
+    SUPPORTED_CONTENT_ENCODINGS,
+    compress_bytes,
+    decompress_bytes
+)
+from cloudgeass.utils.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    limiter_key
+)
+from cloudgeass.utils.tracing import traced, span, propagate
+
+# Heavy dependencies are only imported when a method needs them
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pa_json = lazy_import("pyarrow.json")
+np = lazy_import("numpy")
+
+# Size of each part sent to S3 on multipart uploads (S3 minimum is 5 MiB)
+MULTIPART_PART_SIZE = 8 * 1024 ** 2
+MULTIPART_MIN_PART_SIZE = 5 * 1024 ** 2
+
+# Key ranges listed by each process of distributed_objects_report()
+DEFAULT_RANGES_PER_PROCESS = 4
+
+# Random dives and listing calls made by estimate_bucket_stats()
+DEFAULT_STATS_SAMPLES = 32
+DEFAULT_STATS_MAX_REQUESTS = 1000
+
+# Levels of random choices stratified across dives
+STATS_STRATIFIED_LEVELS = 64
+
+# Units of formatted sizes, in order
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# Content-Encoding values that leave stored bytes as they are
+TRANSPARENT_CONTENT_ENCODINGS = ("", "identity", "aws-chunked")
+
+# Daily S3 storage metrics are looked up within this window
+STORAGE_METRICS_LOOKBACK_DAYS = 3
+
+# Queries allowed by each GetMetricData call
+METRIC_DATA_MAX_QUERIES = 500
+
+# Client arguments shared with CloudWatch clients, which must not inherit
+# S3 settings such as the endpoint URL or the botocore config
+CREDENTIAL_CLIENT_KWARGS = (
+    "profile_name", "aws_access_key_id", "aws_secret_access_key",
+    "aws_session_token"
+)
+
+# Regions of the legacy values of bucket location constraints
+LEGACY_LOCATION_CONSTRAINTS = {None: "us-east-1", "": "us-east-1",
+                               "EU": "eu-west-1"}
+
+# CloudWatch storage types of the objects of each storage class
+STORAGE_CLASS_STORAGE_TYPES = {
+    "STANDARD": "StandardStorage",
+    "REDUCED_REDUNDANCY": "ReducedRedundancyStorage",
+    "STANDARD_IA": "StandardIAStorage",
+    "ONEZONE_IA": "OneZoneIAStorage",
+    "INTELLIGENT_TIERING": "IntelligentTieringFAStorage",
+    "GLACIER_IR": "GlacierInstantRetrievalStorage",
+    "GLACIER": "GlacierStorage",
+    "DEEP_ARCHIVE": "DeepArchiveStorage",
+    "EXPRESS_ONEZONE": "ExpressOneZone"
+}
+
+# Input serialization of each S3 Select input format
+SELECT_INPUT_FORMATS = {
+    "csv": ("CSV", {"FileHeaderInfo": "USE"}),
+    "json": ("JSON", {"Type": "LINES"}),
+    "parquet": ("Parquet", {})
+}
+
+# S3 Select compression types of compressed key extensions
+SELECT_COMPRESSION_TYPES = {".gz": "GZIP", ".gzip": "GZIP", ".bz2": "BZIP2"}
+
+# Bytes of S3 Select records decoded at once
+DEFAULT_SELECT_BATCH_SIZE = 1024 ** 2
+
+# Bytes read from the start, middle and end of objects to confirm duplicates
+DEFAULT_VERIFY_BYTES = 64 * 1024
+
+# Columns of duplicates reports, in order
+DUPLICATES_REPORT_COLUMNS = [
+    "Size", "SizeFormatted", "ETag", "Copies", "WastedBytes",
+    "WastedFormatted", "Objects", "Verified"
+]
+
+# Columns of storage reports, in order
+STORAGE_REPORT_COLUMNS = [
+    "BucketName", "Region", "Objects", "Size", "SizeFormatted",
+    "StorageTypes", "Timestamp", "Source"
+]
+
+# Columns added to objects reports by enrich_objects_report()
+ENRICHMENT_FIELDS = ("ContentType", "Metadata", "Tags")
+
+# Fields returned by HeadObject calls
+HEAD_OBJECT_FIELDS = {"ContentType", "Metadata"}
+
+# Columns of objects reports, in order
+OBJECTS_REPORT_COLUMNS = [
+    "BucketName", "Key", "ObjectType", "Size", "SizeFormatted",
+    "LastModified", "ETag", "StorageClass"
+]
+
+
+def objects_report_schema():
+    """Returns the Arrow schema of objects reports."""
+
+    # Large strings are the layout of pandas string columns (no conversion)
+    return pa.schema([
+        ("BucketName", pa.large_string()),
+        ("Key", pa.large_string()),
+        ("ObjectType", pa.large_string()),
+        ("Size", pa.int64()),
+        ("SizeFormatted", pa.large_string()),
+        ("LastModified", pa.timestamp("us", tz="UTC")),
+        ("ETag", pa.large_string()),
+        ("StorageClass", pa.large_string())
+    ])
+
+
+def enrichment_cache_schema():
+    """Returns the Arrow schema of enrichment caches."""
+
+    string_map = pa.map_(pa.large_string(), pa.large_string())
+    return pa.schema([
+        ("BucketName", pa.large_string()),
+        ("Key", pa.large_string()),
+        ("ETag", pa.large_string()),
+        ("ContentType", pa.large_string()),
+        ("Metadata", string_map),
+        ("Tags", string_map),
+        ("Fields", pa.list_(pa.large_string()))
+    ])
+
+
+def objects_report_batch(bucket_name: str, contents: list):
+    """
+    Converts objects of a listing page into an Arrow record batch.
+
+    Args:
+        bucket_name (str): The name of the S3 bucket.
+        contents (list): The "Contents" of a list_objects_v2 response.
+
+    Returns:
+        pyarrow.RecordBatch: The report rows of the given objects.
+    """
+
+    keys = [obj["Key"] for obj in contents]
+    sizes = [obj["Size"] for obj in contents]
+    columns = {
+        "BucketName": [bucket_name] * len(contents),
+        "Key": keys,
+        "ObjectType": [key.split(".")[-1] for key in keys],
+        "Size": sizes,
+        "SizeFormatted": [categorize_file_size(size) for size in sizes],
+        "LastModified": [obj["LastModified"] for obj in contents],
+        "ETag": [obj.get("ETag") for obj in contents],
+        "StorageClass": [obj.get("StorageClass") for obj in contents]
+    }
+
+    return pa.record_batch(
+        [columns[column] for column in OBJECTS_REPORT_COLUMNS],
+        schema=objects_report_schema()
+    )
+
+
+def select_input_serialization(
+    key: str,
+    input_format: str = "csv",
+    compression: str = None,
+    input_options: dict = None
+) -> dict:
+    """
+    Builds the InputSerialization of a S3 Select call.
+
+    Args:
+        key (str): The object key, whose extension tells its compression
+            when `compression` isn't given.
+        input_format (str, optional): "csv", "json" (JSON lines) or
+            "parquet".
+        compression (str, optional): "NONE", "GZIP" or "BZIP2".
+        input_options (dict, optional): Options of the input format that
+            replace the default ones (e.g. {"FieldDelimiter": ";"}).
+
+    Returns:
+        dict: The InputSerialization of `select_object_content()`.
+
+    Raises:
+        ValueError: If the input format isn't supported.
+    """
+
+    if input_format not in SELECT_INPUT_FORMATS:
+        raise ValueError(f"Invalid input_format ({input_format}). Acceptable "
+                         f"values are {list(SELECT_INPUT_FORMATS)}")
+
+    format_name, default_options = SELECT_INPUT_FORMATS[input_format]
+    input_serialization = {format_name: {**default_options,
+                                         **(input_options or {})}}
+
+    # Parquet files are compressed by column chunks, not as a whole
+    if input_format != "parquet":
+        extension = os.path.splitext(key)[1].lower()
+        input_serialization["CompressionType"] = compression or \
+            SELECT_COMPRESSION_TYPES.get(extension, "NONE")
+
+    return input_serialization
+
+
+def matching_contents(contents: list, key_pattern) -> list:
+    """
+    Keeps objects of a listing page whose keys match a pattern.
+
+    Args:
+        contents (list): The "Contents" of a list_objects_v2 response.
+        key_pattern (re.Pattern): A pattern from
+            `cloudgeass.utils.patterns.compile_key_pattern()` (or None to
+            keep every object).
+
+    Returns:
+        list: The matching objects.
+    """
+
+    if key_pattern is None:
+        return contents
+
+    return [obj for obj in contents if key_pattern.search(obj["Key"])]
+
+
+def _list_key_range(
+    client_factory,
+    bucket_name: str,
+    prefix: str,
+    start_after: str,
+    end_key: str,
+    output_path: str,
+    pattern=None
+) -> int:
+    """
+    Lists a key range and writes its report rows on an Arrow IPC file.
+
+    This function runs on worker processes of
+    `S3Client.distributed_objects_report()`, so it only receives picklable
+    arguments and builds its own boto3 client.
+
+    Args:
+        client_factory (Callable): Creates the boto3 client of the worker.
+        bucket_name (str): The name of the S3 bucket.
+        prefix (str): A prefix to filter objects.
+        start_after (str): Keys listed are greater than this one (if given).
+        end_key (str): Keys listed are lower than or equal to this one (if
+            given).
+        output_path (str): The path of the Arrow IPC file.
+        pattern (str or re.Pattern, optional): A glob or regex keys must
+            match.
+
+    Returns:
+        int: The number of objects listed.
+    """
+
+    client = client_factory()
+    key_pattern = compile_key_pattern(pattern) if pattern else None
+    paginate_kwargs = {"Bucket": bucket_name, "Prefix": prefix}
+    if start_after is not None:
+        paginate_kwargs["StartAfter"] = start_after
 
+    n_objects = 0
+    paginator = client.get_paginator("list_objects_v2")
+    with pa.ipc.new_file(output_path, objects_report_schema()) as writer:
+        for page in paginator.paginate(**paginate_kwargs):
+            contents = page.get("Contents", [])
+            if end_key is not None:
+                contents = [obj for obj in contents if obj["Key"] <= end_key]
+            contents = matching_contents(contents, key_pattern)
 
-class S3Client():
+            if contents:
+                writer.write_batch(objects_report_batch(bucket_name,
+                                                        contents))
+                n_objects += len(contents)
+
+            # Pages are sorted, so the range ends on the first key beyond it
+            if end_key is not None and page.get("Contents") and \
+                    page["Contents"][-1]["Key"] > end_key:
+                break
+
+    return n_objects
+
+
+class S3Client(BaseClient):
     """Handles operations using s3 client and resource from boto3.
 
     This class provides attributes and methods that can improve the way on how
@@ -38,6 +347,10 @@ class S3Client():
         logger_level (int, optional):
             The logger level to be configured on the class logger object
 
+        performance_profile (str, optional):
+            A named botocore performance profile ("high_throughput",
+            "low_latency" or "lambda") from `cloudgeass.aws.profiles`
+
     Attributes:
         logger (logging.Logger):
             A logger object to log steps according to a predefined logger level
@@ -48,6 +361,11 @@ class S3Client():
         resource (botocore.client.S3):
             A S3 boto3 resource to execute operations
 
+        limiter (AdaptiveConcurrencyLimiter):
+            An AIMD concurrency limiter shared by all parallel operations of
+            the object. It adapts the number of concurrent calls to each
+            bucket prefix according to throttling responses and latency
+
     Methods:
         list_buckets() -> list:
             Lists the names of all S3 buckets associated with the client.
@@ -58,33 +376,78 @@ class S3Client():
         all_buckets_objects_report() -> pd.DataFrame:
             Retrieves a report of objects from all buckets in the account.
 
+        estimate_bucket_stats() -> dict:
+            Estimates the size of a bucket with a bounded number of calls.
+
+        buckets_storage_report() -> pd.DataFrame:
+            Retrieves the size and object count of buckets from CloudWatch.
+
+        duplicate_objects_report() -> pd.DataFrame:
+            Finds groups of duplicated objects across buckets.
+
         get_date_partition_value_from_prefix() -> int:
             Extracts the date partition value from a given URI prefix.
 
         get_last_date_partition() -> int:
             Retrieves the last date partition from a table in a S3 bucket.
 
+        upload_object() -> dict:
+            Uploads an object, optionally compressing it on a thread pool.
+
+        read_object() -> bytes:
+            Reads an object content, decompressing it when applicable.
+
+        read_objects() -> dict:
+            Reads many objects in parallel, adapting to S3 throttling.
+
+        select() -> pd.DataFrame:
+            Runs a S3 Select query on an object, streaming its records.
+
+        select_objects() -> dict:
+            Runs a S3 Select query on many objects in parallel.
+
     Tip: About the key word argument **client_kwargs:
         Users can get customized client and resource attributes for the given
         service passing additional keyword arguments. Under the hood, both
-        client and resource class attributes are initialized as following:
+        client and resource class attributes are lazily initialized on first
+        access as following:
 
         ```python
         # Setting up a boto3 client and resource
-        self.client = boto3.client("s3", **client_kwargs)
-        self.resource = boto3.resource("s3", **client_kwargs)
+        self.client = get_client("s3", **client_kwargs)
+        self.resource = get_resource("s3", **client_kwargs)
         ```
+
+        Clients are taken from a process-wide cache (see
+        `cloudgeass.aws.factory`), so objects created with the same
+        arguments share the same warm boto3 client and connection pool. An
+        AWS profile can be chosen with the `profile_name` keyword argument.
     """
 
-    def __init__(self, logger_level=logging.INFO, **client_kwargs):
-        # Setting up a logger object
-        self.logger_level = logger_level
-        self.logger = log_config(logger_level=self.logger_level)
+    # The boto3 service name handled by the class
+    service_name = "s3"
 
-        # Setting up a boto3 client and resource
-        self.client = boto3.client("s3", **client_kwargs)
-        self.resource = boto3.resource("s3", **client_kwargs)
+    # The limiter holds locks, so each process builds its own
+    _transient_attributes = BaseClient._transient_attributes + ("_limiter",)
 
+    @property
+    def limiter(self) -> AdaptiveConcurrencyLimiter:
+        """An AIMD concurrency limiter shared by all parallel operations."""
+
+        if self._limiter is None:
+            with self._lock:
+                if self._limiter is None:
+                    self._limiter = AdaptiveConcurrencyLimiter(
+                        max_limit=self.max_workers
+                    )
+
+        return self._limiter
+
+    @limiter.setter
+    def limiter(self, limiter: AdaptiveConcurrencyLimiter):
+        self._limiter = limiter
+
+    @traced("S3Client.list_buckets")
     def list_buckets(self) -> list:
         """
         Lists the names of all S3 buckets associated with the client.
@@ -115,10 +478,14 @@ class S3Client():
 
         return buckets
 
+    @traced("S3Client.bucket_objects_report")
     def bucket_objects_report(
         self,
         bucket_name: str,
-        prefix: str = ""
+        prefix: str = "",
+        cache_path: str = None,
+        refresh_cache: bool = False,
+        pattern=None
     ) -> pd.DataFrame:
         """
         Retrieve a report of objects within a specified S3 bucket.
@@ -130,6 +497,17 @@ class S3Client():
         Args:
             bucket_name (str): The name of the S3 bucket.
             prefix (str, optional): A prefix to filter objects.
+            cache_path (str, optional): An Arrow IPC file used as cache. If
+                the file exists, the report is loaded from it (see
+                `load_report()`). Otherwise, the report is built and saved
+                to it.
+            refresh_cache (bool, optional): Whether the report is built and
+                saved again even if the cache file exists.
+            pattern (str or re.Pattern, optional): A glob (e.g. "*.parquet")
+                or a compiled regex that keys must match. Its literal prefix
+                is pushed down to listing calls (see
+                `cloudgeass.utils.patterns`) and keys are filtered page by
+                page, so only matching objects are kept in memory.
 
         Returns:
             pd.DataFrame: A DataFrame containing information about the objects.
@@ -146,6 +524,8 @@ class S3Client():
             is determined by the file extension of the object key.
             The 'SizeFormatted' column provides a human-readable representation
             of the file size.
+            All pages of the listing (up to 1000 objects each) are retrieved,
+            so every object under the prefix is part of the report.
 
         Examples:
             ```python
@@ -158,15 +538,38 @@ class S3Client():
                 bucket_name="some-bucket-name",
                 prefix="some-optional-prefix"
             )
+
+            # Sharing the report with other processes through a cache file
+            df_objects_report = s3.bucket_objects_report(
+                bucket_name="some-bucket-name",
+                cache_path="/tmp/some-bucket-name.arrow"
+            )
+
+            # Only listing parquet files of 2023 partitions
+            df_objects_report = s3.bucket_objects_report(
+                bucket_name="some-bucket-name",
+                pattern="sales/anomesdia=2023*.parquet"
+            )
             ```
         """
 
+        if self._is_cached(cache_path, refresh_cache):
+            return self.load_report(cache_path)
+
+        prefix, key_pattern = self._pushdown_pattern(prefix, pattern)
+        if prefix is None:
+            self.logger.warning(f"No key of {bucket_name} can match both the "
+                                f"prefix and the pattern {pattern}")
+            return None
+
         self.logger.debug(f"Retrieving objects from {bucket_name}/{prefix}")
         try:
-            r = self.client.list_objects_v2(
-                Bucket=bucket_name,
-                Prefix=prefix
-            )
+            # Each page holds up to 1000 objects, so all pages are collected
+            bucket_content = []
+            for page in self._list_pages(bucket_name, prefix):
+                bucket_content.extend(
+                    matching_contents(page.get("Contents", []), key_pattern)
+                )
 
         except Exception as e:
             self.logger.error("Error on calling client.list_objects_v2() "
@@ -174,42 +577,46 @@ class S3Client():
                               f"{prefix}. Exception: {e}")
             raise e
 
-        self.logger.debug("Getting bucket content from response['Contents']")
-        try:
-            bucket_content = r["Contents"]
-
-        except KeyError:
+        if not bucket_content:
             self.logger.warning(f"There's no 'Contents' key on list_objects_v2"
                                 " method response. This means that there are "
                                 f"no objects on {bucket_name}/{prefix}")
             return None
 
-        # Transforming the contents response in a pandas DataFrame
-        df = pd.DataFrame(bucket_content)
+        with span("S3Client.bucket_objects_report.build_dataframe",
+                  rows=len(bucket_content)):
+            # Transforming the contents response in a pandas DataFrame
+            df = pd.DataFrame(bucket_content)
 
-        # Adding the bucket name and getting the object file extension
-        df["BucketName"] = bucket_name
-        df["ObjectType"] = df["Key"].apply(lambda x: x.split(".")[-1])
+            # Adding the bucket name and getting the object file extension
+            df["BucketName"] = bucket_name
+            df["ObjectType"] = df["Key"].apply(lambda x: x.split(".")[-1])
 
-        # Applying a categorization function to get the file size
-        df["SizeFormatted"] = df["Size"].apply(
-            lambda x: categorize_file_size(x)
-        )
+            # Applying a categorization function to get the file size
+            df["SizeFormatted"] = df["Size"].apply(
+                lambda x: categorize_file_size(x)
+            )
 
-        # Sorting DataFrame columns
-        order_cols = [
-            "BucketName", "Key", "ObjectType", "Size", "SizeFormatted",
-            "LastModified", "ETag", "StorageClass"
-        ]
-        df_objects_report = df.loc[:, order_cols]
+            # Sorting DataFrame columns
+            df_objects_report = df.loc[:, OBJECTS_REPORT_COLUMNS]
+
+        if cache_path is not None:
+            self.save_report(df_objects_report, cache_path)
 
         return df_objects_report
 
+    @traced("S3Client.all_buckets_objects_report")
     def all_buckets_objects_report(
         self,
         prefix: str = "",
-        exclude_buckets: list = list()
-    ) -> pd.DataFrame:
+        exclude_buckets: list = list(),
+        max_workers: int = None,
+        max_memory: int = None,
+        spill_dir: str = None,
+        cache_path: str = None,
+        refresh_cache: bool = False,
+        pattern=None
+    ) -> pd.DataFrame | pa.Table:
         """
         Retrieve a report of objects from all buckets in the AWS account.
 
@@ -220,9 +627,39 @@ class S3Client():
             exclude_buckets (list, optional):
                 List of bucket names to exclude from the report..
 
+            max_workers (int, optional):
+                The number of threads used to retrieve bucket reports.
+                Defaults to the connection pool size of the client. The
+                actual concurrency is adapted by the object limiter.
+
+            max_memory (int, optional):
+                A budget (in bytes) for the report rows held in memory while
+                the report is built. When given, listing pages are converted
+                to Arrow record batches that are spilled to temporary Arrow
+                IPC files whenever the budget is exceeded, and a memory-mapped
+                pyarrow Table is returned instead of a DataFrame.
+
+            spill_dir (str, optional):
+                Where temporary files are written when `max_memory` is given.
+                Defaults to the system temporary directory.
+
+            cache_path (str, optional):
+                An Arrow IPC file used as cache. If the file exists, the
+                report is loaded from it (see `load_report()`). Otherwise,
+                the report is built and saved to it.
+
+            refresh_cache (bool, optional):
+                Whether the report is built and saved again even if the cache
+                file exists.
+
+            pattern (str or re.Pattern, optional):
+                A glob or a compiled regex that keys must match (see
+                `bucket_objects_report()`).
+
         Returns:
             pd.DataFrame: A DataFrame containing information about the objects
-            from all specified buckets.
+            from all specified buckets (or a pyarrow Table with the same
+            columns if `max_memory` is given).
 
         Raises:
             botocore.exceptions.ClientError: If there's an error while making\
@@ -230,11 +667,19 @@ class S3Client():
 
         Note:
             This method lists calls self.list_buckets() to get a list of all
-            buckets within an account and loops over this list to call
-            self.bucket_objects_report() for each bucket in order to retrieve a
-            pandas DataFrame with information about objects. At the end, all
-            individual DataFrames are concatenated together to form the return
-            for this method.
+            buckets within an account and calls self.bucket_objects_report()
+            for each bucket on a thread pool in order to retrieve a pandas
+            DataFrame with information about objects. At the end, all
+            individual DataFrames are concatenated together (in the order of
+            the buckets list) to form the return for this method.
+
+        Tip: Reports of large accounts
+            Reports of accounts with many millions of objects may not fit in
+            the memory of small containers. With `max_memory`, memory usage
+            is bounded by the budget plus one listing page (1000 objects) per
+            thread, and the returned table is backed by the page cache. It
+            can be turned into a DataFrame with `table.to_pandas()` or
+            processed in chunks with `table.to_batches()`.
 
         Examples:
             ```python
@@ -244,209 +689,2135 @@ class S3Client():
             # Getting a report of objects in all buckets
             s3 = S3Client()
             df_all_buckets_report = s3.all_buckets_objects_report()
+
+            # Keeping at most 256 MiB of report rows in memory
+            table_report = s3.all_buckets_objects_report(
+                max_memory=256 * 1024 ** 2
+            )
             ```
         """
 
+        if self._is_cached(cache_path, refresh_cache):
+            return self.load_report(cache_path,
+                                    as_table=max_memory is not None)
+
         # Retrieving all buckets within an account
         all_buckets = self.list_buckets()
 
         # Removing buckets according to a filter list
         buckets = [b for b in all_buckets if b not in exclude_buckets]
 
-        # Creating an empty DataFrame and looping over all buckets
-        df_report = pd.DataFrame()
-        for bucket in buckets:
-            # Retrieving objects from the bucket
-            df_bucket_report = self.bucket_objects_report(
-                bucket_name=bucket,
-                prefix=prefix
+        if max_memory is not None:
+            table_report = self._spilled_objects_report(
+                buckets=buckets,
+                prefix=prefix,
+                max_workers=max_workers,
+                max_memory=max_memory,
+                spill_dir=spill_dir,
+                pattern=pattern
             )
+            if cache_path is not None:
+                self.save_report(table_report, cache_path)
+
+            return table_report
+
+        # Retrieving reports of all buckets in parallel (pages are limited)
+        with ThreadPoolExecutor(max_workers or self.max_workers) as executor:
+            bucket_reports = list(executor.map(
+                propagate(lambda bucket: self.bucket_objects_report(
+                    bucket_name=bucket,
+                    prefix=prefix,
+                    pattern=pattern
+                )),
+                buckets
+            ))
 
-            # Appending to the final DataFrame
-            df_report = pd.concat([df_report, df_bucket_report])
+        with span("S3Client.all_buckets_objects_report.concat_reports",
+                  buckets=len(buckets)):
+            # Concatenating all reports in the order of the buckets list
+            df_report = pd.concat([pd.DataFrame()] + bucket_reports)
 
-        # Reseting index
-        df_report.reset_index(drop=True, inplace=True)
+            # Reseting index
+            df_report.reset_index(drop=True, inplace=True)
+
+        if cache_path is not None:
+            self.save_report(df_report, cache_path)
 
         return df_report
 
-    def get_date_partition_value_from_prefix(
-        self,
-        prefix_uri: str,
-        partition_mode: str = "name=value",
-        date_partition_name: str = "anomesdia",
-        date_partition_idx: int = -2
-    ) -> int:
+    def save_report(self, report: pd.DataFrame | pa.Table, path: str) -> None:
         """
-        Extracts the date partition value from a given URI prefix.
+        Saves an objects report as an Arrow IPC (Feather v2) file.
+
+        Files are not compressed, so `load_report()` can memory-map them, and
+        they are replaced atomically, so processes loading the report never
+        see a partially written file.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Saving a report to be shared with other processes
+            s3 = S3Client()
+            df_report = s3.bucket_objects_report(bucket_name="some-bucket")
+            s3.save_report(df_report, "/tmp/some-bucket.arrow")
+            ```
 
         Args:
-            prefix_uri (str):
-                The URI prefix containing the date partition information.
+            report (pd.DataFrame | pyarrow.Table):
+                A report returned by `bucket_objects_report()` or by
+                `all_buckets_objects_report()`.
 
-            partition_mode (str, optional):
-                The mode for extracting the partition value.
-                Options are "name=value" (default) or "value".
+            path (str):
+                The path of the file.
+        """
 
-            date_partition_name (str, optional):
-                The name of the date partition in the URI.
+        # Reports of empty buckets may have no columns at all
+        if isinstance(report, pd.DataFrame) and report.empty:
+            report = objects_report_schema().empty_table()
+        elif isinstance(report, pd.DataFrame):
+            report = pa.Table.from_pandas(report,
+                                          schema=objects_report_schema(),
+                                          preserve_index=False)
 
-            date_partition_idx (int, optional):
-                The index of the date partition in the URI when using "value"
-                mode.
+        self.logger.debug(f"Saving a report with {report.num_rows} rows on "
+                          f"{path}")
+        try:
+            write_ipc_file(report, path)
 
-        Returns:
-            int: The extracted date partition value.
+        except Exception as e:
+            self.logger.error(f"Error on saving a report on {path}. "
+                              f"Exception: {e}")
+            raise e
 
-        Raises:
-            ValueError: If there's an issue with the URI or partition\
-                extraction.
+    def load_report(
+        self,
+        path: str,
+        as_table: bool = False
+    ) -> pd.DataFrame | pa.Table:
+        """
+        Loads an objects report saved by `save_report()`.
 
-        Note:
-            This method extracts the date partition value from a given URI
-            prefix based on the specified partition mode.
-            - In "name=value" mode, it looks for the partition name in the URI
-            and extracts the corresponding value.
-            - In "value" mode, it directly extracts the partition value using
-            the specified index.
+        The file is memory-mapped, so loading it takes no copy of its data:
+        columns of the returned DataFrame (or Table) point straight to the
+        pages of the file in the OS page cache, which are shared by every
+        process that loads the same report. Repeated loads take a few
+        milliseconds no matter how many objects the report has.
 
         Examples:
             ```python
             # Importing the class
             from cloudgeass.aws.s3 import S3Client
 
-            # Setting up a class instance
+            # Loading a report saved by another process
             s3 = S3Client()
-
-            # Getting the partition value given a partition URI
-            uri = "s3://my-bucket/anomesdia=20230101/data/"
-            partition_value = s3.get_date_partition_value_from_prefix(
-                partition_uri=uri,
-                partition_mode="name=value"
-            )
-            # 20230101
+            df_report = s3.load_report("/tmp/some-bucket.arrow")
             ```
-        """
-
-        # Checking if partition_mode argument is filled properly
-        partition_mode_prep = partition_mode.strip().lower()
-        if partition_mode_prep not in ["name=value", "value"]:
-            raise ValueError("Invalid value for partition_mode argument "
-                             f"({partition_mode}). Acceptable values are "
-                             "'name=value' and 'value'")
 
-        # Partition mode follows the 'name=value' format
-        if partition_mode_prep == "name=value":
-            self.logger.debug("The partition mode chosen was 'name=value', so "
-                              "let's take the given prefix URI and extract "
-                              "name and value of the partition")
+        Args:
+            path (str):
+                The path of the file.
 
-            # Starting by finding where the partition name are in the URI
-            partition_start_idx = prefix_uri.find(date_partition_name + "=")
-            if partition_start_idx == -1:
-                raise ValueError(f"Partition name ({date_partition_name}) "
-                                 "doesn't exist in the prefix URI "
-                                 f"({prefix_uri})")
+            as_table (bool, optional):
+                Whether a pyarrow Table is returned instead of a DataFrame.
 
-            # Taking the partition prefix and its value
-            partition_prefix = prefix_uri[partition_start_idx:].split("/")[0]
-            partition_value_raw = partition_prefix.split("=")[-1]
+        Returns:
+            pd.DataFrame: The report (or a pyarrow Table if `as_table=True`).
+            Columns of the DataFrame are read-only views of the file.
 
-        # Partition mode follows the 'value' format
-        elif partition_mode_prep == "value":
-            self.logger.debug("The partition mode chosen was 'value', so "
-                              "let's just extract the partition value "
-                              "according to the 'date_partition_idx' given "
-                              "by user.")
-            # Taking the partition value
-            partition_value_raw = prefix_uri.split("/")[date_partition_idx]
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+        """
 
-        self.logger.debug("Casting the partition value to integer")
+        self.logger.debug(f"Loading a report from {path}")
         try:
-            partition_value = int(partition_value_raw)
-        except ValueError as ve:
-            self.logger.error("Error on casting the partition value "
-                              f"({partition_value_raw}) to integer. In many "
-                              "cases, this error is related on trying to cast "
-                              "a non integer partition value that was "
-                              "incorretly gotten using information passed by "
-                              "the user on method's call. Check if all method "
-                              "arguments are correct.")
-            raise ve
+            table_report = read_ipc_file(path)
 
-        return partition_value
-
-    def get_last_date_partition(
-        self,
-        bucket_name: str,
-        table_prefix: str,
-        partition_mode: str = "name=value",
-        date_partition_name: str = "anomesdia",
-        date_partition_idx: int = -2
-    ) -> int:
-        """
-        Retrieves the last date partition from a table in a S3 bucket.
+        except Exception as e:
+            self.logger.error(f"Error on loading a report from {path}. "
+                              f"Exception: {e}")
+            raise e
 
-        In big data scenarios, tables are stored in S3 in URIs that, at most,
-        uses the following structure:
-        s3://bucket-name/table-name/partition-name=value/data.parquet. So,
-        applications that needs to consume partitioned tables applies filters
-        and other optimization techniques to retrieve only data they need.
+        if as_table:
+            return table_report
 
-        In ETL proccess that stores new data frequently in daily, monthly,
-        weekly or any other basis, new partitions are added everytime. So,
-        consumers (other ETL proccesses or applications) that need to retrieve
-        only the last data from a parent proccess may need to know in advance
-        if the parent proccess had already stored their data.
+        # Each column is kept in its own block so numeric data is not copied
+        return table_report.to_pandas(split_blocks=True)
 
-        One way to do that is by looking at the date partitions of a given
-        table as S3 prefixes and retrieving the value of the last
-        partition. And that's what this method does.
+    @staticmethod
+    def _is_cached(cache_path: str, refresh_cache: bool) -> bool:
+        return cache_path is not None and not refresh_cache \
+            and os.path.exists(cache_path)
 
-        Tip: How is it possible?
-            As a rule of construction, to get the last date partition from a
-            table, the following steps are done:
+    @staticmethod
+    def _pushdown_pattern(prefix: str, pattern) -> tuple:
+        # Listing only the literal prefix of the pattern (None if no key fits)
+        if pattern is None:
+            return prefix, None
 
-            1. Retrieval of a pandas DataFrame with all objects information
-            from the given bucket (using the table name/prefix as a filter)
-            2. Extraction of all objects keys
-            3. Collection of all partition values from the object keys
-            4. Sorting of all partition values and collection of the last one
+        return pushdown_prefix(prefix, pattern), compile_key_pattern(pattern)
 
-            As an additional information, this method puts together other
-            methods from S3Client class as following:
+    def _list_pages(self, bucket_name: str, prefix: str = "", **kwargs):
+        """
+        Yields the pages of a listing, each one requested within the limiter.
 
-            - `bucket_objects_report()` to get all objects from the bucket
-            - `get_date_partition_value_from_prefix()` to get partition value
+        Each page is a single call under the limiter key of the prefix, so a
+        throttled page is retried on its own and pages already yielded are
+        never listed again.
 
         Args:
-            bucket_name (str):
-                The name of the S3 bucket.
+            bucket_name (str): The name of the S3 bucket.
+            prefix (str, optional): A prefix to filter objects.
+            **kwargs: Other arguments of list_objects_v2 (e.g. StartAfter).
 
-            table_prefix (str):
-                The table name used as a prefix filter
+        Yields:
+            dict: Each list_objects_v2 response.
+        """
 
-            partition_mode (str, optional):
-                The mode for extracting the partition value.
-                Options are "name=value" (default) or "value".
+        params = {"Bucket": bucket_name, "Prefix": prefix, **kwargs}
+        while True:
+            page = self.limiter.run(
+                limiter_key(bucket_name, prefix, is_prefix=True),
+                self.client.list_objects_v2,
+                **params
+            )
+            yield page
 
-            date_partition_name (str, optional):
-                The name of the date partition in the URI.
+            if not page.get("IsTruncated"):
+                return
+            params["ContinuationToken"] = page["NextContinuationToken"]
 
-            date_partition_idx (int, optional):
-                The index of the date partition in the URI when using "value"
-                mode.
+    def _spill_bucket_report(
+        self,
+        buffer: SpillBuffer,
+        partition: int,
+        bucket_name: str,
+        prefix: str = "",
+        pattern=None
+    ) -> None:
+        """
+        Lists a bucket page by page, adding report batches to a buffer.
 
-        Returns:
-            int: The last date partition value.
+        Args:
+            buffer (SpillBuffer): The buffer that holds report batches.
+            partition (int): The buffer partition of the bucket.
+            bucket_name (str): The name of the S3 bucket.
+            prefix (str, optional): A prefix to filter objects.
+            pattern (str or re.Pattern, optional): A glob or regex keys must
+                match.
+        """
 
-        Raises:
-            botocore.exceptions.ClientError: If there's an error while making\
-                the request.
+        prefix, key_pattern = self._pushdown_pattern(prefix, pattern)
+        if prefix is None:
+            return
 
-        Examples:
-            ```python
-            # Importing the class
+        self.logger.debug(f"Retrieving objects from {bucket_name}/{prefix}")
+        try:
+            for page in self._list_pages(bucket_name, prefix):
+                contents = matching_contents(page.get("Contents", []),
+                                             key_pattern)
+                if contents:
+                    buffer.add(objects_report_batch(bucket_name, contents),
+                               partition=partition)
+
+        except Exception as e:
+            self.logger.error("Error on calling client.list_objects_v2() "
+                              f"method with Bucket={bucket_name} and prefix="
+                              f"{prefix}. Exception: {e}")
+            raise e
+
+        buffer.close_partition(partition)
+
+    def _spilled_objects_report(
+        self,
+        buckets: list,
+        prefix: str = "",
+        max_workers: int = None,
+        max_memory: int = None,
+        spill_dir: str = None,
+        pattern=None
+    ) -> pa.Table:
+        """
+        Builds an objects report of many buckets under a memory budget.
+
+        Args:
+            buckets (list): The names of the S3 buckets.
+            prefix (str, optional): A prefix to filter objects.
+            max_workers (int, optional): The number of threads.
+            max_memory (int): The budget (in bytes) of rows held in memory.
+            spill_dir (str, optional): Where temporary files are written.
+            pattern (str or re.Pattern, optional): A glob or regex keys must
+                match.
+
+        Returns:
+            pyarrow.Table: A memory-mapped table with the report rows in the
+            order of the buckets list.
+        """
+
+        buffer = SpillBuffer(
+            schema=objects_report_schema(),
+            max_memory=max_memory,
+            n_partitions=len(buckets),
+            spill_dir=spill_dir
+        )
+
+        # Listing buckets in parallel, each one in its own buffer partition
+        try:
+            with ThreadPoolExecutor(max_workers or self.max_workers) as \
+                    executor:
+                list(executor.map(
+                    propagate(partial(self._spill_bucket_report, buffer)),
+                    range(len(buckets)),
+                    buckets,
+                    repeat(prefix),
+                    repeat(pattern)
+                ))
+
+            with span("S3Client.all_buckets_objects_report.finish_spill",
+                      spilled_bytes=buffer.spilled_bytes):
+                return buffer.finish()
+
+        finally:
+            # Files of a failed build are never left behind
+            buffer.close()
+
+    @traced("S3Client.distributed_objects_report")
+    def distributed_objects_report(
+        self,
+        bucket_name: str,
+        prefix: str = "",
+        processes: int = None,
+        ranges_per_process: int = DEFAULT_RANGES_PER_PROCESS,
+        output_dir: str = None,
+        client_factory=None,
+        pattern=None
+    ) -> pa.Table:
+        """
+        Retrieve a report of objects of a huge bucket using many processes.
+
+        A single Python process can't parse listing responses of buckets
+        with hundreds of millions of objects fast enough, even with threads,
+        as XML parsing holds the GIL. This method splits the keyspace of the
+        bucket in lexicographic key ranges and lists each range on a worker
+        process, so listing throughput scales with the number of CPU cores.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Listing a huge bucket with 16 processes
+            s3 = S3Client()
+            table_report = s3.distributed_objects_report(
+                bucket_name="some-huge-bucket",
+                processes=16
+            )
+            ```
+
+        Args:
+            bucket_name (str):
+                The name of the S3 bucket.
+
+            prefix (str, optional):
+                A prefix to filter objects.
+
+            processes (int, optional):
+                The number of worker processes. Defaults to the number of
+                CPU cores.
+
+            ranges_per_process (int, optional):
+                How many key ranges are created for each process. Ranges
+                don't hold the same number of keys, so having more ranges
+                than processes keeps all processes busy until the end.
+
+            output_dir (str, optional):
+                Where workers write their Arrow IPC files. Defaults to the
+                system temporary directory. "/dev/shm" keeps results in RAM
+                on Linux hosts with a large enough shared memory mount.
+
+            client_factory (Callable, optional):
+                A picklable callable that creates the boto3 client of each
+                worker. Defaults to a client with the configuration of this
+                instance.
+
+            pattern (str or re.Pattern, optional):
+                A glob or a compiled regex that keys must match (see
+                `bucket_objects_report()`). Key ranges are only sampled
+                under its literal prefix.
+
+        Returns:
+            pyarrow.Table: A memory-mapped table with the same columns of
+            `bucket_objects_report()`, sorted by key. It can be turned into
+            a DataFrame with `table.to_pandas()`.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+
+        Tip: How key ranges are found
+            Range boundaries are sampled with a bounded number of
+            `list_objects_v2` calls with `MaxKeys=1`, bisecting the keyspace
+            with `StartAfter` probes. Each worker then lists its range with
+            `StartAfter` and stops on the first key beyond it. Results come
+            back as Arrow record batches written to files that are
+            memory-mapped by the calling process, so they travel through the
+            OS page cache instead of being pickled.
+        """
+
+        # Process pools load multiprocessing, which is too slow for imports
+        from concurrent.futures import ProcessPoolExecutor
+
+        processes = processes or os.cpu_count()
+        prefix, _ = self._pushdown_pattern(prefix, pattern)
+        if prefix is None:
+            self.logger.warning(f"No key of {bucket_name} can match both the "
+                                f"prefix and the pattern {pattern}")
+            return objects_report_schema().empty_table()
+
+        if client_factory is None:
+            client_factory = partial(get_client, self.service_name,
+                                     **self.client_kwargs)
+
+        with span("S3Client.distributed_objects_report.sample_boundaries"):
+            boundaries = self._sample_key_boundaries(
+                bucket_name=bucket_name,
+                prefix=prefix,
+                n_boundaries=processes * ranges_per_process - 1
+            )
+        ranges = key_ranges(boundaries)
+        self.logger.debug(f"Listing {bucket_name}/{prefix} in {len(ranges)} "
+                          f"key ranges with {processes} processes")
+
+        tmp_dir = tempfile.mkdtemp(prefix="cloudgeass-ranges-",
+                                   dir=output_dir)
+        paths = [os.path.join(tmp_dir, f"range-{i:06d}.arrow")
+                 for i in range(len(ranges))]
+        try:
+            with ProcessPoolExecutor(processes) as executor:
+                list(executor.map(
+                    _list_key_range,
+                    repeat(client_factory),
+                    repeat(bucket_name),
+                    repeat(prefix),
+                    [start_after for start_after, _ in ranges],
+                    [end_key for _, end_key in ranges],
+                    paths,
+                    repeat(pattern)
+                ))
+
+            # Mapped pages stay valid after the files are removed
+            tables = [read_ipc_file(path) for path in paths]
+
+        except Exception as e:
+            self.logger.error("Error on listing key ranges of bucket "
+                              f"{bucket_name} and prefix {prefix} on worker "
+                              f"processes. Exception: {e}")
+            raise e
+
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return pa.concat_tables(tables)
+
+    def _sample_key_boundaries(
+        self,
+        bucket_name: str,
+        prefix: str,
+        n_boundaries: int,
+        max_probes: int = None
+    ) -> list:
+        """
+        Samples keys of a bucket to be used as boundaries of key ranges.
+
+        The keyspace is explored like a trie, with `StartAfter` probes that
+        return the first key after a given string. Known keys delimit
+        intervals that are split (shallowest first) until enough keys are
+        found or about `max_probes` calls (64 plus 8 per boundary by
+        default) are made. An interval whose keys share `level` characters
+        is split:
+
+        - on the character halfway between its bounds at `level`, if there
+          is room between them, or else
+        - on the shallowest level where keys diverge from its lower bound:
+          probing `low[:i + 1]` followed by the highest character returns
+          the first key of the next branch, and a binary search on that
+          character finds the first key of the last branch
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            prefix (str): A prefix to filter objects.
+            n_boundaries (int): How many boundaries are wanted.
+            max_probes (int, optional): The maximum number of calls.
+
+        Returns:
+            list: Up to `n_boundaries` sorted keys of the bucket.
+        """
+
+        max_probes = max_probes or 64 + 8 * n_boundaries
+
+        def probe(start_after: str, high: str = None) -> str:
+            # Returns the first key after start_after (and below high)
+            kwargs = {"Bucket": bucket_name, "Prefix": prefix, "MaxKeys": 1}
+            if start_after is not None:
+                kwargs["StartAfter"] = start_after
+
+            contents = self.limiter.run(
+                limiter_key(bucket_name, prefix, is_prefix=True),
+                self.client.list_objects_v2,
+                **kwargs
+            ).get("Contents")
+            key = contents[0]["Key"] if contents else None
+            return key if high is None or key is None or key < high else None
+
+        def last_branch_key(base: str, lowest: int, high: str) -> tuple:
+            # Binary search of the highest character after base with keys
+            # (surrogates can't be encoded, so non-ASCII stops below them)
+            if high is not None and len(high) > len(base):
+                low_char, high_char = lowest, ord(high[len(base)])
+            else:
+                low_char, high_char = lowest, 0x7F
+
+            n_probes = 1
+            if high_char == 0x7F and probe(base + chr(0x7F), high):
+                low_char, high_char = 0x7F, 0xD7FF
+
+            while low_char < high_char:
+                middle_char = (low_char + high_char + 1) // 2
+                n_probes += 1
+                if probe(base + chr(middle_char), high) is not None:
+                    low_char = middle_char
+                else:
+                    high_char = middle_char - 1
+
+            return probe(base + chr(low_char), high), n_probes + 1
+
+        def split(interval: tuple) -> tuple:
+            low, high, level, depth = interval
+
+            # Bisecting the branches between both bounds
+            midpoint = branch_midpoint(low, high, level) \
+                if high is not None else None
+            if midpoint is not None:
+                key = probe(midpoint, high)
+                if key is not None:
+                    return [(key, depth)], [(low, midpoint, level, depth),
+                                            (key, high, level, depth)], 1
+
+                return [], [(low, midpoint, level, depth)], 1
+
+            # Looking for the shallowest level where keys diverge from low
+            key, n_probes, interval_level = None, 0, level
+            while key is None and level < len(low):
+                key = probe(low[:level + 1] + "\U0010ffff", high)
+                n_probes += 1
+                level += 0 if key is not None else 1
+
+            if key is None:
+                return [], [], n_probes
+
+            # Keys below the level of the interval branch from a deeper node
+            depth += 1 if level > interval_level else 0
+            last_key, n_branch_probes = last_branch_key(low[:level],
+                                                        ord(key[level]),
+                                                        high)
+            n_probes += n_branch_probes
+            if last_key is None or last_key <= key:
+                return [(key, depth)], [(low, key, level + 1, depth + 1),
+                                        (key, high, level, depth)], n_probes
+
+            return [(key, depth), (last_key, depth)], [
+                (low, key, level + 1, depth + 1),
+                (key, last_key, level, depth),
+                (last_key, high, level + 1, depth + 1)
+            ], n_probes
+
+        first_key = probe(None)
+        if first_key is None or n_boundaries < 1:
+            return []
+
+        def enough_keys() -> bool:
+            # Keys found later can't branch from shallower nodes
+            depths = sorted(keys.values())
+            return len(depths) >= n_boundaries and \
+                depths[n_boundaries - 1] < intervals[0][0]
+
+        # Intervals are (low, high, level, depth) tuples whose keys share the
+        # first `level` characters. The last one has no high bound. The
+        # depth counts the branching characters (the trie nodes with many
+        # children) above an interval, and found keys are kept with the
+        # depth of the node they branch from: shallow branches (e.g. tables
+        # or years) split the keyspace in more even ranges than deep ones
+        keys = {}
+        intervals = []
+        counter = count()
+        heapq.heappush(intervals, (0, next(counter),
+                                   (first_key, None, len(prefix), 0)))
+        probes = 1
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            while intervals and probes < max_probes and not enough_keys():
+                batch = [heapq.heappop(intervals)[-1] for _ in range(
+                    min(len(intervals), self.max_workers)
+                )]
+                for found_keys, new_intervals, n_probes in executor.map(
+                    propagate(split), batch
+                ):
+                    keys.update(found_keys)
+                    probes += n_probes
+                    for interval in new_intervals:
+                        heapq.heappush(intervals, (interval[3],
+                                                   next(counter), interval))
+
+        return sorted(sorted(keys, key=keys.get)[:n_boundaries])
+
+    @traced("S3Client.estimate_bucket_stats")
+    def estimate_bucket_stats(
+        self,
+        bucket_name: str,
+        prefix: str = "",
+        n_samples: int = DEFAULT_STATS_SAMPLES,
+        max_keys: int = 100,
+        max_requests: int = DEFAULT_STATS_MAX_REQUESTS,
+        confidence: float = 0.95,
+        seed: int = None
+    ) -> dict:
+        """
+        Estimates the size of a bucket with a bounded number of calls.
+
+        Listing a bucket with tens of millions of objects takes hours. When
+        approximate figures are enough (e.g. "about 40M objects and 120
+        TB"), this method samples random parts of the keyspace with
+        `StartAfter` and a small `MaxKeys` and extrapolates the number of
+        objects, their total size, their size distribution and their
+        extension mix, along with confidence intervals. No more than
+        `max_requests` listing calls are made, no matter how big the bucket
+        is.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Estimating the size of a huge bucket in a few seconds
+            s3 = S3Client()
+            stats = s3.estimate_bucket_stats(bucket_name="some-huge-bucket")
+
+            print(stats["Objects"])  # {"Estimate": ..., "Low": ..., ...}
+            print(stats["SizeFormatted"])  # "120.13 TB"
+            ```
+
+        Args:
+            bucket_name (str):
+                The name of the S3 bucket.
+
+            prefix (str, optional):
+                A prefix to filter objects.
+
+            n_samples (int, optional):
+                How many random dives are made on the keyspace. More dives
+                narrow confidence intervals.
+
+            max_keys (int, optional):
+                The `MaxKeys` of each listing call. Ranges with fewer keys
+                are counted exactly.
+
+            max_requests (int, optional):
+                The maximum number of listing calls. Dives left unfinished
+                when it's reached are discarded.
+
+            confidence (float, optional):
+                The confidence level of the intervals.
+
+            seed (int, optional):
+                A seed for the random choices of dives, so estimates can be
+                reproduced.
+
+        Returns:
+            dict: A dictionary with the estimated "Objects" and "Size" (in
+            bytes), the "SizeFormatted" of the estimated size, the
+            estimated number of objects by "SizeDistribution" (the unit of
+            their formatted size) and by "ObjectTypes" (their extension).
+            Each estimate is a dictionary with its "Estimate", "Low" and
+            "High" values. "Exact" tells whether every key was listed (so
+            estimates are exact), while "Samples" and "Requests" hold the
+            number of finished dives and listing calls.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+            ValueError: If `max_keys` is lower than 2 or no dive could be\
+                finished within `max_requests`.
+
+        Tip: How objects are counted
+            Keys are seen as a tree where each character is a level. Each
+            dive starts at the root (the prefix) and lists its first
+            `max_keys` keys. When a node holds more keys than that, the dive
+            jumps straight to the longest branch shared by all of them and
+            lists the first keys of each branch (the next character) with
+            `StartAfter`. Branches fully listed are counted exactly and the
+            dive goes on in a random one of the others, whose objects count
+            as many times as there were branches to choose from. This is
+            Knuth's estimator of the size of a tree: each dive is an
+            unbiased estimate and their spread gives the confidence
+            intervals. Choices of all dives are stratified (as in a Latin
+            hypercube), so dives cover the keyspace evenly, and listing
+            calls are cached, as dives share the nodes close to the root.
+        """
+
+        # Validating the listing page size
+        if max_keys < 2:
+            raise ValueError(f"Invalid max_keys ({max_keys}). At least 2 keys "
+                             "per listing call are needed to tell branches "
+                             "apart")
+
+        self.logger.debug(f"Estimating stats of {bucket_name}/{prefix} with "
+                          f"{n_samples} dives")
+        pages = {}
+        n_requests = count(1)
+        lock = threading.Lock()
+
+        def list_after(start_after: str) -> tuple:
+            # Returns the first objects after start_after and if there are more
+            page = pages.get(start_after)
+            if page is None:
+                with lock:
+                    if next(n_requests) > max_requests:
+                        return None
+
+                kwargs = {"Bucket": bucket_name, "Prefix": prefix,
+                          "MaxKeys": max_keys}
+                if start_after is not None:
+                    kwargs["StartAfter"] = start_after
+
+                response = self.limiter.run(
+                    limiter_key(bucket_name, prefix, is_prefix=True),
+                    self.client.list_objects_v2,
+                    **kwargs
+                )
+                page = ([(obj["Key"], obj["Size"])
+                         for obj in response.get("Contents", [])],
+                        response.get("IsTruncated", False))
+                pages[start_after] = page
+
+            return page
+
+        def node_objects(node: str, page: tuple) -> tuple:
+            # Returns the first objects of a node and if they are all
+            objects, truncated = page
+            node_objects = [obj for obj in objects if obj[0].startswith(node)]
+            return node_objects, \
+                not truncated or not objects[-1][0].startswith(node)
+
+        def shares(node: str, branch: str) -> bool:
+            # Checks if every key of a node is in the given branch of it
+            page = list_after(branch + "\U0010ffff")
+            return None if page is None else \
+                not page[0] or not page[0][0][0].startswith(node)
+
+        def shared_branch(node: str, objects: list) -> str:
+            # Binary search of the longest branch with every key of a node,
+            # starting with the most common case: keys diverge right away
+            first_key = objects[0][0]
+            lowest = len(node)
+            highest = len(os.path.commonprefix([first_key, objects[-1][0]]))
+            if lowest < highest:
+                found = shares(node, first_key[:lowest + 1])
+                if found is None:
+                    return None
+                lowest, highest = (lowest + 1, highest) if found else \
+                    (lowest, lowest)
+
+            while lowest < highest:
+                level = (lowest + highest + 1) // 2
+                found = shares(node, first_key[:level])
+                if found is None:
+                    return None
+                lowest, highest = (level, highest) if found else \
+                    (lowest, level - 1)
+
+            return first_key[:lowest]
+
+        def branches(node: str, page: tuple) -> list:
+            # Returns the next characters of the keys of a node along with
+            # the first page where each one of them shows up
+            first_pages = {}
+            while page is not None:
+                for key, _ in page[0]:
+                    if key.startswith(node) and len(key) > len(node):
+                        first_pages.setdefault(key[len(node)], page)
+
+                # Pages going beyond the node hold its last branch
+                last_key = page[0][-1][0] if page[0] else node
+                if not page[1] or not last_key.startswith(node):
+                    return list(first_pages.items())
+
+                page = list_after(node + last_key[len(node)] + "\U0010ffff")
+
+            return None
+
+        def add_objects(stats: Counter, objects: list, weight: int) -> None:
+            for key, size in objects:
+                stats[("Objects",)] += weight
+                stats[("Size",)] += weight * size
+                unit = categorize_file_size(size).split()[-1]
+                stats[("SizeDistribution", unit)] += weight
+                stats[("ObjectTypes", key.split(".")[-1])] += weight
+
+        def dive(index: int) -> tuple:
+            rng = random.Random(seeds[index])
+            stats, weight, randomized = Counter(), 1, False
+            depth = 0
+
+            node, page = prefix, list_after(None)
+            while page is not None:
+                objects, complete = node_objects(node, page)
+                if complete:
+                    add_objects(stats, objects, weight)
+                    return stats, randomized
+
+                # A key equal to the node can't be in any of its branches
+                if objects[0][0] == node:
+                    add_objects(stats, objects[:1], weight)
+                    objects = objects[1:]
+
+                    # Its branches may only show up on the next page
+                    if not objects:
+                        page = list_after(node)
+                        if page is None:
+                            return None
+
+                        objects, complete = node_objects(node, page)
+                        if complete:
+                            add_objects(stats, objects, weight)
+                            return stats, randomized
+
+                # Going straight down to where keys branch off
+                branch = shared_branch(node, objects)
+                if branch is None:
+                    return None
+
+                if branch != node:
+                    node = branch
+                    continue
+
+                # Branches fully listed are counted and the dive goes on in
+                # a random one of the others, whose keys count for all
+                node_branches = branches(node, page)
+                if node_branches is None:
+                    return None
+
+                incomplete = []
+                for char, branch_page in node_branches:
+                    branch_objects, complete = node_objects(node + char,
+                                                            branch_page)
+                    if complete:
+                        add_objects(stats, branch_objects, weight)
+                    else:
+                        incomplete.append((char, branch_page))
+
+                if not incomplete:
+                    return stats, randomized
+
+                if len(incomplete) > 1:
+                    # Latin hypercube: the d-th choices of all dives are
+                    # stratified, each dive taking one stratum of [0, 1)
+                    if depth < len(strata):
+                        u = (strata[depth][index] + rng.random()) / len(seeds)
+                    else:
+                        u = rng.random()
+                    depth += 1
+                    char, page = incomplete[int(u * len(incomplete))]
+                    weight *= len(incomplete)
+                    randomized = True
+                else:
+                    char, page = incomplete[0]
+
+                node += char
+
+            return None
+
+        try:
+            rng = random.Random(seed)
+            seeds = [rng.random() for _ in range(n_samples)]
+            strata = [rng.sample(range(n_samples), n_samples)
+                      for _ in range(STATS_STRATIFIED_LEVELS)]
+            samples = [dive(0)]
+            if samples[0] is None:
+                raise ValueError(f"Not a single dive on {bucket_name}/"
+                                 f"{prefix} could be finished with "
+                                 f"max_requests={max_requests}")
+
+            # Dives without random choices listed every key
+            exact = not samples[0][1]
+            if not exact:
+                with ThreadPoolExecutor(self.max_workers) as executor:
+                    samples += executor.map(propagate(dive),
+                                            range(1, n_samples))
+
+        except Exception as e:
+            self.logger.error("Error on estimating stats of bucket "
+                              f"{bucket_name} and prefix {prefix}. "
+                              f"Exception: {e}")
+            raise e
+
+        samples = [stats for stats, _ in filter(None, samples)]
+        self.logger.debug(f"{len(samples)} dives were finished with "
+                          f"{len(pages)} listing calls")
+
+        # Objects already listed are a lower bound of every estimate
+        observed = Counter()
+        add_objects(observed, {obj for objects, _ in pages.values()
+                               for obj in objects}, 1)
+
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+        estimates = {}
+        for metric in set().union(*samples):
+            values = [stats[metric] for stats in samples]
+            mean = statistics.fmean(values)
+            margin = z * statistics.stdev(values) / len(values) ** 0.5 \
+                if len(values) > 1 else 0
+            estimates[metric] = {
+                "Estimate": round(max(mean, observed[metric])),
+                "Low": round(max(mean - margin, observed[metric])),
+                "High": round(max(mean + margin, observed[metric]))
+            }
+
+        # Sizes are sorted by unit and extensions by their estimates
+        size_distribution = {
+            unit: estimates[("SizeDistribution", unit)]
+            for unit in SIZE_UNITS if ("SizeDistribution", unit) in estimates
+        }
+        object_types = dict(sorted(
+            ((metric[1], estimate) for metric, estimate in estimates.items()
+             if metric[0] == "ObjectTypes"),
+            key=lambda item: -item[1]["Estimate"]
+        ))
+
+        empty = {"Estimate": 0, "Low": 0, "High": 0}
+        return {
+            "BucketName": bucket_name,
+            "Prefix": prefix,
+            "Objects": estimates.get(("Objects",), empty),
+            "Size": estimates.get(("Size",), empty),
+            "SizeFormatted": categorize_file_size(
+                estimates.get(("Size",), empty)["Estimate"]
+            ),
+            "SizeDistribution": size_distribution,
+            "ObjectTypes": object_types,
+            "Exact": exact,
+            "Samples": len(samples),
+            "Requests": min(next(n_requests) - 1, max_requests)
+        }
+
+    @traced("S3Client.buckets_storage_report")
+    def buckets_storage_report(
+        self,
+        bucket_names: list = None,
+        regions: list = None,
+        fallback: bool = True,
+        lookback_days: int = STORAGE_METRICS_LOOKBACK_DAYS
+    ) -> pd.DataFrame:
+        """
+        Retrieves the size and object count of buckets from CloudWatch.
+
+        S3 publishes the daily `BucketSizeBytes` (by storage type) and
+        `NumberOfObjects` storage metrics of every bucket to CloudWatch for
+        free. Reading them takes a few calls per region, no matter how many
+        objects buckets hold, while `bucket_objects_report()` lists every
+        single object. Buckets without metrics (e.g. buckets created in the
+        last day or empty buckets) are listed instead.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Getting the size of all buckets in two regions
+            s3 = S3Client()
+            df_storage = s3.buckets_storage_report(
+                regions=["us-east-1", "sa-east-1"]
+            )
+
+            # Summarizing the whole account
+            total_objects = df_storage["Objects"].sum()
+            total_size = df_storage["Size"].sum()
+            ```
+
+        Args:
+            bucket_names (list, optional):
+                The buckets to be reported. Defaults to all buckets in the
+                account (see `list_buckets()`).
+
+            regions (list, optional):
+                The regions whose CloudWatch metrics are read, as metrics of
+                each bucket are published in its own region. Defaults to the
+                region of each bucket (see `get_bucket_location()`), so each
+                region is only queried for its own buckets.
+
+            fallback (bool, optional):
+                Whether buckets without metrics are listed. Otherwise, they
+                are left out of the report.
+
+            lookback_days (int, optional):
+                How many days back the last datapoints are looked up.
+
+        Returns:
+            pd.DataFrame: A DataFrame with a row for each bucket and columns
+            'BucketName', 'Region', 'Objects', 'Size', 'SizeFormatted',
+            'StorageTypes' (a dictionary with the size of each CloudWatch
+            storage type, e.g. "StandardStorage"), 'Timestamp' (of the
+            datapoints or of the listing) and 'Source' ("CloudWatch" or
+            "Listing"). Buckets listed have no 'Region'.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+        """
+
+        if bucket_names is None:
+            bucket_names = self.list_buckets()
+
+        end_time = datetime.now(timezone.utc)
+        start_time = end_time - timedelta(days=lookback_days)
+
+        if regions is None:
+            # Looking up the region of each bucket in parallel
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                bucket_regions = dict(zip(bucket_names, executor.map(
+                    propagate(self._bucket_region), bucket_names
+                )))
+
+            regions_buckets = {}
+            for bucket_name, region in bucket_regions.items():
+                regions_buckets.setdefault(region, set()).add(bucket_name)
+
+        else:
+            regions_buckets = {region: None for region in regions}
+
+        # Reading metrics of buckets not found in previous regions
+        rows = {}
+        for region, region_buckets in regions_buckets.items():
+            missing = (region_buckets or set(bucket_names)) - set(rows)
+            if not missing:
+                continue
+
+            try:
+                rows.update(self._storage_metrics(
+                    region=region,
+                    bucket_names=missing,
+                    start_time=start_time,
+                    end_time=end_time
+                ))
+
+            except Exception as e:
+                self.logger.error("Error on reading storage metrics of "
+                                  f"region {region}. Exception: {e}")
+                raise e
+
+        missing = [b for b in bucket_names if b not in rows]
+        self.logger.debug(f"Storage metrics of {len(rows)} buckets were "
+                          f"found and {len(missing)} buckets are missing")
+
+        if missing and fallback:
+            # Listing buckets without metrics in parallel (pages are limited)
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                listed_rows = executor.map(
+                    propagate(self._listed_storage_stats),
+                    missing
+                )
+                rows.update(zip(missing, listed_rows))
+
+        elif missing:
+            self.logger.warning(f"Buckets without storage metrics were left "
+                                f"out of the report: {missing}")
+
+        df_storage = pd.DataFrame(
+            [rows[b] for b in bucket_names if b in rows],
+            columns=STORAGE_REPORT_COLUMNS
+        )
+        df_storage["SizeFormatted"] = df_storage["Size"].apply(
+            categorize_file_size
+        )
+        df_storage["Timestamp"] = pd.to_datetime(df_storage["Timestamp"],
+                                                 utc=True)
+
+        return df_storage
+
+    def _storage_metrics(
+        self,
+        region: str,
+        bucket_names: set,
+        start_time: datetime,
+        end_time: datetime
+    ) -> dict:
+        """
+        Reads the last storage metrics of buckets from a CloudWatch region.
+
+        Only buckets with both `NumberOfObjects` and `BucketSizeBytes`
+        datapoints are returned.
+
+        Args:
+            region (str): The region of the CloudWatch metrics.
+            bucket_names (set): The buckets whose metrics are read.
+            start_time (datetime): The start of the lookback window.
+            end_time (datetime): The end of the lookback window.
+
+        Returns:
+            dict: Storage report rows (as dictionaries) by bucket name.
+        """
+
+        credentials = {name: self.client_kwargs[name]
+                       for name in CREDENTIAL_CLIENT_KWARGS
+                       if name in self.client_kwargs}
+        cloudwatch = get_client("cloudwatch", region_name=region,
+                                **credentials)
+
+        # Finding the metrics of the buckets (with a page per 500 metrics)
+        metrics = {}
+        paginator = cloudwatch.get_paginator("list_metrics")
+        for metric_name in ("NumberOfObjects", "BucketSizeBytes"):
+            for page in paginator.paginate(Namespace="AWS/S3",
+                                           MetricName=metric_name):
+                for metric in page["Metrics"]:
+                    dimensions = {d["Name"]: d["Value"]
+                                  for d in metric["Dimensions"]}
+                    if dimensions.get("BucketName") in bucket_names:
+                        metrics[(metric_name, dimensions["BucketName"],
+                                 dimensions.get("StorageType"))] = metric
+
+        # Reading the last datapoint of all metrics in batches of queries
+        datapoints = {}
+        paginator = cloudwatch.get_paginator("get_metric_data")
+        metric_ids = list(metrics)
+        for start in range(0, len(metric_ids), METRIC_DATA_MAX_QUERIES):
+            batch = metric_ids[start:start + METRIC_DATA_MAX_QUERIES]
+            queries = [{
+                "Id": f"m{i}",
+                "MetricStat": {
+                    "Metric": metrics[metric_id],
+                    "Period": 86400,
+                    "Stat": "Average"
+                },
+                "ReturnData": True
+            } for i, metric_id in enumerate(batch)]
+
+            with span("S3Client.buckets_storage_report.get_metric_data",
+                      region=region, queries=len(queries)):
+                for page in paginator.paginate(MetricDataQueries=queries,
+                                               StartTime=start_time,
+                                               EndTime=end_time,
+                                               ScanBy="TimestampDescending"):
+                    for result in page["MetricDataResults"]:
+                        points = list(zip(result["Timestamps"],
+                                          result["Values"]))
+                        if points:
+                            metric_id = batch[int(result["Id"][1:])]
+                            datapoints[metric_id] = max(points)
+
+        # Building rows of buckets with both metrics
+        rows = {}
+        for (metric_name, bucket, storage_type), point in datapoints.items():
+            row = rows.setdefault(bucket, {
+                "BucketName": bucket,
+                "Region": region,
+                "Objects": None,
+                "Size": 0,
+                "StorageTypes": {},
+                "Timestamp": point[0],
+                "Source": "CloudWatch"
+            })
+            row["Timestamp"] = max(row["Timestamp"], point[0])
+            if metric_name == "NumberOfObjects":
+                row["Objects"] = int(point[1])
+            else:
+                row["StorageTypes"][storage_type] = int(point[1])
+                row["Size"] += int(point[1])
+
+        return {bucket: row for bucket, row in rows.items()
+                if row["Objects"] is not None and row["StorageTypes"]}
+
+    def _bucket_region(self, bucket_name: str) -> str:
+        """
+        Looks up the region of a bucket.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+
+        Returns:
+            str: The region of the bucket.
+        """
+
+        try:
+            response = self.client.get_bucket_location(Bucket=bucket_name)
+
+        except Exception as e:
+            self.logger.error("Error on looking up the region of bucket "
+                              f"{bucket_name}. Exception: {e}")
+            raise e
+
+        constraint = response.get("LocationConstraint")
+        return LEGACY_LOCATION_CONSTRAINTS.get(constraint, constraint)
+
+    def _listed_storage_stats(self, bucket_name: str) -> dict:
+        """
+        Lists a bucket to sum the size of its objects by storage type.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+
+        Returns:
+            dict: A storage report row (as a dictionary) of the bucket.
+        """
+
+        self.logger.debug(f"Listing bucket {bucket_name} without storage "
+                          "metrics")
+        storage_types = Counter()
+        n_objects = 0
+        try:
+            for page in self._list_pages(bucket_name):
+                for obj in page.get("Contents", []):
+                    storage_class = obj.get("StorageClass", "STANDARD")
+                    storage_type = STORAGE_CLASS_STORAGE_TYPES.get(
+                        storage_class, storage_class
+                    )
+                    storage_types[storage_type] += obj["Size"]
+                    n_objects += 1
+
+        except Exception as e:
+            self.logger.error("Error on listing objects of bucket "
+                              f"{bucket_name}. Exception: {e}")
+            raise e
+
+        return {
+            "BucketName": bucket_name,
+            "Region": None,
+            "Objects": n_objects,
+            "Size": sum(storage_types.values()),
+            "StorageTypes": dict(storage_types),
+            "Timestamp": datetime.now(timezone.utc),
+            "Source": "Listing"
+        }
+
+    @traced("S3Client.duplicate_objects_report")
+    def duplicate_objects_report(
+        self,
+        bucket_names: list = None,
+        prefix: str = "",
+        pattern=None,
+        min_size: int = 1,
+        verify: bool = False,
+        verify_bytes: int = DEFAULT_VERIFY_BYTES,
+        max_workers: int = None
+    ) -> pd.DataFrame:
+        """
+        Finds groups of duplicated objects across buckets.
+
+        Objects with the same size and ETag are reported as duplicates, as
+        the ETag of an object is the MD5 of its content (or of its parts, for
+        multipart uploads). Only the listings of buckets are needed, so no
+        object is read unless `verify` is True.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Finding duplicated parquet files across all buckets
+            s3 = S3Client()
+            df_duplicates = s3.duplicate_objects_report(pattern="*.parquet")
+
+            wasted_bytes = df_duplicates["WastedBytes"].sum()
+            ```
+
+        Args:
+            bucket_names (list, optional):
+                The buckets to be searched. Defaults to all buckets in the
+                account (see `list_buckets()`).
+
+            prefix (str, optional):
+                A prefix to filter objects.
+
+            pattern (str or re.Pattern, optional):
+                A glob or a compiled regex that keys must match (see
+                `bucket_objects_report()`).
+
+            min_size (int, optional):
+                The size of the smallest objects searched. Empty objects
+                (e.g. folder markers) share the same ETag, so they're skipped
+                by default.
+
+            verify (bool, optional):
+                Whether candidates are confirmed by checksums of their
+                content. The first, middle and last `verify_bytes` bytes of
+                each candidate are read with ranged GetObject calls, so
+                duplicates are confirmed even for ETags that aren't MD5
+                digests (e.g. objects encrypted with SSE-KMS).
+
+            verify_bytes (int, optional):
+                How many bytes are read from each part of a candidate.
+
+            max_workers (int, optional):
+                The number of threads used to list buckets and read
+                candidates. Defaults to the connection pool size of the
+                client.
+
+        Returns:
+            pd.DataFrame: A DataFrame with a row for each group of
+            duplicates, sorted by wasted bytes, with columns 'Size',
+            'SizeFormatted', 'ETag', 'Copies', 'WastedBytes' (the size of
+            all copies but one), 'WastedFormatted', 'Objects' (a sorted list
+            of "s3://bucket/key" URIs) and 'Verified'.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+
+        Tip: How memory is bounded
+            Buckets are listed twice. The first listing only keeps the size
+            of each object (8 bytes per object in a compact array) to find
+            sizes shared by many objects. The second listing only keeps the
+            objects with those sizes, which are grouped by size and ETag.
+            Most objects of a lake have a unique size, so they are never
+            held in memory.
+        """
+
+        if bucket_names is None:
+            bucket_names = self.list_buckets()
+
+        def run_on_buckets(func, *args) -> list:
+            # Listing buckets in parallel (pages are limited)
+            with ThreadPoolExecutor(max_workers or self.max_workers) as \
+                    executor:
+                return list(executor.map(
+                    propagate(lambda bucket: func(bucket, prefix, pattern,
+                                                  *args)),
+                    bucket_names
+                ))
+
+        # Finding sizes shared by many objects
+        with span("S3Client.duplicate_objects_report.list_sizes"):
+            sizes = np.concatenate([np.empty(0, dtype=np.int64)] + [
+                np.frombuffer(bucket_sizes, dtype=np.int64) for bucket_sizes
+                in run_on_buckets(self._listed_sizes, min_size)
+            ])
+            unique_sizes, counts = np.unique(sizes, return_counts=True)
+            shared_sizes = set(unique_sizes[counts > 1].tolist())
+
+        self.logger.debug(f"{len(shared_sizes)} sizes are shared by "
+                          f"{int(counts[counts > 1].sum())} of {len(sizes)} "
+                          "objects")
+        del sizes, unique_sizes, counts
+
+        # Grouping objects with shared sizes by their size and ETag
+        groups = {}
+        if shared_sizes:
+            with span("S3Client.duplicate_objects_report.group_candidates"):
+                for candidates in run_on_buckets(self._listed_candidates,
+                                                 shared_sizes):
+                    for size, etag, bucket, key in candidates:
+                        groups.setdefault((size, etag), []).append((bucket,
+                                                                    key))
+
+        groups = [(size, etag, objects)
+                  for (size, etag), objects in groups.items()
+                  if len(objects) > 1]
+        if verify and groups:
+            groups = self._verified_groups(groups, verify_bytes, max_workers)
+
+        df_duplicates = pd.DataFrame(
+            [(size, None, etag, len(objects), size * (len(objects) - 1), None,
+              [f"s3://{bucket}/{key}" for bucket, key in sorted(objects)],
+              verify) for size, etag, objects in groups],
+            columns=DUPLICATES_REPORT_COLUMNS
+        )
+        df_duplicates["SizeFormatted"] = df_duplicates["Size"].apply(
+            categorize_file_size
+        )
+        df_duplicates["WastedFormatted"] = df_duplicates["WastedBytes"].apply(
+            categorize_file_size
+        )
+
+        return df_duplicates.sort_values(
+            ["WastedBytes", "ETag"], ascending=[False, True], ignore_index=True
+        )
+
+    def _iter_objects(self, bucket_name: str, prefix: str = "",
+                      pattern=None):
+        """
+        Yields the objects of a bucket, listing it page by page.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            prefix (str, optional): A prefix to filter objects.
+            pattern (str or re.Pattern, optional): A glob or regex keys must
+                match.
+
+        Yields:
+            dict: The summary of each object in the listing.
+        """
+
+        prefix, key_pattern = self._pushdown_pattern(prefix, pattern)
+        if prefix is None:
+            return
+
+        try:
+            for page in self._list_pages(bucket_name, prefix):
+                yield from matching_contents(page.get("Contents", []),
+                                             key_pattern)
+
+        except Exception as e:
+            self.logger.error("Error on calling client.list_objects_v2() "
+                              f"method with Bucket={bucket_name} and prefix="
+                              f"{prefix}. Exception: {e}")
+            raise e
+
+    def _listed_sizes(
+        self,
+        bucket_name: str,
+        prefix: str,
+        pattern,
+        min_size: int
+    ) -> array:
+        # Sizes are kept in a compact array of 64 bits integers
+        return array("q", (obj["Size"] for obj in self._iter_objects(
+            bucket_name, prefix, pattern
+        ) if obj["Size"] >= min_size))
+
+    def _listed_candidates(
+        self,
+        bucket_name: str,
+        prefix: str,
+        pattern,
+        shared_sizes: set
+    ) -> list:
+        # Only objects whose size is shared by others can be duplicates
+        candidates = []
+        for obj in self._iter_objects(bucket_name, prefix, pattern):
+            if obj["Size"] in shared_sizes:
+                candidates.append((obj["Size"], obj.get("ETag"), bucket_name,
+                                   obj["Key"]))
+
+        return candidates
+
+    def _verified_groups(
+        self,
+        groups: list,
+        verify_bytes: int,
+        max_workers: int = None
+    ) -> list:
+        """
+        Splits groups of candidates by checksums of their content.
+
+        Args:
+            groups (list): The size, ETag and (bucket, key) tuples of each
+                group.
+            verify_bytes (int): Bytes read from each part of an object.
+            max_workers (int, optional): The number of threads.
+
+        Returns:
+            list: The groups of objects with the same checksum, with the
+            size and ETag of their original group.
+        """
+
+        candidates = [(bucket, key, size) for size, _, objects in groups
+                      for bucket, key in objects]
+        with ThreadPoolExecutor(max_workers or self.max_workers) as executor:
+            checksums = executor.map(
+                propagate(lambda candidate: self.limiter.run(
+                    limiter_key(candidate[0], candidate[1]),
+                    self._ranged_checksum,
+                    *candidate,
+                    verify_bytes
+                )),
+                candidates
+            )
+            checksums = dict(zip(((b, k) for b, k, _ in candidates),
+                                 checksums))
+
+        # Objects of a group are split by their checksums
+        verified = []
+        for size, etag, objects in groups:
+            by_checksum = {}
+            for obj in objects:
+                by_checksum.setdefault(checksums[obj], []).append(obj)
+
+            verified.extend((size, etag, checksum_objects)
+                            for checksum_objects in by_checksum.values()
+                            if len(checksum_objects) > 1)
+
+        self.logger.debug(f"{len(verified)} of {len(groups)} groups of "
+                          "duplicates were confirmed")
+        return verified
+
+    def _ranged_checksum(
+        self,
+        bucket_name: str,
+        key: str,
+        size: int,
+        verify_bytes: int
+    ) -> str:
+        """
+        Computes a SHA-256 checksum of the start, middle and end of an object.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            key (str): The object key.
+            size (int): The size of the object.
+            verify_bytes (int): Bytes read from each part of the object.
+
+        Returns:
+            str: The hexadecimal checksum.
+        """
+
+        checksum = hashlib.sha256()
+
+        # Empty objects have no byte range to be read
+        if size == 0:
+            return checksum.hexdigest()
+
+        # Small objects are read at once and others on three ranges
+        if size <= 3 * verify_bytes:
+            ranges = [(0, size - 1)]
+        else:
+            middle = (size - verify_bytes) // 2
+            ranges = [(0, verify_bytes - 1),
+                      (middle, middle + verify_bytes - 1),
+                      (size - verify_bytes, size - 1)]
+
+        try:
+            for start, end in ranges:
+                response = self.client.get_object(Bucket=bucket_name,
+                                                  Key=key,
+                                                  Range=f"bytes={start}-{end}")
+                checksum.update(response["Body"].read())
+
+        except Exception as e:
+            self.logger.error("Error on calling client.get_object() method "
+                              f"with Bucket={bucket_name} and Key={key}. "
+                              f"Exception: {e}")
+            raise e
+
+        return checksum.hexdigest()
+
+    @traced("S3Client.build_key_index")
+    def build_key_index(
+        self,
+        bucket_name: str,
+        prefix: str = "",
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+        cache_path: str = None,
+        refresh_cache: bool = False
+    ) -> KeyIndex:
+        """
+        Builds an index of the keys of a bucket for fast existence checks.
+
+        Keys are indexed from a single listing pass on a `KeyIndex`, which
+        keeps a Bloom filter and a sorted array of front-coded keys. Indexes
+        are passed to `exists()` to check many keys without a HeadObject
+        call for each one.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Indexing a table and reusing the index on later runs
+            s3 = S3Client()
+            index = s3.build_key_index(
+                bucket_name="some-bucket-name",
+                prefix="table/",
+                cache_path="/tmp/some-bucket-name-table.keyindex"
+            )
+
+            "table/anomesdia=20230117/part-00000.parquet" in index
+            ```
+
+        Args:
+            bucket_name (str):
+                The name of the S3 bucket.
+
+            prefix (str, optional):
+                A prefix to filter objects. Keys without it are unknown to
+                the index.
+
+            false_positive_rate (float, optional):
+                The expected fraction of missing keys passing the Bloom
+                filter, which are then searched on the sorted keys.
+
+            cache_path (str, optional):
+                A file used as cache. If it exists, the index is loaded from
+                it without listing the bucket. Otherwise, the index is saved
+                on it.
+
+            refresh_cache (bool, optional):
+                Whether the index is built and saved again even if
+                `cache_path` exists.
+
+        Returns:
+            cloudgeass.utils.keyindex.KeyIndex: The index of the keys.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+        """
+
+        if self._is_cached(cache_path, refresh_cache):
+            self.logger.debug(f"Loading a key index from {cache_path}")
+            return KeyIndex.load(cache_path)
+
+        with span("S3Client.build_key_index.list"):
+            index = KeyIndex.from_keys(
+                (obj["Key"] for obj in self._iter_objects(bucket_name,
+                                                          prefix)),
+                bucket_name=bucket_name,
+                prefix=prefix,
+                false_positive_rate=false_positive_rate
+            )
+
+        self.logger.debug(f"Indexed {len(index)} keys of bucket {bucket_name} "
+                          f"with prefix {prefix!r} on {len(index.data)} bytes "
+                          f"of keys and {len(index.bloom)} bytes of filter")
+        if cache_path is not None:
+            index.save(cache_path)
+
+        return index
+
+    @traced("S3Client.exists")
+    def exists(
+        self,
+        bucket_name: str,
+        keys: list,
+        index: KeyIndex = None,
+        verify: bool = False,
+        max_workers: int = None
+    ) -> dict:
+        """
+        Checks whether many keys exist in a bucket.
+
+        Keys covered by an index (the ones on its bucket and prefix) are
+        answered locally: keys rejected by its Bloom filter don't exist and
+        the remaining ones are searched on its sorted keys. Only keys the
+        index doesn't cover are checked with HeadObject calls, which run in
+        parallel.
+
+        Indexes are snapshots of a listing, so keys written after the index
+        was built are reported as missing (rebuild the index with
+        `refresh_cache=True` to see them). Keys deleted since then are
+        reported as existing unless `verify` is True.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Checking expected partitions of a table
+            s3 = S3Client()
+            index = s3.build_key_index("some-bucket-name", prefix="table/")
+            expected_keys = [
+                f"table/anomesdia=202301{day:02d}/part-00000.parquet"
+                for day in range(1, 32)
+            ]
+
+            found = s3.exists("some-bucket-name", expected_keys, index=index)
+            missing_keys = [key for key, exist in found.items() if not exist]
+            ```
+
+        Args:
+            bucket_name (str):
+                The name of the S3 bucket.
+
+            keys (list):
+                The keys to be checked.
+
+            index (cloudgeass.utils.keyindex.KeyIndex, optional):
+                An index returned by `build_key_index()`. Without it, every
+                key is checked with a HeadObject call.
+
+            verify (bool, optional):
+                Whether keys found on the index are confirmed with HeadObject
+                calls. Keys rejected by the index are never requested, so
+                only possible positives cost a round trip.
+
+            max_workers (int, optional):
+                The number of threads used to make HeadObject calls. Defaults
+                to the connection pool size of the client.
+
+        Returns:
+            dict: Whether each key exists, in the order of `keys`.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+        """
+
+        # Answering keys covered by the index locally
+        found = {}
+        head_keys = []
+        for key in keys:
+            if key in found:
+                continue
+
+            if index is not None and index.covers(bucket_name, key):
+                found[key] = key in index
+                if found[key] and verify:
+                    head_keys.append(key)
+            else:
+                found[key] = False
+                head_keys.append(key)
+
+        self.logger.debug(f"{len(found) - len(head_keys)} of {len(found)} "
+                          f"keys of bucket {bucket_name} were answered by the "
+                          "index")
+        if head_keys:
+            with span("S3Client.exists.head"), \
+                    ThreadPoolExecutor(max_workers or self.max_workers) as \
+                    executor:
+                found.update(zip(head_keys, executor.map(
+                    propagate(lambda key: self.limiter.run(
+                        limiter_key(bucket_name, key),
+                        self._object_exists,
+                        bucket_name,
+                        key
+                    )),
+                    head_keys
+                )))
+
+        return {key: found[key] for key in keys}
+
+    def _object_exists(self, bucket_name: str, key: str) -> bool:
+        """
+        Checks whether an object exists with a HeadObject call.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            key (str): The object key.
+
+        Returns:
+            bool: True if the object exists.
+        """
+
+        try:
+            self.client.head_object(Bucket=bucket_name, Key=key)
+
+        except self.client.exceptions.ClientError as e:
+            # Missing objects are reported with a 404 status and no body
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return False
+
+            self.logger.error("Error on calling client.head_object() method "
+                              f"with Bucket={bucket_name} and Key={key}. "
+                              f"Exception: {e}")
+            raise e
+
+        return True
+
+    @traced("S3Client.enrich_objects_report")
+    def enrich_objects_report(
+        self,
+        report: pd.DataFrame,
+        fields: list = ENRICHMENT_FIELDS,
+        max_rate: float = None,
+        max_workers: int = None,
+        cache_path: str = None,
+        refresh_cache: bool = False
+    ) -> pd.DataFrame:
+        """
+        Adds the content type, user metadata and tags of objects to a report.
+
+        Listings don't return these fields, so they are fetched for each row
+        with HeadObject (content type and metadata) and GetObjectTagging
+        (tags) calls. Calls run on a bounded thread pool within the adaptive
+        limits of the client, optionally under a fixed rate. Only the calls
+        needed by the given fields are made, and rows can be selected by
+        filtering the report before enriching it.
+
+        Fetched fields can be cached by object and ETag, so repeated reports
+        only make calls for new or changed objects.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Enriching the CSV files of a bucket, reusing previous calls
+            s3 = S3Client()
+            df_report = s3.bucket_objects_report(bucket_name="some-bucket")
+            df_csv = df_report[df_report["ObjectType"] == "csv"]
+
+            df_enriched = s3.enrich_objects_report(
+                df_csv,
+                max_rate=100,
+                cache_path="/tmp/some-bucket-enrichment.arrow"
+            )
+            ```
+
+        Args:
+            report (pd.DataFrame):
+                A report returned by `bucket_objects_report()` or by
+                `all_buckets_objects_report()`, or some of its rows.
+
+            fields (list, optional):
+                The fields to be added among 'ContentType', 'Metadata' and
+                'Tags'.
+
+            max_rate (float, optional):
+                The maximum number of calls per second. Defaults to no fixed
+                rate, so calls are only bounded by the concurrency limiter.
+
+            max_workers (int, optional):
+                The number of threads used to make calls. Defaults to the
+                connection pool size of the client.
+
+            cache_path (str, optional):
+                An Arrow IPC file used as cache. Fields of objects whose ETag
+                didn't change since they were cached are read from it, and
+                fetched fields are saved on it.
+
+            refresh_cache (bool, optional):
+                Whether every field is fetched again even if it's cached.
+                Tags can be changed without changing the ETag of an object,
+                so caches of tags must be refreshed from time to time.
+
+        Returns:
+            pd.DataFrame: A copy of the report with a column for each field.
+            'Metadata' and 'Tags' hold dictionaries.
+
+        Raises:
+            ValueError: If a field isn't supported.
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+        """
+
+        unknown_fields = set(fields) - set(ENRICHMENT_FIELDS)
+        if unknown_fields:
+            raise ValueError(f"Invalid fields ({sorted(unknown_fields)}). "
+                             "Acceptable values are "
+                             f"{list(ENRICHMENT_FIELDS)}")
+
+        fields = [field for field in ENRICHMENT_FIELDS if field in fields]
+        cache = self._load_enrichment_cache(cache_path)
+
+        # Finding the fields missing for each object
+        objects = list(zip(report["BucketName"], report["Key"],
+                           report["ETag"]))
+        pending = {}
+        for bucket_name, key, etag in objects:
+            entry = cache.get((bucket_name, key))
+            if refresh_cache or entry is None or entry["ETag"] != etag:
+                entry = {"ETag": etag}
+                cache[(bucket_name, key)] = entry
+
+            # Fetched fields can be None, so only absent ones are missing
+            missing_fields = [field for field in fields
+                              if field not in entry]
+            if missing_fields:
+                pending[(bucket_name, key)] = missing_fields
+
+        n_objects = len({(bucket_name, key)
+                         for bucket_name, key, _ in objects})
+        self.logger.debug(f"Fetching fields of {len(pending)} of {n_objects} "
+                          "objects, the others were cached")
+        if pending:
+            rate_limiter = RateLimiter(max_rate) if max_rate else None
+            with span("S3Client.enrich_objects_report.fetch"), \
+                    ThreadPoolExecutor(max_workers or self.max_workers) as \
+                    executor:
+                fetched = executor.map(
+                    propagate(lambda item: self._object_enrichment(
+                        *item[0], item[1], rate_limiter
+                    )),
+                    pending.items()
+                )
+                for obj, enrichment in zip(pending, fetched):
+                    cache[obj].update(enrichment)
+
+            if cache_path is not None:
+                self._save_enrichment_cache(cache, cache_path)
+
+        df_enriched = report.copy()
+        for field in fields:
+            df_enriched[field] = [cache[(bucket_name, key)][field]
+                                  for bucket_name, key, _ in objects]
+
+        return df_enriched
+
+    def _object_enrichment(
+        self,
+        bucket_name: str,
+        key: str,
+        fields: list,
+        rate_limiter: RateLimiter = None
+    ) -> dict:
+        """
+        Fetches fields of an object with HeadObject and tagging calls.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            key (str): The object key.
+            fields (list): The fields to be fetched.
+            rate_limiter (RateLimiter, optional): A limiter of the call rate.
+
+        Returns:
+            dict: The fetched fields, with the ETag returned by HeadObject.
+        """
+
+        def call(method, **kwargs):
+            # Every call takes a token of the rate and a limiter slot
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            try:
+                return self.limiter.run(limiter_key(bucket_name, key),
+                                        method, Bucket=bucket_name, Key=key,
+                                        **kwargs)
+
+            except Exception as e:
+                self.logger.error(f"Error on calling client.{method.__name__}"
+                                  f"() method with Bucket={bucket_name} and "
+                                  f"Key={key}. Exception: {e}")
+                raise e
+
+        enrichment = {}
+        if HEAD_OBJECT_FIELDS.intersection(fields):
+            response = call(self.client.head_object)
+            enrichment["ContentType"] = response.get("ContentType")
+            enrichment["Metadata"] = response.get("Metadata", {})
+
+            # Objects changed since they were listed are cached as they are
+            if response.get("ETag") is not None:
+                enrichment["ETag"] = response["ETag"]
+
+        if "Tags" in fields:
+            response = call(self.client.get_object_tagging)
+            enrichment["Tags"] = {tag["Key"]: tag["Value"]
+                                  for tag in response.get("TagSet", [])}
+
+        return enrichment
+
+    def _load_enrichment_cache(self, cache_path: str) -> dict:
+        # Caches are keyed by bucket and key, with the ETag on each entry
+        if cache_path is None or not os.path.exists(cache_path):
+            return {}
+
+        self.logger.debug(f"Loading cached fields from {cache_path}")
+        cache = {}
+        for row in read_ipc_file(cache_path).to_pylist():
+            # Nulls are either fetched as None or never fetched, so entries
+            # only keep the fields recorded as fetched
+            fetched = row.get("Fields")
+            if fetched is None:
+                fetched = [field for field in ENRICHMENT_FIELDS
+                           if row.get(field) is not None]
+
+            entry = {"ETag": row["ETag"]}
+            for field in fetched:
+                value = row[field]
+                if field in ("Metadata", "Tags") and value is not None:
+                    value = dict(value)
+
+                entry[field] = value
+
+            cache[(row["BucketName"], row["Key"])] = entry
+
+        return cache
+
+    def _save_enrichment_cache(self, cache: dict, cache_path: str) -> None:
+        rows = [{"BucketName": bucket_name, "Key": key, **entry,
+                 "Fields": [field for field in ENRICHMENT_FIELDS
+                            if field in entry]}
+                for (bucket_name, key), entry in cache.items()]
+
+        self.logger.debug(f"Saving cached fields of {len(rows)} objects on "
+                          f"{cache_path}")
+        try:
+            write_ipc_file(pa.Table.from_pylist(
+                rows, schema=enrichment_cache_schema()
+            ), cache_path)
+
+        except Exception as e:
+            self.logger.error(f"Error on saving cached fields on {cache_path}"
+                              f". Exception: {e}")
+            raise e
+
+    def get_date_partition_value_from_prefix(
+        self,
+        prefix_uri: str,
+        partition_mode: str = "name=value",
+        date_partition_name: str = "anomesdia",
+        date_partition_idx: int = -2
+    ) -> int:
+        """
+        Extracts the date partition value from a given URI prefix.
+
+        Args:
+            prefix_uri (str):
+                The URI prefix containing the date partition information.
+
+            partition_mode (str, optional):
+                The mode for extracting the partition value.
+                Options are "name=value" (default) or "value".
+
+            date_partition_name (str, optional):
+                The name of the date partition in the URI.
+
+            date_partition_idx (int, optional):
+                The index of the date partition in the URI when using "value"
+                mode.
+
+        Returns:
+            int: The extracted date partition value.
+
+        Raises:
+            ValueError: If there's an issue with the URI or partition\
+                extraction.
+
+        Note:
+            This method extracts the date partition value from a given URI
+            prefix based on the specified partition mode.
+            - In "name=value" mode, it looks for the partition name in the URI
+            and extracts the corresponding value.
+            - In "value" mode, it directly extracts the partition value using
+            the specified index.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Setting up a class instance
+            s3 = S3Client()
+
+            # Getting the partition value given a partition URI
+            uri = "s3://my-bucket/anomesdia=20230101/data/"
+            partition_value = s3.get_date_partition_value_from_prefix(
+                partition_uri=uri,
+                partition_mode="name=value"
+            )
+            # 20230101
+            ```
+        """
+
+        # Checking if partition_mode argument is filled properly
+        partition_mode_prep = partition_mode.strip().lower()
+        if partition_mode_prep not in ["name=value", "value"]:
+            raise ValueError("Invalid value for partition_mode argument "
+                             f"({partition_mode}). Acceptable values are "
+                             "'name=value' and 'value'")
+
+        # Partition mode follows the 'name=value' format
+        if partition_mode_prep == "name=value":
+            self.logger.debug("The partition mode chosen was 'name=value', so "
+                              "let's take the given prefix URI and extract "
+                              "name and value of the partition")
+
+            # Starting by finding where the partition name are in the URI
+            partition_start_idx = prefix_uri.find(date_partition_name + "=")
+            if partition_start_idx == -1:
+                raise ValueError(f"Partition name ({date_partition_name}) "
+                                 "doesn't exist in the prefix URI "
+                                 f"({prefix_uri})")
+
+            # Taking the partition prefix and its value
+            partition_prefix = prefix_uri[partition_start_idx:].split("/")[0]
+            partition_value_raw = partition_prefix.split("=")[-1]
+
+        # Partition mode follows the 'value' format
+        elif partition_mode_prep == "value":
+            self.logger.debug("The partition mode chosen was 'value', so "
+                              "let's just extract the partition value "
+                              "according to the 'date_partition_idx' given "
+                              "by user.")
+            # Taking the partition value
+            partition_value_raw = prefix_uri.split("/")[date_partition_idx]
+
+        self.logger.debug("Casting the partition value to integer")
+        try:
+            partition_value = int(partition_value_raw)
+        except ValueError as ve:
+            self.logger.error("Error on casting the partition value "
+                              f"({partition_value_raw}) to integer. In many "
+                              "cases, this error is related on trying to cast "
+                              "a non integer partition value that was "
+                              "incorretly gotten using information passed by "
+                              "the user on method's call. Check if all method "
+                              "arguments are correct.")
+            raise ve
+
+        return partition_value
+
+    @traced("S3Client.get_last_date_partition")
+    def get_last_date_partition(
+        self,
+        bucket_name: str,
+        table_prefix: str,
+        partition_mode: str = "name=value",
+        date_partition_name: str = "anomesdia",
+        date_partition_idx: int = -2
+    ) -> int:
+        """
+        Retrieves the last date partition from a table in a S3 bucket.
+
+        In big data scenarios, tables are stored in S3 in URIs that, at most,
+        uses the following structure:
+        s3://bucket-name/table-name/partition-name=value/data.parquet. So,
+        applications that needs to consume partitioned tables applies filters
+        and other optimization techniques to retrieve only data they need.
+
+        In ETL proccess that stores new data frequently in daily, monthly,
+        weekly or any other basis, new partitions are added everytime. So,
+        consumers (other ETL proccesses or applications) that need to retrieve
+        only the last data from a parent proccess may need to know in advance
+        if the parent proccess had already stored their data.
+
+        One way to do that is by looking at the date partitions of a given
+        table as S3 prefixes and retrieving the value of the last
+        partition. And that's what this method does.
+
+        Tip: How is it possible?
+            As a rule of construction, to get the last date partition from a
+            table, the following steps are done:
+
+            1. Retrieval of a pandas DataFrame with all objects information
+            from the given bucket (using the table name/prefix as a filter)
+            2. Extraction of all objects keys
+            3. Collection of all partition values from the object keys
+            4. Sorting of all partition values and collection of the last one
+
+            As an additional information, this method puts together other
+            methods from S3Client class as following:
+
+            - `bucket_objects_report()` to get all objects from the bucket
+            - `get_date_partition_value_from_prefix()` to get partition value
+
+        Args:
+            bucket_name (str):
+                The name of the S3 bucket.
+
+            table_prefix (str):
+                The table name used as a prefix filter
+
+            partition_mode (str, optional):
+                The mode for extracting the partition value.
+                Options are "name=value" (default) or "value".
+
+            date_partition_name (str, optional):
+                The name of the date partition in the URI.
+
+            date_partition_idx (int, optional):
+                The index of the date partition in the URI when using "value"
+                mode.
+
+        Returns:
+            int: The last date partition value.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+            ValueError: If there are no objects under the table prefix.
+
+        Examples:
+            ```python
+            # Importing the class
             from cloudgeass.aws.s3 import S3Client
 
             # Setting up a class instance
@@ -468,23 +2839,710 @@ class S3Client():
             prefix=table_prefix
         )
 
+        if df_objects is None:
+            raise ValueError(f"There are no objects on {bucket_name}/"
+                             f"{table_prefix} to get a date partition from")
+
         self.logger.debug("Retrieving a list of object keys")
         objs_list = list(df_objects["Key"].values)
 
         self.logger.debug("Looping over all object keys and getting the "
                           "partition value from each prefix")
         partition_values = []
-        for obj_prefix in objs_list:
-            partition_value = self.get_date_partition_value_from_prefix(
-                prefix_uri=obj_prefix,
-                partition_mode=partition_mode,
-                date_partition_name=date_partition_name,
-                date_partition_idx=date_partition_idx
-            )
-
-            # Appending the value in a list
-            partition_values.append(partition_value)
+        with span("S3Client.get_last_date_partition.parse_partitions",
+                  keys=len(objs_list)):
+            for obj_prefix in objs_list:
+                partition_value = self.get_date_partition_value_from_prefix(
+                    prefix_uri=obj_prefix,
+                    partition_mode=partition_mode,
+                    date_partition_name=date_partition_name,
+                    date_partition_idx=date_partition_idx
+                )
+
+                # Appending the value in a list
+                partition_values.append(partition_value)
 
         self.logger.debug("Sorting the partition values list and getting the "
                           "last one")
         return sorted(partition_values)[-1]
+
+    @staticmethod
+    def _iter_body_chunks(body, chunk_size: int):
+        """
+        Yields chunks of bytes from a str, bytes or file-like object body.
+
+        Args:
+            body (str or bytes or file-like): The content to be chunked.
+            chunk_size (int): The maximum size of each chunk in bytes.
+
+        Yields:
+            bytes: The next chunk of the body.
+        """
+
+        # Reading file-like objects without loading them entirely in memory
+        if hasattr(body, "read"):
+            while True:
+                chunk = body.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk.encode("utf-8") if isinstance(chunk, str) \
+                    else chunk
+            return
+
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    @traced("S3Client.upload_object")
+    def upload_object(
+        self,
+        bucket_name: str,
+        key: str,
+        body,
+        compression: str = None,
+        compression_level: int = None,
+        part_size: int = MULTIPART_PART_SIZE,
+        max_workers: int = None,
+        extra_args: dict = None
+    ) -> dict:
+        """
+        Uploads an object to S3, optionally compressing it on the fly.
+
+        The body is split into chunks that are compressed on a thread pool
+        while the previously compressed bytes are already being sent to S3 as
+        parts of a multipart upload. Bodies that fit in a single part are
+        sent with a simple put_object call.
+
+        Args:
+            bucket_name (str):
+                The name of the S3 bucket.
+
+            key (str):
+                The object key.
+
+            body (str or bytes or file-like):
+                The object content. File-like objects are read in chunks.
+
+            compression (str, optional):
+                A content encoding used to compress the body ("gzip" or
+                "zstd"). The `ContentEncoding` metadata is set accordingly.
+
+            compression_level (int, optional):
+                The compression level for the chosen codec.
+
+            part_size (int, optional):
+                The size in bytes of both compression chunks and upload parts.
+
+            max_workers (int, optional):
+                The number of threads used to upload parts. Defaults to the
+                connection pool size of the client (see the
+                performance_profile argument). Compression uses at most one
+                thread per CPU.
+
+            extra_args (dict, optional):
+                Additional arguments passed to put_object or
+                create_multipart_upload (e.g. {"ContentType": "text/csv"}).
+
+        Returns:
+            dict: The response of put_object or complete_multipart_upload.
+
+        Raises:
+            ValueError: If the compression or the part size is invalid.
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+
+        Note:
+            Each chunk is compressed independently. Concatenated gzip members
+            and zstd frames are valid streams, so the resulting object can be
+            decoded by any standard tool or by `read_object()`.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Uploading a gzip compressed CSV file
+            s3 = S3Client()
+            with open("export.csv", "rb") as f:
+                s3.upload_object(
+                    bucket_name="some-bucket-name",
+                    key="exports/export.csv",
+                    body=f,
+                    compression="gzip",
+                    extra_args={"ContentType": "text/csv"}
+                )
+            ```
+        """
+
+        # Validating the upload configuration
+        if part_size < MULTIPART_MIN_PART_SIZE:
+            raise ValueError(f"Invalid part_size ({part_size}). S3 requires "
+                             f"parts with at least {MULTIPART_MIN_PART_SIZE} "
+                             "bytes")
+
+        upload_args = dict(extra_args or {})
+        if compression is not None:
+            compression = compression.strip().lower()
+            if compression not in SUPPORTED_CONTENT_ENCODINGS:
+                raise ValueError(f"Invalid value for compression argument "
+                                 f"({compression}). Acceptable values are "
+                                 f"{list(SUPPORTED_CONTENT_ENCODINGS)}")
+            upload_args["ContentEncoding"] = compression
+
+        def prepare_chunk(chunk: bytes) -> bytes:
+            if compression is None:
+                return chunk
+            with span("S3Client.upload_object.compress_chunk",
+                      size=len(chunk)):
+                return compress_bytes(chunk, compression, compression_level)
+
+        # Sizing thread pools according to the client connection pool
+        upload_workers = max_workers or self.max_workers
+        compress_workers = min(upload_workers, os.cpu_count() or 1)
+        max_chunks_in_flight = compress_workers * 2
+
+        upload_id = None
+        parts = []
+        buffer = bytearray()
+
+        self.logger.debug(f"Uploading object {bucket_name}/{key} with "
+                          f"compression={compression}")
+        try:
+            with ThreadPoolExecutor(compress_workers) as compressors, \
+                    ThreadPoolExecutor(upload_workers) as uploaders:
+                chunk_futures = deque()
+                part_futures = deque()
+
+                def collect_part():
+                    parts.append(part_futures.popleft().result())
+
+                def send_part(part_body: bytes):
+                    nonlocal upload_id
+                    if upload_id is None:
+                        upload_id = self.client.create_multipart_upload(
+                            Bucket=bucket_name,
+                            Key=key,
+                            **upload_args
+                        )["UploadId"]
+
+                    part_number = len(parts) + len(part_futures) + 1
+                    part_futures.append(uploaders.submit(
+                        propagate(self.limiter.run),
+                        limiter_key(bucket_name, key), self._upload_part,
+                        bucket_name, key, upload_id, part_number, part_body
+                    ))
+                    if len(part_futures) > upload_workers:
+                        collect_part()
+
+                def drain_chunk():
+                    buffer.extend(chunk_futures.popleft().result())
+                    while len(buffer) >= part_size:
+                        send_part(bytes(buffer[:part_size]))
+                        del buffer[:part_size]
+
+                # Compressing chunks in parallel and sending parts in order
+                for chunk in self._iter_body_chunks(body, part_size):
+                    chunk_futures.append(compressors.submit(
+                        propagate(prepare_chunk), chunk
+                    ))
+                    while chunk_futures:
+                        # Draining finished chunks and bounding memory usage
+                        if len(chunk_futures) < max_chunks_in_flight and \
+                                not chunk_futures[0].done():
+                            break
+                        drain_chunk()
+
+                while chunk_futures:
+                    drain_chunk()
+
+                # Small bodies are sent in a single request
+                if upload_id is None:
+                    self.logger.debug("The body fits in a single part. "
+                                      "Calling client.put_object()")
+                    return self.client.put_object(
+                        Bucket=bucket_name,
+                        Key=key,
+                        Body=bytes(buffer),
+                        **upload_args
+                    )
+
+                if buffer:
+                    send_part(bytes(buffer))
+                while part_futures:
+                    collect_part()
+
+            self.logger.debug(f"Completing the multipart upload with "
+                              f"{len(parts)} parts")
+            return self.client.complete_multipart_upload(
+                Bucket=bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error on uploading object {bucket_name}/{key}"
+                              f". Exception: {e}")
+            if upload_id is not None:
+                self.client.abort_multipart_upload(
+                    Bucket=bucket_name,
+                    Key=key,
+                    UploadId=upload_id
+                )
+            raise e
+
+    def _upload_part(
+        self,
+        bucket_name: str,
+        key: str,
+        upload_id: str,
+        part_number: int,
+        part_body: bytes
+    ) -> dict:
+        """
+        Uploads a single part of a multipart upload.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            key (str): The object key.
+            upload_id (str): The multipart upload ID.
+            part_number (int): The part number (starting at 1).
+            part_body (bytes): The part content.
+
+        Returns:
+            dict: The part definition expected by complete_multipart_upload.
+        """
+
+        response = self.client.upload_part(
+            Bucket=bucket_name,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=part_body
+        )
+
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    @traced("S3Client.read_object")
+    def read_object(
+        self,
+        bucket_name: str,
+        key: str,
+        decompress: bool = True
+    ) -> bytes:
+        """
+        Reads the content of an object, decompressing it when applicable.
+
+        Objects whose `ContentEncoding` metadata is one of the supported
+        codecs ("gzip" or "zstd") are transparently decompressed. Codings
+        applied on top of each other (e.g. "gzip, zstd") are decoded from
+        the last one applied.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            key (str): The object key.
+            decompress (bool, optional): Whether to decompress the content.
+
+        Returns:
+            bytes: The object content.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Reading an object uploaded with compression="gzip"
+            s3 = S3Client()
+            content = s3.read_object(
+                bucket_name="some-bucket-name",
+                key="exports/export.csv"
+            )
+            ```
+        """
+
+        self.logger.debug(f"Reading object {bucket_name}/{key}")
+        try:
+            response = self.client.get_object(Bucket=bucket_name, Key=key)
+
+        except Exception as e:
+            self.logger.error("Error on calling client.get_object() method "
+                              f"with Bucket={bucket_name} and Key={key}. "
+                              f"Exception: {e}")
+            raise e
+
+        content = response["Body"].read()
+
+        # Content-Encoding lists codings in the order they were applied
+        # (e.g. "gzip, zstd"), so the last one applied is decoded first
+        content_encodings = [
+            e.strip().lower()
+            for e in response.get("ContentEncoding", "").split(",")
+        ]
+        for content_encoding in reversed(content_encodings):
+            if not decompress:
+                break
+
+            if content_encoding in TRANSPARENT_CONTENT_ENCODINGS:
+                continue
+
+            if content_encoding not in SUPPORTED_CONTENT_ENCODINGS:
+                # Codings applied before an unsupported one can't be undone
+                self.logger.debug(f"Content of {bucket_name}/{key} is left "
+                                  f"{content_encoding} encoded")
+                break
+
+            self.logger.debug(f"Decompressing {content_encoding} content")
+            with span("S3Client.read_object.decompress",
+                      encoding=content_encoding):
+                content = decompress_bytes(content, content_encoding)
+
+        return content
+
+    @traced("S3Client.read_objects")
+    def read_objects(
+        self,
+        bucket_name: str,
+        keys: list,
+        decompress: bool = True,
+        max_workers: int = None
+    ) -> dict:
+        """
+        Reads many objects in parallel, adapting to S3 throttling.
+
+        Calls are spread on a thread pool and gated by the object limiter,
+        which shrinks the concurrency of a bucket prefix when S3 answers with
+        503 SlowDown (or latency grows) and grows it back when calls succeed.
+
+        Args:
+            bucket_name (str):
+                The name of the S3 bucket.
+
+            keys (list):
+                The object keys to be read.
+
+            decompress (bool, optional):
+                Whether to decompress contents with a supported
+                ContentEncoding.
+
+            max_workers (int, optional):
+                The number of threads used to read objects. Defaults to the
+                connection pool size of the client.
+
+        Returns:
+            dict: A dictionary mapping each key to its content.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Reading many objects under a hot prefix
+            s3 = S3Client(performance_profile="high_throughput")
+            contents = s3.read_objects(
+                bucket_name="some-bucket-name",
+                keys=["table/file-001.csv", "table/file-002.csv"]
+            )
+            ```
+        """
+
+        self.logger.debug(f"Reading {len(keys)} objects from {bucket_name}")
+        with ThreadPoolExecutor(max_workers or self.max_workers) as executor:
+            contents = executor.map(
+                propagate(lambda key: self.limiter.run(
+                    limiter_key(bucket_name, key),
+                    self.read_object,
+                    bucket_name,
+                    key,
+                    decompress
+                )),
+                keys
+            )
+
+            return dict(zip(keys, contents))
+
+    def select(
+        self,
+        bucket_name: str,
+        key: str,
+        sql: str,
+        input_format: str = "csv",
+        compression: str = None,
+        input_options: dict = None,
+        as_batches: bool = False,
+        batch_size: int = DEFAULT_SELECT_BATCH_SIZE
+    ) -> pd.DataFrame:
+        """
+        Runs a S3 Select query on an object, streaming its records.
+
+        S3 Select filters CSV, JSON and Parquet objects on the server side,
+        so only the selected rows are sent back instead of the whole object.
+        Records are sent as an event stream and decoded with
+        `pyarrow.json` as they arrive, whenever `batch_size` bytes of
+        complete records are buffered.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Reading a few rows of a huge CSV file
+            s3 = S3Client()
+            df_sales = s3.select(
+                bucket_name="some-bucket-name",
+                key="sales/sales.csv.gz",
+                sql="SELECT s.id, s.total FROM S3Object s WHERE s.id = '42'"
+            )
+
+            # Processing the rows of a Parquet file as they arrive
+            for df_batch in s3.select(
+                bucket_name="some-bucket-name",
+                key="sales/sales.parquet",
+                sql="SELECT * FROM S3Object s WHERE s.total > 1000",
+                input_format="parquet",
+                as_batches=True
+            ):
+                print(len(df_batch))
+            ```
+
+        Args:
+            bucket_name (str):
+                The name of the S3 bucket.
+
+            key (str):
+                The object key.
+
+            sql (str):
+                The S3 Select SQL expression.
+
+            input_format (str, optional):
+                The format of the object: "csv" (with a header line), "json"
+                (JSON lines) or "parquet".
+
+            compression (str, optional):
+                The compression of CSV and JSON objects ("NONE", "GZIP" or
+                "BZIP2"). Defaults to the one of the key extension (e.g.
+                ".gz").
+
+            input_options (dict, optional):
+                Options of the input format that replace the default ones
+                (e.g. {"FieldDelimiter": ";"} for CSV objects).
+
+            as_batches (bool, optional):
+                Whether a generator of DataFrames is returned, each one with
+                the records decoded at once.
+
+            batch_size (int, optional):
+                How many bytes of records are buffered before they're
+                decoded.
+
+        Returns:
+            pd.DataFrame: A DataFrame with the selected records (empty if no
+            record was selected), or a generator of DataFrames if
+            `as_batches` is True.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+            ValueError: If the input format isn't supported.
+            IOError: If the event stream ends before its End event.
+        """
+
+        batches = self._select_batches(
+            bucket_name=bucket_name,
+            key=key,
+            sql=sql,
+            input_serialization=select_input_serialization(
+                key=key,
+                input_format=input_format,
+                compression=compression,
+                input_options=input_options
+            ),
+            batch_size=batch_size
+        )
+        if as_batches:
+            return self._traced_select_batches(batches)
+
+        return self._select_dataframe(batches)
+
+    @traced("S3Client.select")
+    def _traced_select_batches(self, batches):
+        # The span lasts while batches are consumed, not until returned
+        yield from batches
+
+    @traced("S3Client.select")
+    def _select_dataframe(self, batches) -> pd.DataFrame:
+        df_batches = list(batches)
+        if not df_batches:
+            return pd.DataFrame()
+
+        with span("S3Client.select.concat_batches", batches=len(df_batches)):
+            return pd.concat(df_batches, ignore_index=True)
+
+    def _select_batches(
+        self,
+        bucket_name: str,
+        key: str,
+        sql: str,
+        input_serialization: dict,
+        batch_size: int
+    ):
+        """
+        Yields the records of a S3 Select call as DataFrames.
+
+        Records events may split a record in two, so only complete records
+        (the ones before the last line break) are decoded and the rest is
+        kept for the next batch.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            key (str): The object key.
+            sql (str): The S3 Select SQL expression.
+            input_serialization (dict): The InputSerialization of the call.
+            batch_size (int): Bytes of records decoded at once.
+
+        Yields:
+            pd.DataFrame: The records decoded at once.
+        """
+
+        self.logger.debug(f"Selecting records of {bucket_name}/{key}")
+        try:
+            response = self.client.select_object_content(
+                Bucket=bucket_name,
+                Key=key,
+                Expression=sql,
+                ExpressionType="SQL",
+                InputSerialization=input_serialization,
+                OutputSerialization={"JSON": {"RecordDelimiter": "\n"}}
+            )
+
+            buffer = bytearray()
+            ended = False
+            for event in response["Payload"]:
+                if "Records" in event:
+                    buffer += event["Records"]["Payload"]
+                    end = buffer.rfind(b"\n") + 1
+                    if len(buffer) >= batch_size and end:
+                        yield self._decode_records(buffer[:end])
+                        del buffer[:end]
+
+                elif "Stats" in event:
+                    self.logger.debug(f"S3 Select stats of {bucket_name}/"
+                                      f"{key}: {event['Stats']['Details']}")
+
+                elif "End" in event:
+                    ended = True
+
+            if not ended:
+                raise IOError(f"The S3 Select response of {bucket_name}/"
+                              f"{key} ended before its End event")
+
+        except Exception as e:
+            self.logger.error("Error on calling client.select_object_content()"
+                              f" method with Bucket={bucket_name} and Key="
+                              f"{key}. Exception: {e}")
+            raise e
+
+        if buffer.strip():
+            yield self._decode_records(buffer)
+
+    @staticmethod
+    def _decode_records(records: bytearray) -> pd.DataFrame:
+        # Blocks hold every record, so records are never split by pyarrow
+        with span("S3Client.select.decode_records", size=len(records)):
+            read_options = pa_json.ReadOptions(block_size=len(records) + 1)
+            return pa_json.read_json(pa.BufferReader(records),
+                                     read_options=read_options).to_pandas()
+
+    @traced("S3Client.select_objects")
+    def select_objects(
+        self,
+        bucket_name: str,
+        keys: list,
+        sql: str,
+        input_format: str = "csv",
+        compression: str = None,
+        input_options: dict = None,
+        max_workers: int = None
+    ) -> dict:
+        """
+        Runs a S3 Select query on many objects in parallel.
+
+        Calls are spread on a thread pool and gated by the object limiter,
+        just like `read_objects()`.
+
+        Examples:
+            ```python
+            # Importing the class
+            from cloudgeass.aws.s3 import S3Client
+
+            # Selecting rows of every file of a table
+            s3 = S3Client()
+            dfs = s3.select_objects(
+                bucket_name="some-bucket-name",
+                keys=["sales/part-00000.json", "sales/part-00001.json"],
+                sql="SELECT * FROM S3Object s WHERE s.country = 'BR'",
+                input_format="json"
+            )
+            df_sales = pd.concat(dfs.values(), ignore_index=True)
+            ```
+
+        Args:
+            bucket_name (str):
+                The name of the S3 bucket.
+
+            keys (list):
+                The object keys to be queried.
+
+            sql (str):
+                The S3 Select SQL expression.
+
+            input_format (str, optional):
+                The format of the objects (see `select()`).
+
+            compression (str, optional):
+                The compression of the objects (see `select()`).
+
+            input_options (dict, optional):
+                Options of the input format (see `select()`).
+
+            max_workers (int, optional):
+                The number of threads used to query objects. Defaults to the
+                connection pool size of the client.
+
+        Returns:
+            dict: A dictionary mapping each key to the DataFrame of its
+            selected records.
+
+        Raises:
+            botocore.exceptions.ClientError: If there's an error while making\
+                the request.
+        """
+
+        self.logger.debug(f"Selecting records of {len(keys)} objects from "
+                          f"{bucket_name}")
+        with ThreadPoolExecutor(max_workers or self.max_workers) as executor:
+            dfs = executor.map(
+                propagate(lambda key: self.limiter.run(
+                    limiter_key(bucket_name, key),
+                    self.select,
+                    bucket_name,
+                    key,
+                    sql,
+                    input_format,
+                    compression,
+                    input_options
+                )),
+                keys
+            )
+
+            return dict(zip(keys, dfs))
@@ -8,13 +8,11 @@ ___
 """
 
 # Importing libraries
-import boto3
-import logging
+from cloudgeass.aws.base import BaseClient
+from cloudgeass.utils.tracing import traced
 
-from cloudgeass.utils.log import log_config
 
-
-class SecretsManagerClient():
+class SecretsManagerClient(BaseClient):
     """Handles operations using secrets manager client and resource from boto3.
 
     This class provides attributes and methods that can improve the way on how
@@ -36,6 +34,10 @@ class SecretsManagerClient():
         logger_level (int, optional):
             The logger level to be configured on the class logger object
 
+        performance_profile (str, optional):
+            A named botocore performance profile ("high_throughput",
+            "low_latency" or "lambda") from `cloudgeass.aws.profiles`
+
     Attributes:
         logger (logging.Logger):
             A logger object to log steps according to a predefined logger level
@@ -53,23 +55,25 @@ class SecretsManagerClient():
     Tip: About the key word argument **client_kwargs:
         Users can get customized client and resource attributes for the given
         service passing additional keyword arguments. Under the hood, both
-        client and resource class attributes are initialized as following:
+        client and resource class attributes are lazily initialized on first
+        access as following:
 
         ```python
         # Setting up a boto3 client and resource
-        self.client = boto3.client("secretsmanager", **client_kwargs)
-        self.resource = boto3.resource("secretsmanager", **client_kwargs)
+        self.client = get_client("secretsmanager", **client_kwargs)
+        self.resource = get_resource("secretsmanager", **client_kwargs)
         ```
-    """
 
-    def __init__(self, logger_level=logging.INFO, **client_kwargs):
-        # Setting up a logger object
-        self.logger_level = logger_level
-        self.logger = log_config(logger_level=self.logger_level)
+        Clients are taken from a process-wide cache (see
+        `cloudgeass.aws.factory`), so objects created with the same
+        arguments share the same warm boto3 client and connection pool. An
+        AWS profile can be chosen with the `profile_name` keyword argument.
+    """
 
-        # Setting up a boto3 client and resource
-        self.client = boto3.client("secretsmanager", **client_kwargs)
+    # The boto3 service name handled by the class
+    service_name = "secretsmanager"
 
+    @traced("SecretsManagerClient.get_secret_string")
     def get_secret_string(self, secret_id: str) -> str:
         """
         Retrieves the secret string for a given secret ID.
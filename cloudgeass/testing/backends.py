@@ -0,0 +1,553 @@
+"""
+Module: cloudgeass.testing.backends
+
+The module provides S3 backends to set up tests and benchmarks with large
+numbers of objects in seconds:
+
+- `StubS3Backend` answers S3 listing calls from in-memory buckets by hooking
+  the botocore `before-call` event of a client (the same mechanism used by
+  `botocore.stub.Stubber`). No network or moto server is involved, so the
+  measured time is only spent by botocore and cloudgeass. It also runs a
+  small subset of S3 Select SQL on stored bodies.
+- `SyntheticBucket` computes its keys from their position, so a bucket with
+  10 million keys costs nearly no memory until it's listed.
+- `StubBucket` serves any sorted array of keys, e.g. the ones generated by
+  `cloudgeass.testing.data.partitioned_keys()`.
+- `StubSecretsManagerBackend` answers Secrets Manager calls from a dict.
+- `load_into_moto()` bulk loads objects straight into moto's in-memory S3
+  backend, skipping HTTP requests and response parsing.
+
+Examples:
+    ```python
+    # Importing the classes
+    from cloudgeass.testing.backends import StubS3Backend, SyntheticBucket
+
+    backend = StubS3Backend([SyntheticBucket("bench-bucket", n_keys=100000)])
+    s3 = backend.s3_client()
+
+    df_report = s3.bucket_objects_report(bucket_name="bench-bucket")
+    ```
+
+___
+"""
+
+# Importing libraries
+import bisect
+import bz2
+import csv
+import gzip
+import io
+import json
+import operator
+import re
+from datetime import datetime, timedelta, timezone
+
+from cloudgeass.aws.s3 import S3Client
+from cloudgeass.aws.secrets import SecretsManagerClient
+from cloudgeass.utils.lazy import lazy_import
+
+# Heavy dependencies are only imported when a function needs them
+botocore_awsrequest = lazy_import("botocore.awsrequest")
+botocore_response = lazy_import("botocore.response")
+botocore_session = lazy_import("botocore.session")
+pq = lazy_import("pyarrow.parquet")
+
+
+# The maximum number of objects returned by a single ListObjectsV2 call
+MAX_KEYS_PER_PAGE = 1000
+
+# Object sizes are spread between 1 KB and this value
+MAX_OBJECT_SIZE = 512 * 1024 * 1024
+
+# The date of objects whose keys don't carry a date
+DEFAULT_LAST_MODIFIED = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+# The subset of S3 Select SQL run by StubS3Backend: a projection, a single
+# comparison with a literal and a limit
+_SELECT_PATTERN = re.compile(
+    r"^\s*SELECT\s+(?P<columns>.+?)\s+FROM\s+S3Object"
+    r"(?:\s+(?:AS\s+)?(?P<alias>\w+))?"
+    r"(?:\s+WHERE\s+(?P<column>[\w.]+)\s*(?P<op>=|!=|<>|<=|>=|<|>)\s*"
+    r"(?P<value>'[^']*'|-?\d+(?:\.\d+)?))?"
+    r"(?:\s+LIMIT\s+(?P<limit>\d+))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL
+)
+
+# Comparison operators of S3 Select WHERE clauses
+_SELECT_OPERATORS = {
+    "=": operator.eq, "!=": operator.ne, "<>": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge
+}
+
+# Bytes of each Records event sent by StubS3Backend, small enough to split
+# records between events as S3 does
+SELECT_EVENT_SIZE = 64
+
+# Key used to keep call parameters in botocore's request context
+_PARAMS_KEY = "cloudgeass_stub_params"
+
+
+class StubBucket():
+    """A bucket that serves a sorted sequence of keys.
+
+    Args:
+        name (str): The bucket name.
+        keys (list or numpy.ndarray): Lexicographically sorted object keys.
+        sizes (list or numpy.ndarray, optional): The size of each object.
+            Sizes are derived from the key position if not given.
+
+    Attributes:
+        region (str): The region returned by GetBucketLocation calls.
+    """
+
+    def __init__(self, name: str, keys, sizes=None):
+        self.name = name
+        self.keys = keys
+        self.sizes = sizes
+        self.start_date = DEFAULT_LAST_MODIFIED
+        self.region = "us-east-1"
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getitem__(self, index: int) -> str:
+        return str(self.keys[index])
+
+    def last_modified(self, index: int) -> datetime:
+        """Returns the LastModified date of the object at a given index."""
+
+        return self.start_date
+
+    def object_summary(self, index: int) -> dict:
+        """Builds the ListObjectsV2 entry of the object at a given index."""
+
+        if self.sizes is not None:
+            size = int(self.sizes[index])
+        else:
+            size = 1024 + (index * 2654435761) % MAX_OBJECT_SIZE
+
+        return {
+            "Key": self[index],
+            "LastModified": self.last_modified(index),
+            "ETag": f'"{index:032x}"',
+            "Size": size,
+            "StorageClass": "STANDARD"
+        }
+
+
+class SyntheticBucket(StubBucket):
+    """A bucket whose sorted keys are computed from their index.
+
+    Keys follow the same layout of `cloudgeass.testing.data.partitioned_keys`,
+    e.g. "table/anomesdia=20000101/part-00000.parquet". Consecutive indexes
+    share a date partition until `files_per_partition` files are created, so
+    keys are already sorted and can be searched with `bisect`.
+
+    Args:
+        name (str): The bucket name.
+        n_keys (int): How many objects the bucket holds.
+        table_prefix (str, optional): The table prefix of all keys.
+        files_per_partition (int, optional): Objects in each date partition.
+        start_date (datetime, optional): The date of the first partition.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        n_keys: int,
+        table_prefix: str = "table/",
+        files_per_partition: int = 100,
+        start_date: datetime = DEFAULT_LAST_MODIFIED
+    ):
+        super().__init__(name=name, keys=None)
+        self.n_keys = n_keys
+        self.table_prefix = table_prefix
+        self.files_per_partition = files_per_partition
+        self.start_date = start_date
+
+    def __len__(self) -> int:
+        return self.n_keys
+
+    def __getitem__(self, index: int) -> str:
+        # Makes the bucket a lazy sorted sequence of keys for bisect
+        if not 0 <= index < self.n_keys:
+            raise IndexError(index)
+
+        partition_idx, file_idx = divmod(index, self.files_per_partition)
+        partition_date = self.start_date + timedelta(days=partition_idx)
+        return (f"{self.table_prefix}anomesdia={partition_date:%Y%m%d}/"
+                f"part-{file_idx:05d}.parquet")
+
+    @property
+    def last_partition(self) -> int:
+        """The value of the last date partition of the bucket."""
+
+        return int(f"{self.last_modified(self.n_keys - 1):%Y%m%d}")
+
+    def last_modified(self, index: int) -> datetime:
+        return self.start_date + timedelta(
+            days=index // self.files_per_partition
+        )
+
+
+class _StubBackend():
+    """Base class of backends that answer calls of a single AWS service.
+
+    Subclasses map operation names to handlers in `_handlers()`. Each
+    handler receives the call parameters and returns the parsed response.
+    """
+
+    # The boto3 service name handled by the backend
+    service_name = None
+
+    def __init__(self):
+        self.calls = 0
+
+    def _handlers(self) -> dict:
+        raise NotImplementedError
+
+    def install(self, client) -> None:
+        """Registers the backend handlers on a boto3 client."""
+
+        # Event names use the hyphenized service id (e.g. "secrets-manager")
+        service_id = client.meta.service_model.service_id.hyphenize()
+
+        # before-call only receives the serialized request, so the original
+        # call parameters are kept in the request context beforehand
+        client.meta.events.register(f"before-parameter-build.{service_id}",
+                                    self._keep_params)
+        for operation_name, handler in self._handlers().items():
+            client.meta.events.register(
+                f"before-call.{service_id}.{operation_name}",
+                self._answer_with(handler)
+            )
+
+    def create_client(self):
+        """Creates a standalone botocore client served by the backend.
+
+        A standalone client is used (instead of the cached one of
+        `cloudgeass.aws.factory`) so other clients are never stubbed.
+        """
+
+        client = botocore_session.Session().create_client(
+            self.service_name,
+            region_name="us-east-1",
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing"
+        )
+        self.install(client)
+
+        return client
+
+    @staticmethod
+    def _keep_params(params: dict, context: dict, **kwargs) -> None:
+        context[_PARAMS_KEY] = dict(params)
+
+    def _answer_with(self, handler):
+        def answer(context: dict, **kwargs) -> tuple:
+            self.calls += 1
+            status_code, parsed = handler(context[_PARAMS_KEY])
+            http_response = botocore_awsrequest.AWSResponse(
+                "https://amazonaws.com", status_code, {}, None
+            )
+            parsed["ResponseMetadata"] = {
+                "HTTPStatusCode": status_code,
+                "RetryAttempts": 0
+            }
+            return http_response, parsed
+
+        return answer
+
+    @staticmethod
+    def _error(status_code: int, code: str, message: str) -> tuple:
+        return status_code, {"Error": {"Code": code, "Message": message}}
+
+
+class StubS3Backend(_StubBackend):
+    """Answers S3 listing and reading calls from in-memory buckets.
+
+    Listing calls (ListBuckets and ListObjectsV2) and GetBucketLocation
+    calls are answered from the buckets and GetObject calls from the bodies
+    stored with `put_body()`.
+    SelectObjectContent calls run expressions such as "SELECT s.id FROM
+    S3Object s WHERE s.total > 10 LIMIT 5" (a single comparison with a
+    literal) on stored CSV, JSON lines and Parquet bodies and stream JSON
+    records in events of `SELECT_EVENT_SIZE` bytes.
+
+    Args:
+        buckets (list): StubBucket objects served by the backend.
+
+    Attributes:
+        calls (int): How many calls were answered by the backend.
+    """
+
+    service_name = "s3"
+
+    def __init__(self, buckets: list):
+        super().__init__()
+        self.buckets = {bucket.name: bucket for bucket in buckets}
+        self.bodies = {}
+
+    def add_bucket(self, bucket: StubBucket) -> None:
+        """Adds (or replaces) a bucket served by the backend."""
+
+        self.buckets[bucket.name] = bucket
+
+    def put_body(
+        self,
+        bucket_name: str,
+        key: str,
+        body: bytes,
+        content_encoding: str = None
+    ) -> None:
+        """Stores the content returned by GetObject calls for a key."""
+
+        self.bodies[(bucket_name, key)] = (body, content_encoding)
+
+    def s3_client(self, **s3_client_kwargs) -> S3Client:
+        """Returns a S3Client whose boto3 client is served by the backend."""
+
+        s3 = S3Client(**s3_client_kwargs)
+        s3.client = self.create_client()
+
+        return s3
+
+    def _handlers(self) -> dict:
+        return {
+            "ListBuckets": self._list_buckets,
+            "GetBucketLocation": self._get_bucket_location,
+            "ListObjectsV2": self._list_objects_v2,
+            "GetObject": self._get_object,
+            "SelectObjectContent": self._select_object_content
+        }
+
+    def _list_buckets(self, params: dict) -> tuple:
+        return 200, {
+            "Buckets": [
+                {"Name": bucket.name, "CreationDate": bucket.start_date}
+                for bucket in self.buckets.values()
+            ],
+            "Owner": {"DisplayName": "testing", "ID": "testing"}
+        }
+
+    def _get_bucket_location(self, params: dict) -> tuple:
+        # Buckets of us-east-1 have no location constraint
+        region = self.buckets[params["Bucket"]].region
+        return 200, {
+            "LocationConstraint": None if region == "us-east-1" else region
+        }
+
+    def _list_objects_v2(self, params: dict) -> tuple:
+        bucket = self.buckets[params["Bucket"]]
+        prefix = params.get("Prefix", "")
+        max_keys = min(params.get("MaxKeys", MAX_KEYS_PER_PAGE),
+                       MAX_KEYS_PER_PAGE)
+
+        # Continuation tokens are just the index of the next key
+        if "ContinuationToken" in params:
+            start = int(params["ContinuationToken"])
+        else:
+            start = bisect.bisect_right(bucket, params.get("StartAfter", ""))
+            start = max(start, bisect.bisect_left(bucket, prefix))
+
+        # Keys with the prefix end where the prefix range ends
+        end = bisect.bisect_left(bucket, prefix + "\uffff") if prefix \
+            else len(bucket)
+        stop = min(start + max_keys, end)
+
+        contents = [bucket.object_summary(i) for i in range(start, stop)]
+        parsed = {
+            "Name": bucket.name,
+            "Prefix": prefix,
+            "MaxKeys": max_keys,
+            "KeyCount": len(contents),
+            "IsTruncated": stop < end
+        }
+        if contents:
+            parsed["Contents"] = contents
+        if stop < end:
+            parsed["NextContinuationToken"] = str(stop)
+
+        return 200, parsed
+
+    def _get_object(self, params: dict) -> tuple:
+        stored = self.bodies.get((params["Bucket"], params["Key"]))
+        if stored is None:
+            return self._error(404, "NoSuchKey",
+                               "The specified key does not exist.")
+
+        body, content_encoding = stored
+        parsed = {
+            "Body": botocore_response.StreamingBody(io.BytesIO(body),
+                                                    len(body)),
+            "ContentLength": len(body),
+            "ETag": f'"{len(body):032x}"'
+        }
+        if content_encoding:
+            parsed["ContentEncoding"] = content_encoding
+
+        return 200, parsed
+
+    def _select_object_content(self, params: dict) -> tuple:
+        stored = self.bodies.get((params["Bucket"], params["Key"]))
+        if stored is None:
+            return self._error(404, "NoSuchKey",
+                               "The specified key does not exist.")
+
+        query = _SELECT_PATTERN.match(params["Expression"])
+        if query is None:
+            return self._error(400, "ParseUnsupportedSyntax",
+                               "The stub only runs SELECT ... FROM S3Object "
+                               "[WHERE column op literal] [LIMIT n].")
+
+        records = self._select_input_records(stored[0],
+                                             params["InputSerialization"])
+
+        # Filtering records with the comparison of the WHERE clause
+        if query["column"]:
+            column = query["column"].split(".")[-1]
+            compare = _SELECT_OPERATORS[query["op"]]
+            if query["value"].startswith("'"):
+                value, cast = query["value"][1:-1], str
+            else:
+                value, cast = float(query["value"]), float
+
+            records = [r for r in records if r.get(column) is not None]
+            records = [r for r in records if compare(cast(r[column]), value)]
+
+        if query["limit"]:
+            records = records[:int(query["limit"])]
+
+        if query["columns"].strip() != "*":
+            columns = [c.strip().split(".")[-1]
+                       for c in query["columns"].split(",")]
+            records = [{c: r[c] for c in columns if c in r} for r in records]
+
+        # Streaming JSON records split in small Records events
+        payload = b"".join(json.dumps(r, default=str).encode() + b"\n"
+                           for r in records)
+        events = [
+            {"Records": {"Payload": payload[i:i + SELECT_EVENT_SIZE]}}
+            for i in range(0, len(payload), SELECT_EVENT_SIZE)
+        ]
+        events.append({"Stats": {"Details": {
+            "BytesScanned": len(stored[0]),
+            "BytesProcessed": len(stored[0]),
+            "BytesReturned": len(payload)
+        }}})
+        events.append({"End": {}})
+
+        return 200, {"Payload": iter(events)}
+
+    @staticmethod
+    def _select_input_records(body: bytes, input_serialization: dict) -> list:
+        # Reading stored bodies as S3 Select does with its serialization
+        compression = input_serialization.get("CompressionType", "NONE")
+        if compression == "GZIP":
+            body = gzip.decompress(body)
+        elif compression == "BZIP2":
+            body = bz2.decompress(body)
+
+        if "Parquet" in input_serialization:
+            return pq.read_table(io.BytesIO(body)).to_pylist()
+
+        text = body.decode("utf-8")
+        if "JSON" in input_serialization:
+            return [json.loads(line) for line in text.splitlines()
+                    if line.strip()]
+
+        delimiter = input_serialization["CSV"].get("FieldDelimiter", ",")
+        return list(csv.DictReader(io.StringIO(text), delimiter=delimiter))
+
+
+class StubSecretsManagerBackend(_StubBackend):
+    """Answers Secrets Manager GetSecretValue calls from a dictionary.
+
+    Args:
+        secrets (dict): Secret strings by secret ID.
+
+    Attributes:
+        calls (int): How many calls were answered by the backend.
+    """
+
+    service_name = "secretsmanager"
+
+    def __init__(self, secrets: dict):
+        super().__init__()
+        self.secrets = dict(secrets)
+
+    def secrets_client(self, **client_kwargs) -> SecretsManagerClient:
+        """Returns a SecretsManagerClient served by the backend."""
+
+        sm = SecretsManagerClient(**client_kwargs)
+        sm.client = self.create_client()
+
+        return sm
+
+    def _handlers(self) -> dict:
+        return {"GetSecretValue": self._get_secret_value}
+
+    def _get_secret_value(self, params: dict) -> tuple:
+        secret_id = params["SecretId"]
+        if secret_id not in self.secrets:
+            return self._error(400, "ResourceNotFoundException",
+                               "Secrets Manager can't find the secret.")
+
+        return 200, {
+            "ARN": f"arn:aws:secretsmanager:us-east-1:000000000000:secret:"
+                   f"{secret_id}",
+            "Name": secret_id,
+            "SecretString": self.secrets[secret_id],
+            "VersionId": "testing"
+        }
+
+
+def load_into_moto(
+    bucket_name: str,
+    keys,
+    body: bytes = b"",
+    region_name: str = "us-east-1"
+) -> int:
+    """
+    Bulk loads objects into moto's in-memory S3 backend.
+
+    Objects are written straight into the backend that serves mocked calls,
+    which is a lot faster than calling `put_object()` for each key. It must
+    be called while a moto S3 mock is active and the bucket is created if it
+    doesn't exist yet.
+
+    Examples:
+        ```python
+        # Importing the functions
+        from moto import mock_s3
+        from cloudgeass.testing.backends import load_into_moto
+        from cloudgeass.testing.data import partitioned_keys
+
+        with mock_s3():
+            load_into_moto("my-bucket", partitioned_keys(n_keys=100000))
+        ```
+
+    Args:
+        bucket_name (str): The name of the mocked bucket.
+        keys (list or numpy.ndarray): The object keys.
+        body (bytes, optional): The content of every object.
+        region_name (str, optional): The region of the mocked bucket.
+
+    Returns:
+        int: How many objects were loaded.
+    """
+
+    # moto is an optional dependency only needed by this function
+    from moto.core import DEFAULT_ACCOUNT_ID
+    from moto.s3.models import s3_backends
+
+    backend = s3_backends[DEFAULT_ACCOUNT_ID]["global"]
+    if bucket_name not in backend.buckets:
+        backend.create_bucket(bucket_name, region_name)
+
+    n_objects = 0
+    for key in keys:
+        backend.put_object(bucket_name, str(key), body)
+        n_objects += 1
+
+    return n_objects
@@ -0,0 +1,221 @@
+"""
+Module: cloudgeass.testing.data
+
+The module generates large synthetic datasets for tests and benchmarks. All
+values are built with vectorized NumPy operations (no Python loop per row or
+per key), so payloads with millions of rows and lists with millions of
+partitioned object keys are created in a fraction of a second.
+
+Examples:
+    ```python
+    # Importing the functions
+    from cloudgeass.testing.data import fake_payload, partitioned_keys
+
+    # A 1 million rows CSV file and 5 million keys of a partitioned table
+    csv_body = fake_payload(format="csv", n_rows=1000000)
+    keys = partitioned_keys(n_keys=5000000, table_prefix="sales/")
+    ```
+
+___
+"""
+
+# Importing libraries
+import io
+
+from cloudgeass.utils.lazy import lazy_import
+
+# Heavy dependencies are only imported when a function needs them
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pa_csv = lazy_import("pyarrow.csv")
+pq = lazy_import("pyarrow.parquet")
+
+
+# Formats supported by fake_payload()
+SUPPORTED_PAYLOAD_FORMATS = ("csv", "json", "parquet")
+
+# Characters used to build fake values
+_HEX_DIGITS = b"0123456789abcdef"
+
+
+def random_hex_strings(
+    n_values: int,
+    length: int = 32,
+    seed: int = 42
+):
+    """
+    Generates random hexadecimal strings (like uuid4().hex values).
+
+    Args:
+        n_values (int): How many strings are generated.
+        length (int, optional): The number of characters of each string.
+        seed (int, optional): The seed of the random generator.
+
+    Returns:
+        numpy.ndarray: An array of unicode strings.
+    """
+
+    rng = np.random.default_rng(seed)
+    digits = np.frombuffer(_HEX_DIGITS, dtype="S1")
+
+    # Each row of random digits is viewed as a single fixed size string
+    chars = digits[rng.integers(0, len(_HEX_DIGITS), (n_values, length))]
+    return chars.view(f"S{length}").ravel().astype(str)
+
+
+def fake_dataframe(
+    n_rows: int = 10,
+    columns: list = ["col1", "col2", "col3"],
+    seed: int = 42
+):
+    """
+    Generates a pandas DataFrame with random hexadecimal values.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.testing.data import fake_dataframe
+
+        df = fake_dataframe(n_rows=100000, columns=["id", "name", "email"])
+        ```
+
+    Args:
+        n_rows (int, optional): Number of rows of the DataFrame.
+        columns (list, optional): Column names of the DataFrame.
+        seed (int, optional): The seed of the random generator.
+
+    Returns:
+        pd.DataFrame: A DataFrame with a string column for each name.
+    """
+
+    return pd.DataFrame({
+        column: random_hex_strings(n_rows, seed=seed + i)
+        for i, column in enumerate(columns)
+    })
+
+
+def fake_payload(
+    format: str = "csv",
+    n_rows: int = 10,
+    columns: list = ["col1", "col2", "col3"],
+    seed: int = 42
+) -> bytes:
+    """
+    Generates a fake CSV, JSON or Parquet file content.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.testing.data import fake_payload
+
+        parquet_body = fake_payload(format="parquet", n_rows=1000000)
+        ```
+
+    Args:
+        format (str, optional):
+            The output format ("csv", "json" or "parquet").
+
+        n_rows (int, optional):
+            Number of rows of fake data.
+
+        columns (list, optional):
+            Column names of the fake data.
+
+        seed (int, optional):
+            The seed of the random generator.
+
+    Returns:
+        bytes: The file content.
+
+    Raises:
+        ValueError: If the given format is not supported.
+    """
+
+    format_prep = format.lower().strip().replace(".", "")
+    if format_prep not in SUPPORTED_PAYLOAD_FORMATS:
+        raise ValueError(f"Invalid format {format}. Supported formats are "
+                         f"{SUPPORTED_PAYLOAD_FORMATS}")
+
+    df_fake = fake_dataframe(n_rows=n_rows, columns=columns, seed=seed)
+
+    # JSON records are written by pandas own C serializer
+    if format_prep == "json":
+        return df_fake.to_json(orient="records").encode("utf-8")
+
+    # CSV and Parquet files are written by pyarrow from columnar buffers
+    table = pa.Table.from_pandas(df_fake, preserve_index=False)
+    buffer = io.BytesIO()
+    if format_prep == "csv":
+        pa_csv.write_csv(table, buffer)
+    else:
+        pq.write_table(table, buffer, compression="snappy")
+
+    return buffer.getvalue()
+
+
+def partitioned_keys(
+    n_keys: int,
+    table_prefix: str = "table/",
+    files_per_partition: int = 100,
+    partition_name: str = "anomesdia",
+    start_date: str = "2000-01-01",
+    extension: str = "parquet"
+):
+    """
+    Generates sorted object keys of a table partitioned by date.
+
+    Keys follow the layout used by big data tables stored in S3, e.g.
+    "table/anomesdia=20000101/part-00000.parquet". Each date partition holds
+    `files_per_partition` objects and dates grow one day per partition.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.testing.data import partitioned_keys
+
+        keys = partitioned_keys(n_keys=1000000, table_prefix="sales/")
+        # keys[-1] == "sales/anomesdia=20270518/part-00099.parquet"
+        ```
+
+    Args:
+        n_keys (int):
+            How many keys are generated.
+
+        table_prefix (str, optional):
+            The prefix (table name) of all keys.
+
+        files_per_partition (int, optional):
+            How many objects each date partition holds.
+
+        partition_name (str, optional):
+            The name of the date partition.
+
+        start_date (str, optional):
+            The date of the first partition in the format YYYY-MM-DD.
+
+        extension (str, optional):
+            The file extension of the objects.
+
+    Returns:
+        numpy.ndarray: An array of lexicographically sorted keys.
+    """
+
+    n_partitions = -(-n_keys // files_per_partition)
+
+    # Strings are only built once per partition and once per file name
+    dates = np.datetime64(start_date, "D") + np.arange(n_partitions)
+    date_values = np.char.replace(np.datetime_as_string(dates), "-", "")
+    partition_prefixes = np.char.add(
+        np.char.add(f"{table_prefix}{partition_name}=", date_values),
+        "/part-"
+    )
+    file_names = np.char.add(
+        np.char.zfill(np.arange(files_per_partition).astype(str), 5),
+        f".{extension}"
+    )
+
+    return np.char.add(
+        np.repeat(partition_prefixes, files_per_partition)[:n_keys],
+        np.tile(file_names, n_partitions)[:n_keys]
+    )
@@ -0,0 +1,245 @@
+"""Provides Apache Arrow helpers to keep large reports out of the heap.
+
+`SpillBuffer` accumulates Arrow record batches under a byte budget. Whenever
+the budget is exceeded, pending batches are written to temporary Arrow IPC
+files and released from memory. At the end, all files are memory-mapped and
+returned as a single table, so its pages are served from the OS page cache
+(and can be evicted by it) instead of being held by the Python process.
+
+Examples:
+    ```python
+    # Importing the class
+    from cloudgeass.utils.arrow import SpillBuffer
+
+    buffer = SpillBuffer(schema=schema, max_memory=256 * 1024 ** 2)
+    for batch in batches:
+        buffer.add(batch)
+
+    table = buffer.finish()
+    ```
+
+___
+"""
+
+# Importing libraries
+import os
+import shutil
+import tempfile
+import threading
+
+from cloudgeass.utils.lazy import lazy_import
+
+# Heavy dependencies are only imported when a function needs them
+pa = lazy_import("pyarrow")
+
+
+def read_ipc_file(path: str, memory_map: bool = True):
+    """
+    Reads an Arrow IPC file, memory-mapping it by default.
+
+    Memory-mapped tables don't copy any data: their buffers point straight
+    to the pages of the file, which are shared by every process reading it.
+
+    Args:
+        path (str): The path of the Arrow IPC (Feather v2) file.
+        memory_map (bool, optional): Whether the file is memory-mapped.
+
+    Returns:
+        pyarrow.Table: The table stored in the file.
+    """
+
+    source = pa.memory_map(path, "r") if memory_map else pa.OSFile(path, "rb")
+    with source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def write_ipc_file(table, path: str) -> None:
+    """
+    Writes a table as an uncompressed Arrow IPC (Feather v2) file.
+
+    The file is written next to its final path and then renamed, so readers
+    never see a partially written file. Processes that already memory-mapped
+    a previous version keep reading it until they reload.
+
+    Args:
+        table (pyarrow.Table): The table to be written.
+        path (str): The path of the file.
+    """
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".cloudgeass-", suffix=".arrow",
+                                    dir=directory)
+    try:
+        # Buffers are not compressed so they can be memory-mapped as they are
+        with os.fdopen(fd, "wb") as f:
+            with pa.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+
+        os.replace(tmp_path, path)
+
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class SpillBuffer():
+    """Accumulates Arrow record batches under a memory budget.
+
+    Batches are grouped in partitions (e.g. one per bucket) so the final
+    table keeps the partitions order no matter the order batches arrive.
+    Partitions are closed with `close_partition()` once all their batches
+    were added, so only partitions still being filled keep an open file.
+    The buffer is thread-safe.
+
+    Args:
+        schema (pyarrow.Schema):
+            The schema of all batches.
+
+        max_memory (int):
+            The maximum number of bytes of batches held in memory.
+
+        n_partitions (int, optional):
+            How many partitions the batches are grouped in.
+
+        spill_dir (str, optional):
+            Where temporary files are created. Defaults to the system
+            temporary directory.
+
+    Attributes:
+        spilled_bytes (int):
+            How many bytes of batches were written to disk.
+    """
+
+    def __init__(
+        self,
+        schema,
+        max_memory: int,
+        n_partitions: int = 1,
+        spill_dir: str = None
+    ):
+        self.schema = schema
+        self.max_memory = max_memory
+        self.n_partitions = n_partitions
+        self.spill_dir = spill_dir
+        self.spilled_bytes = 0
+
+        self._pending = [[] for _ in range(n_partitions)]
+        self._pending_bytes = 0
+        self._writers = {}
+        self._spilled = set()
+        self._closed = set()
+        self._tmp_dir = None
+        self._lock = threading.Lock()
+
+    def add(self, batch, partition: int = 0) -> None:
+        """Adds a record batch, spilling pending batches over the budget.
+
+        Args:
+            batch (pyarrow.RecordBatch): The batch to be added.
+            partition (int, optional): The partition of the batch.
+        """
+
+        with self._lock:
+            self._pending[partition].append(batch)
+            self._pending_bytes += batch.nbytes
+            if self._pending_bytes > self.max_memory:
+                self._spill()
+
+    def close_partition(self, partition: int) -> None:
+        """Marks a partition as complete, closing its file.
+
+        Batches already spilled by the partition are followed by its pending
+        ones, so its file is complete once closed.
+
+        Args:
+            partition (int): The partition whose batches were all added.
+        """
+
+        with self._lock:
+            self._closed.add(partition)
+            if partition in self._writers:
+                self._spill_partition(partition)
+
+    def _path(self, partition: int) -> str:
+        return os.path.join(self._tmp_dir, f"partition-{partition:06d}.arrow")
+
+    def _spill_partition(self, partition: int) -> None:
+        batches = self._pending[partition]
+        writer = self._writers.get(partition)
+        if writer is None and batches:
+            if self._tmp_dir is None:
+                self._tmp_dir = tempfile.mkdtemp(prefix="cloudgeass-spill-",
+                                                 dir=self.spill_dir)
+
+            writer = pa.ipc.new_file(self._path(partition), self.schema)
+            self._writers[partition] = writer
+            self._spilled.add(partition)
+
+        for batch in batches:
+            writer.write_batch(batch)
+            self._pending_bytes -= batch.nbytes
+            self.spilled_bytes += batch.nbytes
+        batches.clear()
+
+        # Files of complete partitions are closed to release their handles
+        if writer is not None and partition in self._closed:
+            writer.close()
+            del self._writers[partition]
+
+    def _spill(self) -> None:
+        for partition in range(self.n_partitions):
+            self._spill_partition(partition)
+
+    def finish(self):
+        """Spills all pending batches and returns them as a single table.
+
+        Temporary files are removed right after being memory-mapped (where
+        the OS allows it), so nothing is left on disk once the table is
+        garbage collected.
+
+        Returns:
+            pyarrow.Table: A memory-mapped table with all batches, in the
+            order of their partitions.
+        """
+
+        with self._lock:
+            self._closed.update(range(self.n_partitions))
+            try:
+                self._spill()
+                tables = [read_ipc_file(self._path(partition))
+                          for partition in sorted(self._spilled)]
+
+            finally:
+                # Mapped pages stay valid after the files are unlinked
+                self._release()
+
+        if not tables:
+            return self.schema.empty_table()
+
+        return pa.concat_tables(tables)
+
+    def close(self) -> None:
+        """Closes open files and removes every temporary file.
+
+        It's meant to be called when batches can't be added anymore (e.g.
+        after an error), as `finish()` already cleans everything up.
+        """
+
+        with self._lock:
+            for batches in self._pending:
+                batches.clear()
+            self._pending_bytes = 0
+            self._release()
+
+    def _release(self) -> None:
+        for writer in self._writers.values():
+            try:
+                writer.close()
+            except Exception:
+                pass
+        self._writers.clear()
+
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
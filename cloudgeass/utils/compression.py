@@ -0,0 +1,154 @@
+"""Handles compression and decompression of object payloads.
+
+This module centralizes the codecs that can be used to compress data before
+uploading it to AWS and to decompress it back when reading. Every codec is
+mapped to the value of the HTTP `Content-Encoding` header that identifies it,
+so callers can rely on object metadata to choose the right decoder.
+
+Compressed payloads produced by this module may be built from independent
+chunks: multiple gzip members or multiple zstd frames concatenated together
+are still valid streams and are fully decoded by `decompress_bytes()`.
+
+___
+"""
+
+# Importing libraries
+import gzip
+import io
+
+
+# Content-Encoding values supported by the compression features
+SUPPORTED_CONTENT_ENCODINGS = ("gzip", "zstd")
+
+# Compression levels used when no level is given
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_ZSTD_LEVEL = 3
+
+
+def _prepare_encoding(content_encoding: str) -> str:
+    """Normalizes and validates a Content-Encoding value.
+
+    Args:
+        content_encoding (str): The encoding name given by the user.
+
+    Returns:
+        The normalized encoding name.
+
+    Raises:
+        ValueError: If the encoding isn't supported.
+    """
+
+    encoding_prep = content_encoding.strip().lower()
+    if encoding_prep not in SUPPORTED_CONTENT_ENCODINGS:
+        raise ValueError(f"Invalid content encoding ({content_encoding}). "
+                         "Acceptable values are "
+                         f"{list(SUPPORTED_CONTENT_ENCODINGS)}")
+
+    return encoding_prep
+
+
+def _import_zstandard():
+    """Imports the optional zstandard package.
+
+    Returns:
+        The zstandard module.
+
+    Raises:
+        ImportError: If zstandard isn't installed.
+    """
+
+    try:
+        import zstandard
+    except ImportError as ie:
+        raise ImportError("The 'zstd' content encoding requires the "
+                          "zstandard package. Install it with "
+                          "'pip install zstandard'") from ie
+
+    return zstandard
+
+
+def compress_bytes(
+    data: bytes,
+    content_encoding: str = "gzip",
+    level: int = None
+) -> bytes:
+    """Compresses a bytes payload using the given content encoding.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.utils.compression import compress_bytes
+
+        compressed = compress_bytes(b"col1,col2\\n1,2\\n", "gzip")
+        ```
+
+    Args:
+        data (bytes): The payload to be compressed.
+        content_encoding (str): The codec to use ("gzip" or "zstd").
+        level (int): An optional compression level for the codec (0 is a
+            valid level, e.g. gzip without compression).
+
+    Returns:
+        The compressed payload.
+
+    Raises:
+        ValueError: If the content encoding isn't supported.
+        ImportError: If "zstd" is chosen and zstandard isn't installed.
+    """
+
+    encoding_prep = _prepare_encoding(content_encoding)
+
+    if encoding_prep == "gzip":
+        # mtime=0 keeps the output deterministic for equal inputs (GzipFile
+        # takes it on Python 3.7, unlike gzip.compress())
+        level = DEFAULT_GZIP_LEVEL if level is None else level
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=level,
+                           mtime=0) as f:
+            f.write(data)
+
+        return buffer.getvalue()
+
+    zstandard = _import_zstandard()
+    level = DEFAULT_ZSTD_LEVEL if level is None else level
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def decompress_bytes(data: bytes, content_encoding: str = "gzip") -> bytes:
+    """Decompresses a bytes payload using the given content encoding.
+
+    Payloads made of several concatenated gzip members or zstd frames are
+    decoded as a single stream.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.utils.compression import decompress_bytes
+
+        data = decompress_bytes(compressed, "gzip")
+        ```
+
+    Args:
+        data (bytes): The compressed payload.
+        content_encoding (str): The codec used to compress the payload.
+
+    Returns:
+        The decompressed payload.
+
+    Raises:
+        ValueError: If the content encoding isn't supported.
+        ImportError: If "zstd" is chosen and zstandard isn't installed.
+    """
+
+    encoding_prep = _prepare_encoding(content_encoding)
+
+    if encoding_prep == "gzip":
+        return gzip.decompress(data)
+
+    zstandard = _import_zstandard()
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        io.BytesIO(data),
+        read_across_frames=True
+    )
+    with reader:
+        return reader.read()
@@ -0,0 +1,511 @@
+"""Provides an adaptive, throttle-aware concurrency limiter.
+
+S3 scales its request rate by key prefix. When many requests are sent in
+parallel to the same hot prefix, S3 answers with 503 SlowDown and blind
+retries only make it worse. This module implements an AIMD (additive
+increase, multiplicative decrease) limiter, the same idea used by TCP
+congestion control:
+
+- every successful call under normal latency slowly increases the number of
+  concurrent calls allowed for a key (e.g. a bucket prefix);
+- every throttling response cuts that number by a multiplicative factor;
+- calls whose latency is far above the best latency seen for the key are
+  treated as a congestion signal and shrink the limit gently.
+
+botocore retries throttled requests on its own before raising them, so
+throttled attempts are also fed to the limiter while they are retried (see
+`record_retried_throttle()`), instead of only once botocore gives up.
+
+This way parallel operations stay close to the maximum sustainable
+throughput without manual tuning. Callers that must also stay under a fixed
+number of requests per second can add a `RateLimiter`.
+
+___
+"""
+
+# Importing libraries
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Error codes returned by AWS services when requests are being throttled
+THROTTLING_ERROR_CODES = {
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "503"
+}
+
+# HTTP status codes returned by AWS services for throttled requests
+THROTTLING_STATUS_CODES = {429, 503}
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Checks if an exception is a throttling response from AWS.
+
+    Args:
+        error (Exception): An exception raised by a boto3 call.
+
+    Returns:
+        True if the exception represents a throttling response.
+    """
+
+    return is_throttling_response(getattr(error, "response", None))
+
+
+def is_throttling_response(response: dict) -> bool:
+    """Checks if a parsed AWS response is a throttling response.
+
+    Args:
+        response (dict): A parsed botocore response (or the `response` of a
+            ClientError).
+
+    Returns:
+        True if the response represents a throttling response.
+    """
+
+    if not isinstance(response, dict):
+        return False
+
+    error_code = str(response.get("Error", {}).get("Code", ""))
+    status_code = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+
+    return error_code in THROTTLING_ERROR_CODES or \
+        status_code in THROTTLING_STATUS_CODES
+
+
+def limiter_key(
+    bucket_name: str,
+    key: str = "",
+    prefix_depth: int = 1,
+    is_prefix: bool = False
+) -> str:
+    """Builds the limiter key (bucket and leading prefix) of an S3 object.
+
+    Only the folders of object keys are used, so objects on the root of a
+    bucket share its root limiter key. Prefixes (e.g. of listings) get the
+    limiter key of the objects under them: listing the prefix "table" (or
+    "table/") and reading "table/file.csv" share the same limiter.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.utils.concurrency import limiter_key
+
+        limiter_key("my-bucket", "table/anomesdia=20230101/file.csv")
+        # "my-bucket/table"
+
+        limiter_key("my-bucket", "table", is_prefix=True)
+        # "my-bucket/table"
+        ```
+
+    Args:
+        bucket_name (str): The name of the S3 bucket.
+        key (str): The object key or prefix.
+        prefix_depth (int): How many key levels identify a prefix.
+        is_prefix (bool): Whether `key` is a prefix instead of an object key.
+
+    Returns:
+        A string identifying the bucket prefix that receives the request.
+    """
+
+    levels = key.split("/")
+    if not is_prefix:
+        # The last level of an object key is its name
+        levels = levels[:-1]
+
+    prefix = "/".join(levels[:prefix_depth]).rstrip("/")
+    return f"{bucket_name}/{prefix}"
+
+
+class _ActiveSlot():
+    """Holds a slot taken by a call, while the call is running."""
+
+    def __init__(self, limiter, key: str, started_at: float):
+        self.limiter = limiter
+        self.key = key
+        self.started_at = started_at
+        self.throttles = 0
+
+
+# The slot of the call running on the current thread (or task)
+_ACTIVE_SLOT = contextvars.ContextVar("cloudgeass_limiter_slot",
+                                      default=None)
+
+
+def record_retried_throttle(response: dict) -> None:
+    """Feeds a throttled attempt to the limiter slot of the running call.
+
+    botocore retries throttled requests before raising them. This function
+    is called on each attempt (see `cloudgeass.aws.instrumentation`), so
+    the limits of the key shrink as soon as S3 throttles, instead of only
+    after botocore gave up.
+
+    Args:
+        response (dict): The parsed response of an attempt.
+    """
+
+    active = _ACTIVE_SLOT.get()
+    if active is not None and is_throttling_response(response):
+        active.limiter._record_throttle(active)
+
+
+class _KeyState():
+    """Holds the AIMD state of a single limiter key."""
+
+    def __init__(self, initial_limit: float):
+        self.limit = initial_limit
+        self.in_flight = 0
+        self.min_latency = None
+        self.last_decrease = 0.0
+        self.throttles = 0
+        self.successes = 0
+
+
+class AdaptiveConcurrencyLimiter():
+    """An AIMD concurrency limiter that adapts to throttling and latency.
+
+    Each limiter key (usually a bucket prefix, see `limiter_key()`) has its
+    own limit of concurrent calls. Threads that exceed the limit block until
+    a slot is released. Limits are changed live while calls complete.
+
+    Examples:
+        ```python
+        # Importing the class
+        from cloudgeass.utils.concurrency import AdaptiveConcurrencyLimiter
+
+        limiter = AdaptiveConcurrencyLimiter(max_limit=64)
+
+        # Running a call within the limits of the "my-bucket/table" key
+        response = limiter.run(
+            "my-bucket/table",
+            client.get_object,
+            Bucket="my-bucket",
+            Key="table/file.csv"
+        )
+        ```
+
+    Args:
+        max_limit (int, optional):
+            The maximum number of concurrent calls for a key.
+
+        min_limit (int, optional):
+            The minimum number of concurrent calls for a key.
+
+        initial_limit (int, optional):
+            The starting limit for new keys. Defaults to half of max_limit.
+
+        increase_step (float, optional):
+            How much the limit grows after a full window of successful calls.
+
+        decrease_factor (float, optional):
+            The multiplicative factor applied to the limit on throttling.
+
+        latency_tolerance (float, optional):
+            Calls slower than `latency_tolerance` times the best latency
+            seen for the key are treated as a congestion signal.
+
+        latency_floor (float, optional):
+            Calls faster than this number of seconds are never treated as
+            congested, avoiding noise from very fast calls.
+
+        max_attempts (int, optional):
+            How many times `run()` tries a throttled call before giving up.
+
+        backoff_base (float, optional):
+            Base delay in seconds of the jittered exponential backoff used
+            by `run()` between throttled attempts.
+    """
+
+    def __init__(
+        self,
+        max_limit: int = 10,
+        min_limit: int = 1,
+        initial_limit: int = None,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 4.0,
+        latency_floor: float = 0.05,
+        max_attempts: int = 8,
+        backoff_base: float = 0.05
+    ):
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.initial_limit = initial_limit or max(min_limit, max_limit // 2)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.latency_floor = latency_floor
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+
+        self._states = {}
+        self._condition = threading.Condition()
+
+    def _state(self, key: str) -> _KeyState:
+        state = self._states.get(key)
+        if state is None:
+            state = _KeyState(float(self.initial_limit))
+            self._states[key] = state
+
+        return state
+
+    def limit(self, key: str) -> int:
+        """Returns the current number of concurrent calls allowed for a key."""
+
+        with self._condition:
+            return int(self._state(key).limit)
+
+    def stats(self) -> dict:
+        """Returns the limit, in-flight calls and counters of every key."""
+
+        with self._condition:
+            return {
+                key: {
+                    "limit": int(state.limit),
+                    "in_flight": state.in_flight,
+                    "throttles": state.throttles,
+                    "successes": state.successes
+                }
+                for key, state in self._states.items()
+            }
+
+    def acquire(self, key: str) -> float:
+        """Blocks until a slot is available for the key and takes it.
+
+        Args:
+            key (str): The limiter key.
+
+        Returns:
+            The monotonic time when the slot was acquired.
+        """
+
+        with self._condition:
+            state = self._state(key)
+            while state.in_flight >= int(state.limit):
+                self._condition.wait()
+            state.in_flight += 1
+
+        return time.monotonic()
+
+    def release(
+        self,
+        key: str,
+        started_at: float,
+        throttled: bool = False
+    ) -> None:
+        """Releases a slot and updates the key limit with the call outcome.
+
+        Args:
+            key (str): The limiter key.
+            started_at (float): The value returned by `acquire()`.
+            throttled (bool): Whether the call was throttled.
+        """
+
+        now = time.monotonic()
+        latency = now - started_at
+
+        with self._condition:
+            state = self._state(key)
+            state.in_flight -= 1
+
+            if throttled:
+                self._on_throttle(state, started_at, now)
+
+            else:
+                state.successes += 1
+                if state.min_latency is None or latency < state.min_latency:
+                    state.min_latency = latency
+
+                congested = latency > max(
+                    self.latency_floor,
+                    state.min_latency * self.latency_tolerance
+                )
+                if congested and started_at >= state.last_decrease:
+                    state.limit = max(self.min_limit, state.limit - 1)
+                    state.last_decrease = now
+                elif not congested:
+                    # Additive increase: about increase_step per full window
+                    state.limit = min(
+                        self.max_limit,
+                        state.limit + self.increase_step / state.limit
+                    )
+
+            self._condition.notify_all()
+
+    def _on_throttle(
+        self,
+        state: _KeyState,
+        started_at: float,
+        now: float
+    ) -> None:
+        state.throttles += 1
+
+        # Calls started before the last decrease belong to the same
+        # congestion window and must not shrink the limit again
+        if started_at >= state.last_decrease:
+            state.limit = max(self.min_limit,
+                              state.limit * self.decrease_factor)
+            state.last_decrease = now
+
+    def _record_throttle(self, active: _ActiveSlot) -> None:
+        # Throttled attempts still being retried keep their slot
+        with self._condition:
+            self._on_throttle(self._state(active.key), active.started_at,
+                              time.monotonic())
+            active.throttles += 1
+
+    def _free(self, key: str) -> None:
+        with self._condition:
+            self._state(key).in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, key: str):
+        """Context manager that holds a slot for the key while it's open.
+
+        Throttling exceptions raised inside the block shrink the key limit
+        and are re-raised. Throttled attempts retried by botocore within
+        the block are recorded as they happen (see
+        `record_retried_throttle()`).
+
+        Args:
+            key (str): The limiter key.
+
+        Yields:
+            The slot, whose `throttles` attribute counts the throttled
+            attempts recorded while it was held.
+        """
+
+        active = _ActiveSlot(self, key, self.acquire(key))
+        token = _ACTIVE_SLOT.set(active)
+        try:
+            yield active
+
+        except Exception as e:
+            throttled = is_throttling_error(e)
+
+            # The last attempt was already recorded by botocore events
+            if throttled and active.throttles:
+                self._free(key)
+            else:
+                self.release(key, active.started_at, throttled=throttled)
+            raise e
+
+        else:
+            self.release(key, active.started_at)
+
+        finally:
+            _ACTIVE_SLOT.reset(token)
+
+    def run(self, key: str, func, *args, **kwargs):
+        """Runs a callable within the key limits, retrying throttled calls.
+
+        Args:
+            key (str): The limiter key.
+            func (Callable): The callable to run (e.g. a boto3 client method).
+            *args: Positional arguments for the callable.
+            **kwargs: Keyword arguments for the callable.
+
+        Returns:
+            The value returned by the callable.
+
+        Raises:
+            Exception: The callable exception if it isn't a throttling error
+                or if all attempts were throttled.
+
+        Note:
+            Throttled attempts already retried by botocore count toward
+            `max_attempts`, so retries of both layers don't multiply.
+        """
+
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                with self.slot(key) as active:
+                    return func(*args, **kwargs)
+
+            except Exception as e:
+                attempts += max(0, active.throttles - 1)
+                if not is_throttling_error(e) or \
+                        attempts >= self.max_attempts:
+                    raise e
+
+            # Full jitter exponential backoff before the next attempt
+            time.sleep(random.uniform(0, self.backoff_base * 2 ** attempts))
+
+
+class RateLimiter():
+    """A token bucket limiter that caps the rate of calls.
+
+    Adaptive limits react to throttling, but some callers must also stay
+    under a fixed budget of requests per second (e.g. to leave capacity of
+    a shared bucket to other workloads). Each call to `acquire()` takes a
+    token, blocking until one is available. Tokens are reserved in the
+    order threads arrive, so waiting threads are served fairly.
+
+    Examples:
+        ```python
+        # Importing the class
+        from cloudgeass.utils.concurrency import RateLimiter
+
+        # Making at most 100 calls per second from any number of threads
+        rate_limiter = RateLimiter(rate=100)
+
+        rate_limiter.acquire()
+        response = client.head_object(Bucket="my-bucket", Key="file.csv")
+        ```
+
+    Args:
+        rate (float):
+            The maximum number of calls per second.
+
+        burst (int, optional):
+            How many calls can be made at once after an idle period.
+
+    Raises:
+        ValueError: If the rate isn't positive.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError(f"The rate must be positive, got {rate}")
+
+        self.rate = rate
+        self.burst = max(1, burst)
+
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Blocks until a token is available and takes it.
+
+        Returns:
+            float: How many seconds the caller waited.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            refilled = (now - self._updated_at) * self.rate
+            self._tokens = min(self.burst, self._tokens + refilled)
+            self._updated_at = now
+
+            # Tokens are reserved ahead, so the bucket may go below zero
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+
+        if wait:
+            time.sleep(wait)
+
+        return wait
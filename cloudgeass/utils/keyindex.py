@@ -0,0 +1,367 @@
+"""Provides a compact index of S3 keys for fast existence checks.
+
+Checking whether a key exists costs a `HeadObject` round trip, so checking
+thousands of keys is slow even when done in parallel. A single listing pass,
+though, returns every key under a prefix in sorted order. This module keeps
+those keys in a `KeyIndex`, which answers membership queries locally with:
+
+- A Bloom filter, which rejects most missing keys with a few bit lookups.
+- A sorted array of front-coded keys, which confirms the remaining ones.
+  Keys are grouped in blocks whose first key is kept whole and whose other
+  keys only keep what differs from the previous one. Keys of a lake share
+  long prefixes, so blocks take a fraction of the size of the keys.
+
+Indexes are saved on a single binary file to be reused by later runs.
+
+Examples:
+    ```python
+    # Importing the class
+    from cloudgeass.utils.keyindex import KeyIndex
+
+    index = KeyIndex.from_keys(["csv/a.csv", "csv/b.csv"], prefix="csv/")
+    "csv/a.csv" in index  # True
+    "csv/c.csv" in index  # False
+
+    index.save("/tmp/csv.keyindex")
+    KeyIndex.load("/tmp/csv.keyindex")
+    ```
+
+___
+"""
+
+# Importing libraries
+import bisect
+import hashlib
+import json
+import math
+import os
+import struct
+import tempfile
+
+
+# Keys on each front-coded block
+DEFAULT_BLOCK_SIZE = 32
+
+# Expected fraction of missing keys passing the Bloom filter
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+# First bytes of saved indexes, followed by the length of their header
+KEY_INDEX_MAGIC = b"CGKEYIDX1"
+
+
+def _encode_varint(value: int) -> bytes:
+    # Unsigned integers on 7 bits per byte, least significant first
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append(value & 0x7F | 0x80)
+        value >>= 7
+    encoded.append(value)
+
+    return bytes(encoded)
+
+
+def _decode_varint(data, pos: int) -> tuple:
+    value, shift = 0, 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _shared_length(previous: bytes, current: bytes) -> int:
+    # Length of the common prefix of two keys
+    size = min(len(previous), len(current))
+    for i in range(size):
+        if previous[i] != current[i]:
+            return i
+
+    return size
+
+
+class KeyIndex():
+    """A Bloom filter and a sorted array of front-coded keys.
+
+    Indexes are built with `from_keys()` or read with `load()`. Keys are
+    compared by their UTF-8 bytes, which is the order of S3 listings.
+
+    Args:
+        data (bytes):
+            The front-coded keys.
+
+        block_offsets (list):
+            The position of each block on `data`.
+
+        bloom (bytearray):
+            The bits of the Bloom filter.
+
+        n_hashes (int):
+            How many bits of the Bloom filter are set by each key.
+
+        n_keys (int):
+            How many keys are indexed.
+
+        block_size (int, optional):
+            How many keys are on each block.
+
+        bucket_name (str, optional):
+            The bucket whose keys are indexed.
+
+        prefix (str, optional):
+            The prefix all indexed keys were listed with. Keys without it
+            are unknown to the index.
+
+    Attributes:
+        n_bits (int):
+            The size of the Bloom filter in bits.
+    """
+
+    def __init__(
+        self,
+        data: bytes,
+        block_offsets: list,
+        bloom: bytearray,
+        n_hashes: int,
+        n_keys: int,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        bucket_name: str = None,
+        prefix: str = ""
+    ):
+        self.data = data
+        self.block_offsets = list(block_offsets)
+        self.bloom = bloom
+        self.n_hashes = n_hashes
+        self.n_keys = n_keys
+        self.block_size = block_size
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.n_bits = len(bloom) * 8
+
+        # First keys of blocks are searched to find the block of a key
+        self._heads = [self._head(offset) for offset in self.block_offsets]
+
+    @classmethod
+    def from_keys(
+        cls,
+        keys,
+        bucket_name: str = None,
+        prefix: str = "",
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+        block_size: int = DEFAULT_BLOCK_SIZE
+    ):
+        """Builds an index from keys in ascending order.
+
+        Keys are consumed once, so they can be streamed from a listing.
+
+        Args:
+            keys (Iterable[str]): Unique keys sorted in ascending order.
+            bucket_name (str, optional): The bucket of the keys.
+            prefix (str, optional): The prefix the keys were listed with.
+            false_positive_rate (float, optional): The expected fraction of
+                missing keys passing the Bloom filter.
+            block_size (int, optional): How many keys are on each block.
+
+        Returns:
+            KeyIndex: An index of the keys.
+
+        Raises:
+            ValueError: If keys aren't unique and sorted or if the false
+                positive rate isn't between 0 and 1.
+        """
+
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("The false positive rate must be between 0 and "
+                             f"1, got {false_positive_rate}")
+
+        # Front coding keys while they are streamed
+        data = bytearray()
+        block_offsets = []
+        previous = None
+        n_keys = 0
+        for key in keys:
+            encoded = key.encode("utf-8")
+            if previous is not None and encoded <= previous:
+                raise ValueError("Keys must be unique and sorted in ascending "
+                                 f"order, got {key!r} after "
+                                 f"{previous.decode('utf-8')!r}")
+
+            if n_keys % block_size == 0:
+                block_offsets.append(len(data))
+                shared = 0
+            else:
+                shared = _shared_length(previous, encoded)
+
+            data += _encode_varint(shared)
+            data += _encode_varint(len(encoded) - shared)
+            data += encoded[shared:]
+            previous = encoded
+            n_keys += 1
+
+        # The Bloom filter is sized once the number of keys is known
+        bits_per_key = -math.log(false_positive_rate) / math.log(2) ** 2
+        n_bits = max(8, math.ceil(max(n_keys, 1) * bits_per_key))
+        n_bits = (n_bits + 7) // 8 * 8
+        n_hashes = max(1, round(n_bits / max(n_keys, 1) * math.log(2)))
+
+        index = cls(bytes(data), block_offsets, bytearray(n_bits // 8),
+                    n_hashes, n_keys, block_size, bucket_name, prefix)
+        for encoded in index._iter_encoded():
+            for position in index._positions(encoded):
+                index.bloom[position >> 3] |= 1 << (position & 7)
+
+        return index
+
+    def __len__(self) -> int:
+        return self.n_keys
+
+    def __iter__(self):
+        for encoded in self._iter_encoded():
+            yield encoded.decode("utf-8")
+
+    def __contains__(self, key: str) -> bool:
+        encoded = key.encode("utf-8")
+        if not self._might_contain(encoded):
+            return False
+
+        # Keys are searched on the only block that may hold them
+        block = bisect.bisect_right(self._heads, encoded) - 1
+        if block < 0:
+            return False
+
+        for indexed in self._iter_block(block):
+            if indexed >= encoded:
+                return indexed == encoded
+
+        return False
+
+    def covers(self, bucket_name: str, key: str) -> bool:
+        """Tells whether a key was listed to build the index.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            key (str): The object key.
+
+        Returns:
+            bool: True if the index answers for the key.
+        """
+
+        return bucket_name == self.bucket_name and key.startswith(self.prefix)
+
+    def might_contain(self, key: str) -> bool:
+        """Checks a key on the Bloom filter only.
+
+        Args:
+            key (str): The object key.
+
+        Returns:
+            bool: False if the key is surely not indexed.
+        """
+
+        return self._might_contain(key.encode("utf-8"))
+
+    def save(self, path: str) -> None:
+        """Saves the index on a binary file.
+
+        The file is written next to its final path and then renamed, so
+        readers never see a partially written file.
+
+        Args:
+            path (str): The path of the file.
+        """
+
+        header = json.dumps({
+            "bucket_name": self.bucket_name,
+            "prefix": self.prefix,
+            "n_keys": self.n_keys,
+            "n_hashes": self.n_hashes,
+            "block_size": self.block_size,
+            "n_blocks": len(self.block_offsets),
+            "bloom_size": len(self.bloom),
+            "data_size": len(self.data)
+        }).encode("utf-8")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".cloudgeass-",
+                                        suffix=".keyindex", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(KEY_INDEX_MAGIC)
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                f.write(struct.pack(f"<{len(self.block_offsets)}Q",
+                                    *self.block_offsets))
+                f.write(self.bloom)
+                f.write(self.data)
+
+            os.replace(tmp_path, path)
+
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str):
+        """Reads an index saved with `save()`.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            KeyIndex: The saved index.
+
+        Raises:
+            ValueError: If the file isn't a saved index.
+        """
+
+        with open(path, "rb") as f:
+            if f.read(len(KEY_INDEX_MAGIC)) != KEY_INDEX_MAGIC:
+                raise ValueError(f"{path} is not a saved key index")
+
+            header_size, = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_size))
+            n_blocks = header["n_blocks"]
+            block_offsets = struct.unpack(f"<{n_blocks}Q",
+                                          f.read(8 * n_blocks))
+            bloom = bytearray(f.read(header["bloom_size"]))
+            data = f.read(header["data_size"])
+
+        return cls(data, block_offsets, bloom, header["n_hashes"],
+                   header["n_keys"], header["block_size"],
+                   header["bucket_name"], header["prefix"])
+
+    def _positions(self, encoded: bytes):
+        # Double hashing derives every position from two 64 bits hashes
+        digest = hashlib.blake2b(encoded, digest_size=16).digest()
+        first, second = struct.unpack("<QQ", digest)
+        return ((first + i * second) % self.n_bits
+                for i in range(self.n_hashes))
+
+    def _might_contain(self, encoded: bytes) -> bool:
+        return all(self.bloom[position >> 3] & 1 << (position & 7)
+                   for position in self._positions(encoded))
+
+    def _head(self, offset: int) -> bytes:
+        # First keys of blocks share nothing with previous keys
+        _, pos = _decode_varint(self.data, offset)
+        length, pos = _decode_varint(self.data, pos)
+        return self.data[pos:pos + length]
+
+    def _iter_block(self, block: int):
+        pos = self.block_offsets[block]
+        end = self.block_offsets[block + 1] \
+            if block + 1 < len(self.block_offsets) else len(self.data)
+
+        previous = b""
+        while pos < end:
+            shared, pos = _decode_varint(self.data, pos)
+            length, pos = _decode_varint(self.data, pos)
+            previous = previous[:shared] + self.data[pos:pos + length]
+            pos += length
+            yield previous
+
+    def _iter_encoded(self):
+        for block in range(len(self.block_offsets)):
+            yield from self._iter_block(block)
@@ -0,0 +1,84 @@
+"""Provides helpers to split the keyspace of S3 buckets.
+
+S3 lists keys in the lexicographic order of their UTF-8 bytes, which is the
+same order of Python strings. Any string can be used as a `StartAfter`
+listing parameter, so a bucket can be split in key ranges that are listed
+independently (by threads, processes or even hosts) as long as range
+boundaries are known. This module computes strings between keys to split
+the keyspace without knowing every key in advance.
+
+Examples:
+    ```python
+    # Importing the functions
+    from cloudgeass.utils.keyspace import branch_midpoint, key_ranges
+
+    boundary = branch_midpoint("table/a", "table/c", level=6)  # "table/b"
+    key_ranges([boundary])  # [(None, "table/b"), ("table/b", None)]
+    ```
+
+___
+"""
+
+
+def branch_midpoint(low: str, high: str, level: int) -> str:
+    """
+    Returns the branch halfway between two keys on a given character.
+
+    Both keys must share their first `level` characters. The result shares
+    them too and is followed by the character halfway between the ones of
+    both keys on position `level`, so it splits the sibling branches of a
+    trie of keys in two halves.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.utils.keyspace import branch_midpoint
+
+        branch_midpoint("sales/2000", "sales/2027", level=8)  # "sales/201"
+        ```
+
+    Args:
+        low (str): The lower key.
+        high (str): The higher key.
+        level (int): The position of the first different character.
+
+    Returns:
+        str: A string between both keys, or None if their characters on
+        position `level` are adjacent.
+    """
+
+    if level >= min(len(low), len(high)):
+        return None
+
+    low_char, high_char = ord(low[level]), ord(high[level])
+    if high_char - low_char < 2:
+        return None
+
+    return low[:level] + chr((low_char + high_char) // 2)
+
+
+def key_ranges(boundaries: list) -> list:
+    """
+    Splits the keyspace in ranges delimited by sorted boundaries.
+
+    Each range is a `(start_after, end_key)` tuple holding keys greater than
+    `start_after` and lower than or equal to `end_key`. The first range has
+    no `start_after` and the last one has no `end_key`, so ranges together
+    cover every key.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.utils.keyspace import key_ranges
+
+        key_ranges(["b", "d"])  # [(None, "b"), ("b", "d"), ("d", None)]
+        ```
+
+    Args:
+        boundaries (list): Sorted range boundaries.
+
+    Returns:
+        list: `len(boundaries) + 1` ranges.
+    """
+
+    return list(zip([None] + list(boundaries), list(boundaries) + [None]))
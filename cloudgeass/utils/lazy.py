@@ -0,0 +1,72 @@
+"""Defers the import of heavy dependencies until they are actually used.
+
+Libraries like pandas, boto3 and requests take hundreds of milliseconds to be
+imported, which dominates the cold start of short-lived processes such as
+AWS Lambda functions. This module provides a module proxy that only imports
+the real module when one of its attributes is accessed for the first time.
+
+___
+"""
+
+# Importing libraries
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """A module proxy that imports the real module on first attribute access.
+
+    Examples:
+        ```python
+        # Importing the class
+        from cloudgeass.utils.lazy import LazyModule
+
+        # pandas is only imported when pd.DataFrame is accessed
+        pd = LazyModule("pandas")
+        df = pd.DataFrame()
+        ```
+
+    Args:
+        module_name (str): The full name of the module to be imported.
+    """
+
+    def __init__(self, module_name: str):
+        super().__init__(module_name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        """Imports the real module (only once) and returns it."""
+
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> list:
+        return dir(self._load())
+
+
+def lazy_import(module_name: str) -> LazyModule:
+    """Returns a proxy that imports the given module on first use.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.utils.lazy import lazy_import
+
+        requests = lazy_import("requests")
+        ```
+
+    Args:
+        module_name (str): The full name of the module to be imported.
+
+    Returns:
+        A LazyModule proxy for the given module.
+    """
+
+    return LazyModule(module_name)
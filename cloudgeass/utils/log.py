@@ -51,9 +51,11 @@ def log_config(
     formatter = logging.Formatter(log_format,
                                   datefmt=logger_date_format)
 
-    # Setting up the stream handler
-    stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+    # Setting up the stream handler only once for each logger name, so
+    # creating many objects doesn't duplicate log messages
+    if not logger.handlers:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        logger.addHandler(stream_handler)
 
     return logger
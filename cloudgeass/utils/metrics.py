@@ -0,0 +1,241 @@
+"""Provides an in-process metrics registry with a Prometheus text exporter.
+
+The registry keeps counters and latency histograms identified by a metric
+name and a set of labels (e.g. the AWS service and operation). It's used by
+`cloudgeass.aws.instrumentation` to record what happens inside every boto3
+call made by cloudgeass, but it can also be used on its own.
+
+Examples:
+    ```python
+    # Importing the registry
+    from cloudgeass.utils.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    registry.inc("jobs_total", {"status": "ok"})
+    registry.observe("job_duration_seconds", {"job": "report"}, 0.42)
+
+    print(registry.to_prometheus())
+    ```
+
+___
+"""
+
+# Importing libraries
+import bisect
+import threading
+
+
+# Default histogram buckets (in seconds) for AWS call latencies
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+class Histogram():
+    """A cumulative histogram with fixed bucket bounds.
+
+    Args:
+        buckets (tuple, optional): Sorted upper bounds of the buckets.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Records a value in the histogram."""
+
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile as the upper bound of the bucket holding it.
+
+        Args:
+            q (float): The quantile between 0 and 1 (e.g. 0.99).
+
+        Returns:
+            The estimated quantile or None if the histogram is empty.
+        """
+
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return bound
+
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        """Returns the histogram state as a dictionary."""
+
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            buckets[bound] = cumulative
+        buckets[float("inf")] = self.count
+
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": buckets,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99)
+        }
+
+
+def _labels_key(labels: dict) -> tuple:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"') \
+        .replace("\n", "\\n")
+
+
+def _format_labels(labels_key: tuple, extra: dict = None) -> str:
+    items = list(labels_key) + list((extra or {}).items())
+    if not items:
+        return ""
+
+    formatted = ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in items)
+    return "{" + formatted + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry():
+    """A thread-safe registry of labeled counters and histograms.
+
+    Args:
+        latency_buckets (tuple, optional): Bucket bounds for new histograms.
+    """
+
+    def __init__(self, latency_buckets: tuple = DEFAULT_LATENCY_BUCKETS):
+        self.latency_buckets = latency_buckets
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, labels: dict = None, value: float = 1) -> None:
+        """Increments a labeled counter.
+
+        Args:
+            name (str): The metric name.
+            labels (dict, optional): The metric labels.
+            value (float, optional): How much to add to the counter.
+        """
+
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: dict = None, value: float = 0.0):
+        """Records a value in a labeled histogram.
+
+        Args:
+            name (str): The metric name.
+            labels (dict, optional): The metric labels.
+            value (float): The observed value (e.g. a latency in seconds).
+        """
+
+        key = (name, _labels_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(self.latency_buckets)
+                self._histograms[key] = histogram
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        """Removes all recorded metrics."""
+
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        """Returns a point-in-time copy of all metrics.
+
+        Returns:
+            A dictionary with "counters" and "histograms" keys. Each one maps
+            a metric name to a list of {"labels": ..., ...} entries.
+        """
+
+        snapshot = {"counters": {}, "histograms": {}}
+        with self._lock:
+            for (name, labels_key), value in sorted(self._counters.items()):
+                snapshot["counters"].setdefault(name, []).append(
+                    {"labels": dict(labels_key), "value": value}
+                )
+
+            for (name, labels_key), histogram in sorted(
+                self._histograms.items(), key=lambda item: item[0]
+            ):
+                entry = {"labels": dict(labels_key)}
+                entry.update(histogram.snapshot())
+                snapshot["histograms"].setdefault(name, []).append(entry)
+
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """Exports all metrics in the Prometheus text exposition format.
+
+        Returns:
+            A string that can be served on a /metrics endpoint.
+        """
+
+        lines = []
+        with self._lock:
+            counter_names = sorted({name for name, _ in self._counters})
+            for name in counter_names:
+                lines.append(f"# TYPE {name} counter")
+                for (metric, labels_key), value in sorted(
+                    self._counters.items()
+                ):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels_key)} "
+                                     f"{_format_value(value)}")
+
+            histogram_names = sorted({name for name, _ in self._histograms})
+            for name in histogram_names:
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels_key), histogram in sorted(
+                    self._histograms.items(), key=lambda item: item[0]
+                ):
+                    if metric != name:
+                        continue
+
+                    cumulative = 0
+                    bounds = histogram.buckets + (float("inf"),)
+                    for bound, bucket_count in zip(bounds, histogram.counts):
+                        cumulative += bucket_count
+                        labels = _format_labels(
+                            labels_key, {"le": _format_value(bound)}
+                        )
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+
+                    labels = _format_labels(labels_key)
+                    lines.append(f"{name}_sum{labels} "
+                                 f"{_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{labels} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+# A process-wide registry used by default
+REGISTRY = MetricsRegistry()
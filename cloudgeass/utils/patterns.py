@@ -0,0 +1,194 @@
+"""Provides helpers to filter S3 keys with glob and regex patterns.
+
+S3 only filters listings by key prefix, so any other filter is applied on
+the keys of each listing page. Patterns, though, usually start with a
+literal part (e.g. "sales/anomesdia=2023*.parquet" starts with
+"sales/anomesdia=2023") shared by every key they match. This module derives
+that literal prefix, so it's pushed down to the `Prefix` of listing calls
+and keys that can't match are never listed.
+
+Patterns are either glob strings, matched against whole keys with the rules
+of `fnmatch` (so "*" also matches "/"), or compiled regular expressions,
+searched in keys with `re.Pattern.search()`. Only regular expressions
+anchored at the start of keys (with "^" or "\\A") have a literal prefix.
+
+Examples:
+    ```python
+    # Importing the functions
+    import re
+    from cloudgeass.utils.patterns import compile_key_pattern, literal_prefix
+
+    literal_prefix("sales/anomesdia=2023*.parquet")  # "sales/anomesdia=2023"
+    literal_prefix(re.compile(r"^sales/anomesdia=2023\\d{4}/"))  # Same
+
+    key_pattern = compile_key_pattern("*.parquet")
+    bool(key_pattern.search("sales/part-00000.parquet"))  # True
+    ```
+
+___
+"""
+
+# Importing libraries
+import fnmatch
+import re
+
+# The regex parser is private to the re module (sre_parse before Python
+# 3.11), so literal prefixes are only an optimization: without a parser (or
+# with a parser whose output isn't understood), keys are fully listed
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    try:
+        import sre_parse
+    except ImportError:
+        sre_parse = None
+
+
+def compile_key_pattern(pattern) -> re.Pattern:
+    """
+    Compiles a glob or regex pattern to be searched in keys.
+
+    Globs are translated to regular expressions anchored at both ends, so
+    searching them matches whole keys. Compiled regular expressions are
+    returned as they are.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.utils.patterns import compile_key_pattern
+
+        key_pattern = compile_key_pattern("csv/*/file.csv")
+        bool(key_pattern.search("csv/anomesdia=20230117/file.csv"))  # True
+        ```
+
+    Args:
+        pattern (str or re.Pattern): A glob or a compiled regex.
+
+    Returns:
+        re.Pattern: A regular expression to be searched in keys.
+
+    Raises:
+        TypeError: If the pattern is neither a string nor a compiled regex.
+    """
+
+    if isinstance(pattern, re.Pattern):
+        return pattern
+
+    if not isinstance(pattern, str):
+        raise TypeError("Key patterns must be glob strings or compiled "
+                        f"regular expressions, got {type(pattern).__name__}")
+
+    return re.compile(r"\A" + fnmatch.translate(pattern))
+
+
+def literal_prefix(pattern) -> str:
+    """
+    Returns the literal prefix shared by every key matched by a pattern.
+
+    Examples:
+        ```python
+        # Importing the function
+        import re
+        from cloudgeass.utils.patterns import literal_prefix
+
+        literal_prefix("csv/anomesdia=2023*")  # "csv/anomesdia=2023"
+        literal_prefix(re.compile(r"^csv/(json|csv)"))  # "csv/"
+        literal_prefix(re.compile(r"csv/"))  # "" (not anchored)
+        ```
+
+    Args:
+        pattern (str or re.Pattern): A glob or a compiled regex.
+
+    Returns:
+        str: The prefix of every matching key (empty if there's none).
+    """
+
+    key_pattern = compile_key_pattern(pattern)
+
+    # Literals may match other cases and "^" may match after line breaks
+    if key_pattern.flags & (re.IGNORECASE | re.MULTILINE):
+        return ""
+
+    if sre_parse is None:
+        return ""
+
+    try:
+        items = list(sre_parse.parse(key_pattern.pattern, key_pattern.flags))
+        anchors = ((sre_parse.AT, sre_parse.AT_BEGINNING),
+                   (sre_parse.AT, sre_parse.AT_BEGINNING_STRING))
+        if not items or items[0] not in anchors:
+            return ""
+
+        return _leading_literals(items[1:])[0]
+
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return ""
+
+
+def _leading_literals(items: list) -> tuple:
+    """
+    Collects the literal characters at the start of a parsed regex.
+
+    Groups are followed as long as they only hold literals (e.g. the group
+    of a translated glob), so literals after them are collected too.
+
+    Args:
+        items (list): The items of a parsed regex.
+
+    Returns:
+        tuple: The literal characters and whether every item was a literal.
+    """
+
+    chars = []
+    for op, value in items:
+        if op is sre_parse.LITERAL:
+            chars.append(chr(value))
+            continue
+
+        # Groups hold their flags and items on their last two positions
+        if op is sre_parse.SUBPATTERN:
+            add_flags, subpattern = value[1], value[-1]
+            if not add_flags & re.IGNORECASE:
+                group_chars, complete = _leading_literals(list(subpattern))
+                chars.append(group_chars)
+                if complete:
+                    continue
+
+        return "".join(chars), False
+
+    return "".join(chars), True
+
+
+def pushdown_prefix(prefix: str, pattern) -> str:
+    """
+    Combines a listing prefix with the literal prefix of a pattern.
+
+    Keys must start with both prefixes, so the longest one is listed when
+    one of them starts with the other. Otherwise, no key can match.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.utils.patterns import pushdown_prefix
+
+        pushdown_prefix("csv/", "csv/anomesdia=2023*")  # "csv/anomesdia=2023"
+        pushdown_prefix("csv/anomesdia=", "csv/*")  # "csv/anomesdia="
+        pushdown_prefix("json/", "csv/*")  # None
+        ```
+
+    Args:
+        prefix (str): A prefix to filter objects.
+        pattern (str or re.Pattern): A glob or a compiled regex.
+
+    Returns:
+        str: The prefix to be listed, or None if no key can match both.
+    """
+
+    pattern_prefix = literal_prefix(pattern)
+    if pattern_prefix.startswith(prefix):
+        return pattern_prefix
+
+    if prefix.startswith(pattern_prefix):
+        return prefix
+
+    return None
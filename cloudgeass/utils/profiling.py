@@ -0,0 +1,280 @@
+"""Provides opt-in profiling of cloudgeass methods.
+
+When profiling is on, each call of a public cloudgeass method (the ones
+wrapped by `cloudgeass.utils.tracing.traced`) is profiled and the results
+are written to disk, one set of files per call:
+
+- a CPU profile made by cProfile (`.prof`, readable by `pstats`, snakeviz
+  and similar tools) or by the pyinstrument sampling profiler (`.html`)
+- a tracemalloc snapshot (`.tracemalloc`, loadable with
+  `tracemalloc.Snapshot.load()`) taken at the end of the call
+- a line in `profiles.jsonl` with the duration, peak memory and the top
+  allocation sites of the call (the peak is null on Python < 3.9 when
+  tracemalloc was already tracing, as its peak can't be reset there)
+
+This way it's possible to tell, for example, the cost of building pandas
+DataFrames apart from network waits in `bucket_objects_report()` without
+editing any code. Profiling is turned on either by the `profiling()`
+context manager or by environment variables:
+
+- `CLOUDGEASS_PROFILE`: the directory where profiles are written
+- `CLOUDGEASS_PROFILE_ENGINE`: "cprofile" (default) or "pyinstrument"
+- `CLOUDGEASS_PROFILE_MEMORY`: "0" to skip tracemalloc snapshots
+
+Only the outermost profiled call is recorded: nested cloudgeass calls and
+calls made by other threads while a profile is being recorded are part of
+the parent profile or run without profiling, as Python allows a single
+active profiler per process.
+
+Examples:
+    ```python
+    # Importing the context manager
+    from cloudgeass.utils.profiling import profiling
+    from cloudgeass.aws.s3 import S3Client
+
+    with profiling(output_dir="profiles"):
+        S3Client().bucket_objects_report(bucket_name="some-bucket")
+    ```
+
+___
+"""
+
+# Importing libraries
+import cProfile
+import itertools
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from cloudgeass.utils.lazy import lazy_import
+
+# pyinstrument is an optional dependency, only imported when used
+pyinstrument = lazy_import("pyinstrument")
+
+
+# Environment variables that turn profiling on without code changes
+PROFILE_ENV_VAR = "CLOUDGEASS_PROFILE"
+PROFILE_ENGINE_ENV_VAR = "CLOUDGEASS_PROFILE_ENGINE"
+PROFILE_MEMORY_ENV_VAR = "CLOUDGEASS_PROFILE_MEMORY"
+
+# Profiling engines supported by Profiler
+SUPPORTED_ENGINES = ("cprofile", "pyinstrument")
+
+# The index file with a summary of every profiled call
+PROFILES_INDEX_FILE = "profiles.jsonl"
+
+# A single profiler can be active in a Python process at once
+_PROFILE_LOCK = threading.Lock()
+
+
+class Profiler():
+    """Profiles calls and writes their CPU and memory profiles to disk.
+
+    Args:
+        output_dir (str, optional):
+            The directory where profiles are written.
+
+        engine (str, optional):
+            "cprofile" (deterministic) or "pyinstrument" (sampling).
+
+        memory (bool, optional):
+            Whether tracemalloc snapshots are taken.
+
+        top_allocations (int, optional):
+            How many allocation sites are summarized in the index file.
+
+    Raises:
+        ValueError: If the engine is not supported.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "cloudgeass-profiles",
+        engine: str = "cprofile",
+        memory: bool = True,
+        top_allocations: int = 10
+    ):
+        if engine not in SUPPORTED_ENGINES:
+            raise ValueError(f"Invalid engine {engine}. Supported engines "
+                             f"are {SUPPORTED_ENGINES}")
+
+        self.output_dir = output_dir
+        self.engine = engine
+        self.memory = memory
+        self.top_allocations = top_allocations
+        self._ids = itertools.count(1)
+
+    def _file_prefix(self, name: str) -> str:
+        safe_name = re.sub(r"[^\w.-]", "_", name)
+        timestamp = time.strftime("%Y%m%dT%H%M%S")
+        return os.path.join(self.output_dir,
+                            f"{safe_name}-{timestamp}-{next(self._ids)}")
+
+    def profile_call(self, name: str, func, *args, **kwargs):
+        """Calls a function and writes its profiles to disk.
+
+        Calls made while another call is being profiled are run without
+        profiling.
+
+        Args:
+            name (str): The name of the call (e.g. "S3Client.list_buckets").
+            func (Callable): The function to be called.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            The value returned by the function.
+        """
+
+        if not _PROFILE_LOCK.acquire(blocking=False):
+            return func(*args, **kwargs)
+
+        try:
+            return self._profile_call(name, func, *args, **kwargs)
+        finally:
+            _PROFILE_LOCK.release()
+
+    def _profile_call(self, name: str, func, *args, **kwargs):
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = self._file_prefix(name)
+        record = {"method": name, "files": []}
+
+        # Tracking memory (only stopping tracemalloc if it was started here)
+        started_tracemalloc = False
+        known_peak = True
+        if self.memory:
+            started_tracemalloc = not tracemalloc.is_tracing()
+            if started_tracemalloc:
+                tracemalloc.start()
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            else:
+                # Python < 3.9 can't reset the peak of a running trace
+                known_peak = False
+
+        if self.engine == "cprofile":
+            profiler = cProfile.Profile()
+        else:
+            profiler = pyinstrument.Profiler()
+
+        start = time.perf_counter()
+        if self.engine == "cprofile":
+            profiler.enable()
+        else:
+            profiler.start()
+
+        try:
+            return func(*args, **kwargs)
+
+        finally:
+            if self.engine == "cprofile":
+                profiler.disable()
+            else:
+                profiler.stop()
+            record["duration_s"] = time.perf_counter() - start
+
+            # Writing the CPU profile
+            if self.engine == "cprofile":
+                profiler.dump_stats(f"{prefix}.prof")
+                record["files"].append(f"{prefix}.prof")
+            else:
+                with open(f"{prefix}.html", "w") as f:
+                    f.write(profiler.output_html())
+                record["files"].append(f"{prefix}.html")
+
+            # Writing the memory snapshot and its top allocation sites
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                record["peak_memory_bytes"] = peak if known_peak else None
+                snapshot = tracemalloc.take_snapshot()
+                if started_tracemalloc:
+                    tracemalloc.stop()
+
+                snapshot.dump(f"{prefix}.tracemalloc")
+                record["files"].append(f"{prefix}.tracemalloc")
+                record["top_allocations"] = [
+                    {"location": str(stat.traceback), "size_bytes": stat.size}
+                    for stat in snapshot.statistics("lineno")[
+                        :self.top_allocations
+                    ]
+                ]
+
+            index_path = os.path.join(self.output_dir, PROFILES_INDEX_FILE)
+            with open(index_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+# The profiler set by the profiling() context manager (if any)
+_PROFILER = None
+
+# The profiler built from environment variables and the values it used
+_ENV_PROFILER = None
+_ENV_PROFILER_KEY = None
+
+
+def _env_profiler() -> Profiler:
+    global _ENV_PROFILER, _ENV_PROFILER_KEY
+
+    output_dir = os.environ.get(PROFILE_ENV_VAR)
+    if not output_dir:
+        return None
+
+    key = (output_dir,
+           os.environ.get(PROFILE_ENGINE_ENV_VAR, "cprofile").lower(),
+           os.environ.get(PROFILE_MEMORY_ENV_VAR, "1") != "0")
+    if key != _ENV_PROFILER_KEY:
+        _ENV_PROFILER = Profiler(output_dir=key[0], engine=key[1],
+                                 memory=key[2])
+        _ENV_PROFILER_KEY = key
+
+    return _ENV_PROFILER
+
+
+def active_profiler() -> Profiler:
+    """Returns the active profiler or None if profiling is off.
+
+    The profiler of the `profiling()` context manager takes precedence over
+    the one configured by environment variables.
+    """
+
+    return _PROFILER or _env_profiler()
+
+
+@contextmanager
+def profiling(
+    output_dir: str = "cloudgeass-profiles",
+    engine: str = "cprofile",
+    memory: bool = True
+):
+    """Context manager that profiles cloudgeass calls made within it.
+
+    Examples:
+        ```python
+        # Importing the context manager
+        from cloudgeass.utils.profiling import profiling
+
+        with profiling(output_dir="profiles", engine="pyinstrument"):
+            s3.all_buckets_objects_report()
+        ```
+
+    Args:
+        output_dir (str, optional): The directory where profiles are written.
+        engine (str, optional): "cprofile" or "pyinstrument".
+        memory (bool, optional): Whether tracemalloc snapshots are taken.
+
+    Yields:
+        Profiler: The active profiler.
+    """
+
+    global _PROFILER
+
+    previous = _PROFILER
+    _PROFILER = Profiler(output_dir=output_dir, engine=engine, memory=memory)
+    try:
+        yield _PROFILER
+    finally:
+        _PROFILER = previous
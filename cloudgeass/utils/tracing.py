@@ -0,0 +1,364 @@
+"""Provides pluggable tracing spans for cloudgeass operations.
+
+Public cloudgeass methods are wrapped in spans and their AWS calls and local
+processing steps (e.g. building DataFrames or parsing partitions) emit child
+spans. Spans are handled by the active tracer:
+
+- `OpenTelemetryTracer` is used by default when OpenTelemetry is installed,
+  so spans are exported by whatever OpenTelemetry SDK the application sets;
+- `NoopTracer` is used otherwise, with near-zero overhead;
+- `RecordingTracer` keeps finished spans in memory, which is handy to find
+  out where time goes without any tracing backend.
+
+Examples:
+    ```python
+    # Importing the functions
+    from cloudgeass.utils.tracing import RecordingTracer, set_tracer
+    from cloudgeass.aws.s3 import S3Client
+
+    tracer = set_tracer(RecordingTracer())
+    S3Client().all_buckets_objects_report()
+
+    for span in tracer.spans:
+        print(span["name"], span["duration"])
+    ```
+
+___
+"""
+
+# Importing libraries
+import contextvars
+import functools
+import importlib.util
+import itertools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from cloudgeass.utils.lazy import lazy_import
+
+# OpenTelemetry is only imported when a span is started with it
+otel_trace = lazy_import("opentelemetry.trace")
+
+# Flag set on code objects of coroutine functions (inspect.CO_COROUTINE)
+CO_COROUTINE = 0x80
+
+# Flag set on code objects of generator functions (inspect.CO_GENERATOR)
+CO_GENERATOR = 0x20
+
+# Turns profiling on (see cloudgeass.utils.profiling.PROFILE_ENV_VAR)
+PROFILE_ENV_VAR = "CLOUDGEASS_PROFILE"
+
+
+class _NoopSpan():
+    """A span that does nothing, shared by all no-op calls."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer():
+    """Interface of cloudgeass tracers.
+
+    Tracers must implement `start_span()`, returning a context manager that
+    yields an object with a `set_attribute(key, value)` method.
+    """
+
+    def start_span(self, name: str, attributes: dict = None):
+        raise NotImplementedError
+
+
+class NoopTracer(Tracer):
+    """A tracer that discards all spans."""
+
+    def start_span(self, name: str, attributes: dict = None):
+        return _NOOP_SPAN
+
+
+class OpenTelemetryTracer(Tracer):
+    """A tracer that emits spans through the OpenTelemetry API.
+
+    Args:
+        instrumentation_name (str, optional):
+            The name of the OpenTelemetry tracer.
+    """
+
+    def __init__(self, instrumentation_name: str = "cloudgeass"):
+        self.instrumentation_name = instrumentation_name
+        self._tracer = None
+
+    def start_span(self, name: str, attributes: dict = None):
+        if self._tracer is None:
+            self._tracer = otel_trace.get_tracer(self.instrumentation_name)
+
+        return self._tracer.start_as_current_span(name, attributes=attributes)
+
+
+class _RecordedSpan():
+    """A span recorded in memory by RecordingTracer."""
+
+    def __init__(self, span_id: int, name: str, parent_id: int,
+                 attributes: dict):
+        self.span_id = span_id
+        self.name = name
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+
+class RecordingTracer(Tracer):
+    """A tracer that keeps finished spans in memory.
+
+    Attributes:
+        spans (list):
+            Finished spans as dictionaries with "span_id", "name",
+            "parent_id", "start", "duration", "thread" and "attributes".
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._current = contextvars.ContextVar(
+            f"cloudgeass_span_{id(self)}", default=None
+        )
+
+    @contextmanager
+    def start_span(self, name: str, attributes: dict = None):
+        span = _RecordedSpan(next(self._ids), name, self._current.get(),
+                             attributes)
+        token = self._current.set(span.span_id)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            duration = time.perf_counter() - start
+            self._current.reset(token)
+            with self._lock:
+                self.spans.append({
+                    "span_id": span.span_id,
+                    "name": span.name,
+                    "parent_id": span.parent_id,
+                    "start": start,
+                    "duration": duration,
+                    "thread": threading.current_thread().name,
+                    "attributes": span.attributes
+                })
+
+    def children(self, span_id: int) -> list:
+        """Returns the finished spans whose parent is the given span."""
+
+        return [s for s in self.spans if s["parent_id"] == span_id]
+
+
+# The active tracer (resolved on first use)
+_TRACER = None
+
+
+def _default_tracer() -> Tracer:
+    if importlib.util.find_spec("opentelemetry") is not None:
+        return OpenTelemetryTracer()
+
+    return NoopTracer()
+
+
+def get_tracer() -> Tracer:
+    """Returns the active tracer.
+
+    OpenTelemetryTracer is used by default when OpenTelemetry is installed
+    and NoopTracer otherwise.
+    """
+
+    global _TRACER
+
+    if _TRACER is None:
+        _TRACER = _default_tracer()
+
+    return _TRACER
+
+
+def set_tracer(tracer: Tracer = None) -> Tracer:
+    """Sets the active tracer.
+
+    Args:
+        tracer (Tracer, optional):
+            The tracer to be used. None restores the default tracer.
+
+    Returns:
+        The active tracer.
+    """
+
+    global _TRACER
+
+    _TRACER = tracer
+    return get_tracer()
+
+
+def tracing_enabled() -> bool:
+    """Checks if the active tracer records spans at all."""
+
+    return not isinstance(get_tracer(), NoopTracer)
+
+
+def span(name: str, **attributes):
+    """Starts a span with the active tracer.
+
+    Examples:
+        ```python
+        # Importing the function
+        from cloudgeass.utils.tracing import span
+
+        with span("build_dataframe", rows=1000):
+            ...
+        ```
+
+    Args:
+        name (str): The span name.
+        **attributes: Attributes added to the span.
+
+    Returns:
+        A context manager that yields the span.
+    """
+
+    return get_tracer().start_span(name, attributes or None)
+
+
+def _has_code_flag(func, flag: int) -> bool:
+    # The same checks of inspect.iscoroutinefunction() and
+    # inspect.isgeneratorfunction(), without importing inspect
+    code = getattr(func, "__code__", None)
+    return code is not None and bool(code.co_flags & flag)
+
+
+def _is_coroutine_function(func) -> bool:
+    return _has_code_flag(func, CO_COROUTINE)
+
+
+def _is_generator_function(func) -> bool:
+    return _has_code_flag(func, CO_GENERATOR)
+
+
+def _spanned_generator(name: str, generator):
+    with get_tracer().start_span(name):
+        yield from generator
+
+
+def _run_in_context(context: contextvars.Context, generator):
+    # Every step runs on the same context, so the span set by the generator
+    # is never seen by (nor reset from) the code consuming it
+    try:
+        while True:
+            yield context.run(next, generator)
+
+    except StopIteration:
+        return
+
+    finally:
+        context.run(generator.close)
+
+
+def _active_profiler():
+    # The profiling module is only loaded once profiling was turned on
+    profiling = sys.modules.get("cloudgeass.utils.profiling")
+    if profiling is None:
+        if not os.environ.get(PROFILE_ENV_VAR):
+            return None
+
+        from cloudgeass.utils import profiling
+
+    return profiling.active_profiler()
+
+
+def traced(name: str):
+    """Decorator that wraps a function call in a span.
+
+    When profiling is on (see `cloudgeass.utils.profiling`), the call is
+    also profiled. Coroutine functions are supported too: their spans last
+    until the coroutine is done, but they are never profiled, as coroutines
+    interleaved on an event loop can't be told apart by a profiler. The
+    same goes for generator functions, whose spans last from the first
+    item until the generator is exhausted or closed.
+
+    Examples:
+        ```python
+        # Importing the decorator
+        from cloudgeass.utils.tracing import traced
+
+        @traced("s3.list_buckets")
+        def list_buckets(self):
+            ...
+        ```
+
+    Args:
+        name (str): The span name.
+    """
+
+    def decorator(func):
+        if _is_coroutine_function(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with get_tracer().start_span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        if _is_generator_function(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                # Spans are children of the span active on the call
+                return _run_in_context(
+                    contextvars.copy_context(),
+                    _spanned_generator(name, func(*args, **kwargs))
+                )
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().start_span(name):
+                profiler = _active_profiler()
+                if profiler is None:
+                    return func(*args, **kwargs)
+
+                return profiler.profile_call(name, func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def propagate(func):
+    """Wraps a callable to run it in a copy of the current context.
+
+    Callables submitted to thread pools don't inherit the caller context, so
+    their spans would lose their parents. Wrapping them with this function
+    keeps spans nested across threads.
+
+    Args:
+        func (Callable): The callable to be run on another thread.
+
+    Returns:
+        A callable that runs `func` within the context of the caller.
+    """
+
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # A context can't be entered twice at once, so each call gets a copy
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
@@ -16,12 +16,17 @@ setup(
     version='2.0.1',
     author='Thiago Panini',
     author_email='panini.development@gmail.com',
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=[
         "boto3",
         "Faker",
         "pyarrow"
     ],
+    extras_require={
+        "zstd": ["zstandard"],
+        "profiling": ["pyinstrument"],
+        "aio": ["aiobotocore"]
+    },
     license='MIT',
     description="Making your life easier on doing simple tasks in AWS via "
                 "boto3",
@@ -42,7 +47,8 @@ setup(
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
         "Topic :: Software Development :: Libraries :: Python Modules"
     ],
-    python_requires=">=3.0.0"
+    python_requires=">=3.7"
 )
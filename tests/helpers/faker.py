@@ -9,13 +9,7 @@ ___
 """
 
 # Importing libraries
-from faker import Faker
-import pandas as pd
-
-
-# Initializing faker
-faker = Faker()
-Faker.seed(42)
+from cloudgeass.testing.data import fake_payload
 
 
 # Generating fake data in CSV, JSON or PARQUET format
@@ -40,14 +34,10 @@ def fake_data(
     Returns:
         bytes: The generated fake data in bytes format.
 
-    Raises:
-        ValueError: If the specified format is not supported.
-
     Note:
-        This function uses the Faker library to generate arbitrary fake values.
-        For "csv" format, data is returned as CSV formatted bytes.
-        For "json" format, data is returned as JSON formatted bytes.
-        For "parquet" format, data is returned as Parquet formatted bytes.
+        This function uses `cloudgeass.testing.data.fake_payload()` to build
+        random values with vectorized NumPy operations, so large fixtures are
+        generated quickly. Unsupported formats return None.
 
     Examples:
         ```python
@@ -59,31 +49,8 @@ def fake_data(
         ```
     """
 
-    # Getting arbitrary fake values using Faker
-    fake_values = [[faker.uuid4() for _ in range(len(headers))]
-                   for _ in range(n_rows)]
-
-    # Bulding a fake pandas DataFrame
-    df_fake = pd.DataFrame(data=fake_values, columns=headers)
-
-    # Preparing the output file extension
-    format_prep = format.lower().strip().replace(".", "")
-
-    # Checking if it is a CSV file
-    if format_prep == "csv":
-        bytes_data = bytes(df_fake.to_csv(index=False),
-                           encoding="utf-8")
-
-    # Checking if it is a JSON file
-    elif format_prep == "json":
-        bytes_data = bytes(df_fake.to_json(orient="records"),
-                           encoding="utf-8")
-
-    # Checking if it is a PARQUET file
-    elif format_prep == "parquet":
-        bytes_data = df_fake.to_parquet(compression="snappy")
-
-    else:
-        bytes_data = None
+    try:
+        return fake_payload(format=format, n_rows=n_rows, columns=headers)
 
-    return bytes_data
+    except ValueError:
+        return None
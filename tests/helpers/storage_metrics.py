@@ -0,0 +1,51 @@
+"""Helpers that publish S3 storage metrics on mocked CloudWatch.
+
+S3 publishes the daily BucketSizeBytes and NumberOfObjects metrics of every
+bucket by itself, which moto doesn't do. The helpers defined here put the
+same metrics (with the same namespace and dimensions) on moto, so features
+based on them can be tested without calling AWS.
+
+___
+"""
+
+# Importing libraries
+from datetime import datetime, timedelta, timezone
+
+import boto3
+
+
+def put_storage_metrics(
+    bucket_name: str,
+    n_objects: int,
+    sizes: dict,
+    region_name: str,
+    days_ago: int = 1
+) -> None:
+    """Puts the daily storage metrics of a bucket on mocked CloudWatch.
+
+    Args:
+        bucket_name (str): The bucket of the metrics.
+        n_objects (int): The value of the NumberOfObjects metric.
+        sizes (dict): BucketSizeBytes values by storage type.
+        region_name (str): The region of the metrics.
+        days_ago (int, optional): How many days ago datapoints were taken.
+    """
+
+    timestamp = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    metrics = [("NumberOfObjects", "AllStorageTypes", n_objects, "Count")] + \
+        [("BucketSizeBytes", storage_type, size, "Bytes")
+         for storage_type, size in sizes.items()]
+
+    boto3.client("cloudwatch", region_name=region_name).put_metric_data(
+        Namespace="AWS/S3",
+        MetricData=[{
+            "MetricName": metric_name,
+            "Dimensions": [
+                {"Name": "BucketName", "Value": bucket_name},
+                {"Name": "StorageType", "Value": storage_type}
+            ],
+            "Timestamp": timestamp,
+            "Value": value,
+            "Unit": unit
+        } for metric_name, storage_type, value, unit in metrics]
+    )
@@ -0,0 +1,102 @@
+"""Local stubs that inject throttling responses on test cases.
+
+The helpers defined here simulate AWS services that answer with 503
+SlowDown when they receive more concurrent calls than they can handle. They
+are used to validate components that must adapt to throttling without
+calling AWS.
+
+___
+"""
+
+# Importing libraries
+import threading
+import time
+
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+
+
+# Body of S3 503 SlowDown responses
+SLOW_DOWN_BODY = (
+    b'<?xml version="1.0" encoding="UTF-8"?><Error><Code>SlowDown</Code>'
+    b'<Message>Please reduce your request rate.</Message></Error>'
+)
+
+
+def slow_down_error(operation_name: str = "GetObject") -> ClientError:
+    """Builds the ClientError raised by boto3 on a S3 503 SlowDown response.
+
+    Args:
+        operation_name (str, optional): The throttled operation name.
+
+    Returns:
+        A botocore ClientError with a SlowDown error code.
+    """
+
+    return ClientError(
+        error_response={
+            "Error": {"Code": "SlowDown", "Message": "Please reduce your "
+                      "request rate."},
+            "ResponseMetadata": {"HTTPStatusCode": 503}
+        },
+        operation_name=operation_name
+    )
+
+
+class _RawBody():
+    """The raw body of a response built by hand."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+def slow_down_response(url: str = "https://s3.amazonaws.com/") -> AWSResponse:
+    """Builds the HTTP response of a S3 503 SlowDown answer.
+
+    Unlike `slow_down_error()`, the response is parsed and retried by
+    botocore when returned by a `before-send` event handler.
+
+    Args:
+        url (str, optional): The URL of the request.
+
+    Returns:
+        A botocore AWSResponse with a SlowDown error body.
+    """
+
+    return AWSResponse(url, 503, {"Content-Type": "application/xml"},
+                       _RawBody(SLOW_DOWN_BODY))
+
+
+class ThrottlingStub():
+    """A callable that throttles calls above a given concurrency.
+
+    Args:
+        capacity (int): Max concurrent calls accepted without throttling.
+        latency (float): How many seconds each accepted call takes.
+    """
+
+    def __init__(self, capacity: int = 4, latency: float = 0.005):
+        self.capacity = capacity
+        self.latency = latency
+        self.in_flight = 0
+        self.throttles = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value=None):
+        with self._lock:
+            self.calls += 1
+            if self.in_flight >= self.capacity:
+                self.throttles += 1
+                raise slow_down_error()
+            self.in_flight += 1
+
+        try:
+            time.sleep(self.latency)
+            return value
+        finally:
+            with self._lock:
+                self.in_flight -= 1
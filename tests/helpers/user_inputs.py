@@ -12,6 +12,8 @@ ___
 """
 
 # Importing libraries
+import os
+
 from tests.helpers.faker import fake_data
 
 
@@ -128,6 +130,12 @@ PARTITIONED_S3_TABLES = {
     }
 }
 
+# A small body to be uploaded in a single request
+MOCKED_UPLOAD_BODY = fake_data(format="csv", n_rows=100)
+
+# A body large enough to be uploaded in multiple parts (even if compressed)
+MOCKED_MULTIPART_UPLOAD_BODY = os.urandom(12 * 1024 ** 2)
+
 
 """ -------------------------------------------------
     USER INPUTS: EC2Client class
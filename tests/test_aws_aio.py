@@ -0,0 +1,299 @@
+"""Test cases for features defined on cloudgeass.aws.aio module.
+
+Async clients are tested against a moto server, as aiobotocore calls don't
+go through the botocore HTTP layer patched by moto decorators. Tests are
+skipped when aiobotocore or moto[server] aren't installed.
+
+___
+"""
+
+# Importing libraries
+import asyncio
+import contextlib
+import socket
+
+import boto3
+import pytest
+
+from botocore.config import Config
+
+from cloudgeass.aws import aio
+from cloudgeass.aws.aio import AsyncS3Client, AsyncSecretsManagerClient
+from cloudgeass.utils.tracing import RecordingTracer, set_tracer, span
+
+from tests.helpers.user_inputs import (
+    MOCKED_REGION,
+    MOCKED_BUCKET_CONTENT,
+    MOCKED_SECRET_NAME,
+    MOCKED_SECRET_VALUE
+)
+
+# Skipping the module without the optional dependencies
+pytest.importorskip("aiobotocore")
+moto_server = pytest.importorskip("moto.server")
+AioConfig = pytest.importorskip("aiobotocore.config").AioConfig
+
+
+@pytest.fixture(scope="module")
+def endpoint_url():
+    # Running a moto server on a free port for the whole module
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=port,
+                                            verbose=False)
+    server.start()
+    yield f"http://127.0.0.1:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def client_kwargs(endpoint_url, monkeypatch):
+    # Fake credentials are enough for moto server
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+    return {"region_name": MOCKED_REGION, "endpoint_url": endpoint_url}
+
+
+@pytest.fixture
+def prepare_server_buckets(client_kwargs):
+    # Creating the mocked buckets on moto server with a regular boto3 client
+    client = boto3.client("s3", **client_kwargs)
+    for bucket_name, content_definition in MOCKED_BUCKET_CONTENT.items():
+        with contextlib.suppress(client.exceptions.BucketAlreadyOwnedByYou):
+            client.create_bucket(Bucket=bucket_name)
+
+        for content in content_definition.values():
+            client.put_object(Bucket=bucket_name, Key=content["Key"],
+                              Body=content["Body"])
+
+
+@pytest.mark.aws_aio
+@pytest.mark.list_buckets
+def test_concurrent_list_buckets_calls_share_a_single_client(
+    client_kwargs,
+    prepare_server_buckets
+):
+    """
+    G: Given that users want to list buckets from many coroutines at once
+    W: When list_buckets() calls of an AsyncS3Client are gathered
+    T: Then all calls must return every mocked bucket using the same client
+    """
+
+    async def main():
+        async with AsyncS3Client(**client_kwargs) as s3:
+            client = await s3.get_client()
+            results = await asyncio.gather(
+                *(s3.list_buckets() for _ in range(32))
+            )
+            return results, client is await s3.get_client()
+
+    results, same_client = asyncio.run(main())
+
+    assert same_client
+    assert all(set(MOCKED_BUCKET_CONTENT) <= set(buckets)
+               for buckets in results)
+
+
+@pytest.mark.aws_aio
+@pytest.mark.bucket_objects_report
+def test_async_bucket_objects_report_yields_every_page(client_kwargs):
+    """
+    G: Given that users want to report a bucket with many listing pages
+    W: When bucket_objects_report() of an AsyncS3Client is iterated over a
+       bucket with 1001 objects uploaded concurrently
+    T: Then two pages must be yielded with every object and the same
+       columns of S3Client.bucket_objects_report()
+    """
+
+    bucket_name = "cloudgeass-aio-paginated-bucket"
+    keys = [f"data/file-{i:04d}.csv" for i in range(1001)]
+
+    async def main():
+        async with AsyncS3Client(**client_kwargs) as s3:
+            client = await s3.get_client()
+            await client.create_bucket(Bucket=bucket_name)
+            await asyncio.gather(*(
+                client.put_object(Bucket=bucket_name, Key=key, Body=b"x")
+                for key in keys
+            ))
+
+            return [df async for df in s3.bucket_objects_report(bucket_name)]
+
+    pages = asyncio.run(main())
+
+    assert [len(df) for df in pages] == [1000, 1]
+    assert list(pages[0].columns) == [
+        "BucketName", "Key", "ObjectType", "Size", "SizeFormatted",
+        "LastModified", "ETag", "StorageClass"
+    ]
+    assert sorted(k for df in pages for k in df["Key"]) == keys
+
+
+@pytest.mark.aws_aio
+@pytest.mark.get_last_date_partition
+def test_async_get_last_date_partition_of_concurrent_tables(
+    client_kwargs,
+    prepare_server_buckets
+):
+    """
+    G: Given that users want the last date partition of many tables at once
+    W: When get_last_date_partition() calls of an AsyncS3Client are gathered
+    T: Then each call must return the last partition of its bucket
+    """
+
+    async def main():
+        async with AsyncS3Client(**client_kwargs) as s3:
+            return await asyncio.gather(
+                s3.get_last_date_partition(
+                    bucket_name="cloudgeass-mock-bucket-01",
+                    table_prefix="csv"
+                ),
+                s3.get_last_date_partition(
+                    bucket_name="cloudgeass-mock-bucket-02",
+                    table_prefix="csv",
+                    date_partition_name="anomes"
+                )
+            )
+
+    assert asyncio.run(main()) == [20230119, 202303]
+
+
+@pytest.mark.aws_aio
+@pytest.mark.bucket_objects_report
+def test_async_bucket_objects_report_listing_has_a_span(
+    client_kwargs,
+    prepare_server_buckets
+):
+    """
+    G: Given that a RecordingTracer is the active tracer
+    W: When bucket_objects_report() of an AsyncS3Client is iterated within
+       a span
+    T: Then the listing span must be a child of that span, with the AWS
+       call spans as children, while spans of the consumer aren't
+    """
+
+    async def main():
+        async with AsyncS3Client(**client_kwargs) as s3:
+            with span("caller"):
+                async for _ in s3.bucket_objects_report(
+                    bucket_name="cloudgeass-mock-bucket-01"
+                ):
+                    with span("consumer"):
+                        pass
+
+    tracer = set_tracer(RecordingTracer())
+    try:
+        asyncio.run(main())
+    finally:
+        set_tracer(None)
+
+    spans = {s["name"]: s for s in tracer.spans}
+    listing_span = spans["AsyncS3Client.bucket_objects_report"]
+    children = [c["name"] for c in tracer.children(listing_span["span_id"])]
+
+    assert listing_span["parent_id"] == spans["caller"]["span_id"]
+    assert spans["consumer"]["parent_id"] == spans["caller"]["span_id"]
+    assert "aws.s3.ListObjectsV2" in children
+
+
+@pytest.mark.aws_aio
+@pytest.mark.get_last_date_partition
+def test_error_on_async_get_last_date_partition_of_an_empty_prefix(
+    client_kwargs,
+    prepare_server_buckets
+):
+    """
+    G: Given that users want the last date partition of a table
+    W: When get_last_date_partition() of an AsyncS3Client is awaited with a
+       prefix without objects
+    T: Then a ValueError must be raised
+    """
+
+    async def main():
+        async with AsyncS3Client(**client_kwargs) as s3:
+            return await s3.get_last_date_partition(
+                bucket_name="cloudgeass-mock-bucket-01",
+                table_prefix="no-such-table/"
+            )
+
+    with pytest.raises(ValueError, match="There are no objects"):
+        asyncio.run(main())
+
+
+@pytest.mark.aws_aio
+@pytest.mark.get_secret_string
+def test_async_get_secret_string_returns_the_secret_value(client_kwargs):
+    """
+    G: Given that users want to retrieve a secret on an event loop
+    W: When get_secret_string() of an AsyncSecretsManagerClient is awaited
+    T: Then the mocked secret value must be returned
+    """
+
+    boto3.client("secretsmanager", **client_kwargs).create_secret(
+        Name=MOCKED_SECRET_NAME,
+        SecretString=MOCKED_SECRET_VALUE
+    )
+
+    async def main():
+        async with AsyncSecretsManagerClient(**client_kwargs) as sm:
+            return await sm.get_secret_string(secret_id=MOCKED_SECRET_NAME)
+
+    assert asyncio.run(main()) == MOCKED_SECRET_VALUE
+
+
+@pytest.mark.aws_aio
+@pytest.mark.list_buckets
+def test_async_client_keeps_the_options_of_a_botocore_config(client_kwargs):
+    """
+    G: Given that users set up clients with a botocore Config
+    W: When the client of an AsyncS3Client is opened
+    T: Then its config must be an AioConfig holding the same options
+    """
+
+    config = Config(max_pool_connections=7, retries={"max_attempts": 2})
+
+    async def main():
+        async with AsyncS3Client(config=config, **client_kwargs) as s3:
+            return (await s3.get_client()).meta.config
+
+    client_config = asyncio.run(main())
+
+    # botocore turns max_attempts (retries) into total_max_attempts (calls)
+    assert isinstance(client_config, AioConfig)
+    assert client_config.max_pool_connections == 7
+    assert client_config.retries["total_max_attempts"] == 3
+
+
+@pytest.mark.aws_aio
+@pytest.mark.list_buckets
+def test_async_client_is_not_kept_when_client_hooks_fail(
+    client_kwargs, prepare_server_buckets, monkeypatch
+):
+    """
+    G: Given that a client hook may fail while a client is opened
+    W: When the client of an AsyncS3Client is opened and a hook raises
+    T: Then the error must be raised without keeping the client, and a
+       working client must be opened once hooks succeed
+    """
+
+    def failing_hooks(client):
+        raise RuntimeError("Failing client hook")
+
+    async def main():
+        s3 = AsyncS3Client(**client_kwargs)
+        with monkeypatch.context() as patch:
+            patch.setattr(aio, "_apply_client_hooks", failing_hooks)
+            with pytest.raises(RuntimeError):
+                await s3.get_client()
+
+        failed_state = (s3._client, s3._exit_stack)
+        async with s3:
+            return failed_state, await s3.list_buckets()
+
+    failed_state, buckets = asyncio.run(main())
+
+    assert failed_state == (None, None)
+    assert set(MOCKED_BUCKET_CONTENT) <= set(buckets)
@@ -0,0 +1,129 @@
+"""Test cases for features defined on cloudgeass.aws.base module.
+
+___
+"""
+
+# Importing libraries
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from moto import mock_s3
+
+from cloudgeass.aws.s3 import S3Client
+
+from tests.helpers.user_inputs import MOCKED_REGION
+
+
+@pytest.mark.aws_base
+@pytest.mark.lazy_initialization
+@mock_s3
+def test_client_and_resource_are_only_created_on_first_access():
+    """
+    G: Given that users want to create cloudgeass objects at almost no cost
+    W: When a S3Client object is created and its client attribute is accessed
+    T: Then no boto3 client or resource must exist right after the creation
+       and the resource must still not exist after accessing the client
+    """
+
+    s3 = S3Client(region_name=MOCKED_REGION)
+    assert s3._client is None and s3._resource is None
+
+    _ = s3.client
+    assert s3._client is not None and s3._resource is None
+
+
+@pytest.mark.aws_base
+@pytest.mark.lazy_initialization
+@mock_s3
+def test_lazy_resource_is_created_once_and_reused():
+    """
+    G: Given that users want to use the boto3 resource of a cloudgeass object
+    W: When the resource attribute is accessed twice
+    T: Then the same resource object must be returned
+    """
+
+    s3 = S3Client(region_name=MOCKED_REGION)
+
+    assert s3.resource is s3.resource
+
+
+@pytest.mark.aws_base
+@pytest.mark.thread_safety
+@mock_s3
+def test_threads_share_the_client_and_get_their_own_resources():
+    """
+    G: Given that users want to share a cloudgeass object across threads
+    W: When many threads access the client and resource attributes of the
+       same S3Client object at once
+    T: Then all threads must get the same client and each thread must get
+       its own resource (boto3 resources aren't thread-safe)
+    """
+
+    s3 = S3Client(region_name=MOCKED_REGION)
+    barrier = threading.Barrier(8)
+
+    def get_client_and_resources():
+        barrier.wait()
+        return s3.client, s3.resource, s3.resource
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: get_client_and_resources(),
+                                    range(8)))
+
+    assert len({id(client) for client, _, _ in results}) == 1
+    assert len({id(resource) for _, resource, _ in results}) == 8
+    assert all(first is second for _, first, second in results)
+
+
+def list_buckets_on_worker(s3: S3Client) -> list:
+    # Runs on a worker process with an unpickled S3Client
+    return s3.list_buckets()
+
+
+@pytest.mark.aws_base
+@pytest.mark.pickling
+def test_pickled_objects_keep_only_their_configuration():
+    """
+    G: Given that users want to send a cloudgeass object to other processes
+    W: When a S3Client object with a live client is pickled and unpickled
+    T: Then its configuration must be kept, its client and limiter must be
+       rebuilt on first access and, in the same process, the rebuilt client
+       must be the cached client of the same configuration
+    """
+
+    s3 = S3Client(region_name=MOCKED_REGION,
+                  performance_profile="high_throughput")
+    _ = s3.client, s3.limiter
+
+    s3_unpickled = pickle.loads(pickle.dumps(s3))
+
+    assert s3_unpickled.client_kwargs["region_name"] == MOCKED_REGION
+    assert s3_unpickled.performance_profile == "high_throughput"
+    assert s3_unpickled.max_workers == s3.max_workers
+    assert s3_unpickled._client is None and s3_unpickled._limiter is None
+    assert s3_unpickled.client is s3.client
+    assert s3_unpickled.limiter is not s3.limiter
+
+
+@pytest.mark.aws_base
+@pytest.mark.pickling
+@mock_s3
+def test_objects_can_be_sent_to_process_pool_workers():
+    """
+    G: Given that users want to run cloudgeass methods on a process pool
+    W: When a S3Client object is sent to ProcessPoolExecutor workers
+    T: Then workers must be able to call its methods
+    """
+
+    s3 = S3Client(region_name=MOCKED_REGION)
+    s3.client.create_bucket(Bucket="pickled-bucket")
+
+    # Workers are forked here, so they inherit the mocked S3 backend
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(2, mp_context=context) as executor:
+        results = list(executor.map(list_buckets_on_worker, [s3, s3]))
+
+    assert results == [["pickled-bucket"], ["pickled-bucket"]]
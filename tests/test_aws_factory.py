@@ -0,0 +1,69 @@
+"""Test cases for features defined on cloudgeass.aws.factory module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+from moto import mock_s3
+from botocore.config import Config
+
+from cloudgeass.aws.factory import get_client, clear_cache
+from cloudgeass.aws.s3 import S3Client
+
+from tests.helpers.user_inputs import MOCKED_REGION
+
+
+@pytest.mark.aws_factory
+@pytest.mark.get_client
+@mock_s3
+def test_get_client_returns_the_same_client_for_equal_configurations():
+    """
+    G: Given that users want to reuse warm boto3 clients along the process
+    W: When the function get_client() is called twice with equal arguments
+       (including equivalent botocore Config objects)
+    T: Then the same client object must be returned
+    """
+
+    client_a = get_client("s3", region_name=MOCKED_REGION,
+                          config=Config(max_pool_connections=20))
+    client_b = get_client("s3", region_name=MOCKED_REGION,
+                          config=Config(max_pool_connections=20))
+
+    assert client_a is client_b
+
+
+@pytest.mark.aws_factory
+@pytest.mark.get_client
+@mock_s3
+def test_get_client_returns_different_clients_for_different_configurations():
+    """
+    G: Given that users want to reuse warm boto3 clients along the process
+    W: When the function get_client() is called with different regions
+    T: Then different client objects must be returned
+    """
+
+    client_a = get_client("s3", region_name="us-east-1")
+    client_b = get_client("s3", region_name="sa-east-1")
+
+    assert client_a is not client_b
+
+
+@pytest.mark.aws_factory
+@pytest.mark.get_client
+@mock_s3
+def test_cloudgeass_objects_share_the_same_client_until_cache_is_cleared():
+    """
+    G: Given that users create many cloudgeass objects in the same process
+    W: When two S3Client objects are created with the same arguments and
+       then the function clear_cache() is called
+    T: Then both objects must share the same client and a new object created
+       after clearing the cache must get a new client
+    """
+
+    s3_a = S3Client(region_name=MOCKED_REGION)
+    s3_b = S3Client(region_name=MOCKED_REGION)
+    assert s3_a.client is s3_b.client
+
+    clear_cache()
+    assert S3Client(region_name=MOCKED_REGION).client is not s3_a.client
@@ -0,0 +1,111 @@
+"""Test cases for features defined on cloudgeass.aws.instrumentation module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+from moto import mock_s3, mock_secretsmanager
+
+from cloudgeass.aws.instrumentation import (
+    CALL_DURATION_METRIC,
+    CALLS_METRIC,
+    BYTES_RECEIVED_METRIC,
+    enable_instrumentation,
+    disable_instrumentation
+)
+from cloudgeass.utils.metrics import MetricsRegistry
+
+from tests.helpers.user_inputs import (
+    NON_EMPTY_BUCKET_NAME,
+    MOCKED_SECRET_NAME
+)
+
+
+@pytest.fixture
+def registry():
+    # Enabling instrumentation on a fresh registry for each test case
+    registry = enable_instrumentation(registry=MetricsRegistry())
+    yield registry
+    disable_instrumentation()
+
+
+@pytest.mark.aws_instrumentation
+@pytest.mark.enable_instrumentation
+@mock_s3
+def test_instrumentation_records_latency_of_each_s3_operation(
+    registry, s3, prepare_mocked_bucket
+):
+    """
+    G: Given that users enabled the instrumentation of cloudgeass clients
+    W: When the method bucket_objects_report() is called from S3Client
+    T: Then the snapshot must contain a latency histogram and a successful
+       call count for the ListObjectsV2 operation
+    """
+
+    # Preparing a mocked s3 environment with buckets and files
+    prepare_mocked_bucket()
+
+    s3.bucket_objects_report(bucket_name=NON_EMPTY_BUCKET_NAME)
+    snapshot = registry.snapshot()
+
+    operations = [h["labels"]["operation"]
+                  for h in snapshot["histograms"][CALL_DURATION_METRIC]]
+    successful_calls = [c for c in snapshot["counters"][CALLS_METRIC]
+                        if c["labels"]["operation"] == "ListObjectsV2"]
+
+    assert "ListObjectsV2" in operations
+    assert successful_calls[0]["labels"]["status"] == "success"
+    assert successful_calls[0]["value"] == 1
+
+
+@pytest.mark.aws_instrumentation
+@pytest.mark.enable_instrumentation
+@mock_secretsmanager
+def test_instrumentation_records_errors_and_bytes_of_secrets_manager_calls(
+    registry, sm, prepare_mocked_secrets
+):
+    """
+    G: Given that users enabled the instrumentation of cloudgeass clients
+    W: When the method get_secret_string() is called with a valid and with an
+       invalid secret ID
+    T: Then the snapshot must count one success and one error and record the
+       bytes received for the GetSecretValue operation
+    """
+
+    # Preparing a mocked Secrets Manager environment with mocked secrets
+    prepare_mocked_secrets()
+
+    sm.get_secret_string(secret_id=MOCKED_SECRET_NAME)
+    with pytest.raises(Exception):
+        sm.get_secret_string(secret_id="some-invalid-secret-id")
+
+    snapshot = registry.snapshot()
+    statuses = sorted(c["labels"]["status"]
+                      for c in snapshot["counters"][CALLS_METRIC]
+                      if c["labels"]["operation"] == "GetSecretValue")
+
+    assert statuses == ["error", "success"]
+    assert BYTES_RECEIVED_METRIC in snapshot["counters"]
+
+
+@pytest.mark.aws_instrumentation
+@pytest.mark.enable_instrumentation
+@mock_s3
+def test_no_metrics_are_recorded_after_disabling_instrumentation(
+    s3, prepare_mocked_bucket
+):
+    """
+    G: Given that users enabled and then disabled the instrumentation
+    W: When a cloudgeass method is called
+    T: Then no metrics must be recorded in the registry
+    """
+
+    registry = enable_instrumentation(registry=MetricsRegistry())
+    disable_instrumentation()
+
+    # Preparing a mocked s3 environment with buckets and files
+    prepare_mocked_bucket()
+    s3.list_buckets()
+
+    assert registry.snapshot() == {"counters": {}, "histograms": {}}
@@ -0,0 +1,89 @@
+"""Test cases for features defined on cloudgeass.aws.profiles module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+from moto import mock_s3
+from botocore.config import Config
+
+from cloudgeass.aws.profiles import (
+    PERFORMANCE_PROFILES,
+    get_performance_config
+)
+from cloudgeass.aws.s3 import S3Client
+
+from tests.helpers.user_inputs import MOCKED_REGION
+
+
+@pytest.mark.aws_profiles
+@pytest.mark.get_performance_config
+@pytest.mark.parametrize("performance_profile", PERFORMANCE_PROFILES.keys())
+def test_performance_config_sets_pool_retries_keepalive_and_timeouts(
+    performance_profile
+):
+    """
+    G: Given that users want a tuned botocore config for their workload
+    W: When the function get_performance_config() is called with a profile
+    T: Then the returned config must set the pool size, retries, TCP
+       keepalive and timeouts defined by the profile
+    """
+
+    config = get_performance_config(performance_profile)
+    expected = PERFORMANCE_PROFILES[performance_profile]
+
+    assert config.max_pool_connections == expected["max_pool_connections"]
+    assert config.retries == expected["retries"]
+    assert config.tcp_keepalive is True
+    assert config.connect_timeout == expected["connect_timeout"]
+    assert config.read_timeout == expected["read_timeout"]
+
+
+@pytest.mark.aws_profiles
+@pytest.mark.get_performance_config
+def test_user_config_options_take_precedence_over_the_profile():
+    """
+    G: Given that users want to tune a single option of a profile
+    W: When the function get_performance_config() is called with a config
+    T: Then the user option must override the profile and the other profile
+       options must be kept
+    """
+
+    config = get_performance_config("lambda", Config(read_timeout=5))
+
+    assert config.read_timeout == 5
+    assert config.max_pool_connections == \
+        PERFORMANCE_PROFILES["lambda"]["max_pool_connections"]
+
+
+@pytest.mark.aws_profiles
+@pytest.mark.get_performance_config
+def test_error_on_trying_to_get_an_invalid_performance_profile():
+    """
+    G: Given that users want a tuned botocore config for their workload
+    W: When the function get_performance_config() is called with a profile
+       name that doesn't exist
+    T: Then a ValueError exception must be thrown
+    """
+
+    with pytest.raises(ValueError):
+        _ = get_performance_config("dummy")
+
+
+@pytest.mark.aws_profiles
+@mock_s3
+def test_parallel_features_are_sized_according_to_the_performance_profile():
+    """
+    G: Given that users create a cloudgeass client with a performance profile
+    W: When the client and its max_workers attribute are accessed
+    T: Then the boto3 client must use the profile connection pool size and
+       max_workers must match it
+    """
+
+    s3 = S3Client(region_name=MOCKED_REGION,
+                  performance_profile="high_throughput")
+    expected = PERFORMANCE_PROFILES["high_throughput"]["max_pool_connections"]
+
+    assert s3.client.meta.config.max_pool_connections == expected
+    assert s3.max_workers == expected
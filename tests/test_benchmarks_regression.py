@@ -0,0 +1,51 @@
+"""Test cases for the comparison of benchmark runs on benchmarks.regression.
+
+___
+"""
+
+# Importing libraries
+import pytest
+
+from benchmarks.regression import compare_runs, summarize
+
+
+@pytest.mark.benchmarks_regression
+@pytest.mark.compare_runs
+def test_compare_runs_ignores_drops_within_the_noise_of_repeats():
+    """
+    G: Given that benchmark repeats are noisy
+    W: When the function compare_runs() is called with a median drop that
+       is larger than the tolerance but within the noise between repeats
+    T: Then the scenario must be flagged as unchanged
+    """
+
+    baseline = {"list_objects": summarize([100, 80, 120, 90, 110])}
+    current = {"list_objects": summarize([80, 60, 100, 70, 90])}
+
+    comparison = compare_runs(baseline, current, tolerance=0.1)
+
+    assert comparison["list_objects"]["status"] == "unchanged"
+
+
+@pytest.mark.benchmarks_regression
+@pytest.mark.compare_runs
+@pytest.mark.parametrize("current_values,expected_status", [
+    ([70, 71, 69, 70, 70], "regression"),
+    ([98, 99, 101, 100, 102], "unchanged"),
+    ([130, 131, 129, 130, 130], "improvement")
+])
+def test_compare_runs_flags_changes_beyond_tolerance_and_noise(
+    current_values, expected_status
+):
+    """
+    G: Given that benchmark repeats are stable
+    W: When the function compare_runs() is called
+    T: Then drops and gains beyond the tolerance must be flagged
+    """
+
+    baseline = {"read_objects": summarize([100, 101, 99, 100, 100])}
+    current = {"read_objects": summarize(current_values)}
+
+    comparison = compare_runs(baseline, current, tolerance=0.1)
+
+    assert comparison["read_objects"]["status"] == expected_status
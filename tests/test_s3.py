@@ -8,14 +8,43 @@ ___
 
 # Importing libraries
 import pytest
-from moto import mock_s3
+from moto import mock_cloudwatch, mock_s3
 import pandas as pd
+import pyarrow as pa
+
+import fnmatch
+import gzip
+import io
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from cloudgeass.aws.s3 import MULTIPART_MIN_PART_SIZE
+from cloudgeass.testing.backends import (
+    StubBucket,
+    StubS3Backend,
+    SyntheticBucket
+)
+from cloudgeass.testing.data import (
+    fake_dataframe,
+    fake_payload,
+    partitioned_keys
+)
+from cloudgeass.utils.compression import compress_bytes
+from cloudgeass.utils.tracing import RecordingTracer, set_tracer
 
+from tests.helpers.storage_metrics import put_storage_metrics
+from tests.helpers.throttling import slow_down_error, slow_down_response
 from tests.helpers.user_inputs import (
     MOCKED_BUCKET_CONTENT,
+    MOCKED_UPLOAD_BODY,
+    MOCKED_MULTIPART_UPLOAD_BODY,
     NON_EMPTY_BUCKET_NAME,
     EMPTY_BUCKET_NAME,
     EXPECTED_OBJECTS_REPORT_COLS,
+    MOCKED_REGION,
     PARTITIONED_S3_TABLES
 )
 
@@ -147,6 +176,66 @@ def test_bucket_objects_report_method_returns_none_when_called_on_empty_bucket(
     assert s3.bucket_objects_report(EMPTY_BUCKET_NAME) is None
 
 
+@pytest.mark.s3
+@pytest.mark.bucket_objects_report
+@mock_s3
+def test_bucket_objects_report_includes_objects_from_all_listing_pages(
+    s3, prepare_mocked_bucket
+):
+    """
+    G: Given that users want to retrieve information about objects in a bucket
+       with more objects than a single list_objects_v2 page holds
+    W: When the method buckets_objects_report() from S3Client class is called
+    T: Then the DataFrame must have one row for each object in the bucket
+    """
+
+    # Preparing a mocked s3 environment with buckets and files
+    prepare_mocked_bucket()
+
+    # Putting more objects than the 1000 objects returned by a single page
+    for i in range(1001):
+        s3.client.put_object(Bucket=EMPTY_BUCKET_NAME, Key=f"many/{i:04d}.csv",
+                             Body=b"")
+
+    df_objects_report = s3.bucket_objects_report(EMPTY_BUCKET_NAME)
+
+    assert len(df_objects_report) == 1001
+
+
+@pytest.mark.s3
+@pytest.mark.bucket_objects_report
+@pytest.mark.thread_safety
+def test_bucket_objects_report_called_by_64_threads_at_once():
+    """
+    G: Given that users share a single S3Client object across many threads
+    W: When 64 threads call the method bucket_objects_report() at once for
+       different buckets and prefixes
+    T: Then every thread must get the complete and correct report of its
+       own bucket and prefix
+    """
+
+    # Serving buckets with objects in many date partitions
+    buckets = [SyntheticBucket(f"bucket-{i}", n_keys=1000 + 100 * i)
+               for i in range(8)]
+    s3 = StubS3Backend(buckets).s3_client()
+    barrier = threading.Barrier(64)
+
+    def get_report(i: int) -> tuple:
+        bucket = buckets[i % 8]
+        prefix = "table/anomesdia=200001" if i % 2 else ""
+        barrier.wait()
+        df_report = s3.bucket_objects_report(bucket.name, prefix=prefix)
+        expected_keys = [key for key in bucket if key.startswith(prefix)]
+        return list(df_report["Key"]), expected_keys, set(df_report["BucketName"])
+
+    with ThreadPoolExecutor(64) as executor:
+        results = list(executor.map(get_report, range(64)))
+
+    for i, (keys, expected_keys, bucket_names) in enumerate(results):
+        assert keys == expected_keys
+        assert bucket_names == {buckets[i % 8].name}
+
+
 @pytest.mark.s3
 @pytest.mark.all_buckets_objects_report
 @mock_s3
@@ -192,6 +281,318 @@ def test_all_buckets_objects_report_has_more_rows_than_single_bucket_report(
     assert len(df_all_buckets_report) > len(df_bucket_report)
 
 
+@pytest.mark.s3
+@pytest.mark.all_buckets_objects_report
+def test_all_buckets_objects_report_with_max_memory_spills_the_same_rows(
+    tmp_path
+):
+    """
+    G: Given that users want to retrieve a report of all objects from all S3
+       buckets within an account under a memory budget
+    W: When the method all_buckets_objects_report() is called with a
+       max_memory smaller than the report
+    T: Then batches must be spilled to disk, temporary files must be removed
+       and the returned pyarrow Table must hold the same rows (in the same
+       order) of the DataFrame report
+    """
+
+    # Serving buckets with thousands of objects by a stubbed backend
+    s3 = StubS3Backend(
+        [SyntheticBucket(f"bucket-{i}", n_keys=2500 + i) for i in range(3)]
+    ).s3_client()
+
+    df_report = s3.all_buckets_objects_report()
+    table_report = s3.all_buckets_objects_report(max_memory=64 * 1024,
+                                                 spill_dir=str(tmp_path))
+
+    assert isinstance(table_report, pa.Table)
+    assert table_report.column_names == EXPECTED_OBJECTS_REPORT_COLS
+    assert table_report.column("Key").to_pylist() == list(df_report["Key"])
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.s3
+@pytest.mark.all_buckets_objects_report
+@pytest.mark.load_report
+def test_all_buckets_objects_report_is_loaded_from_its_cache_file(tmp_path):
+    """
+    G: Given that a report of all objects from all S3 buckets was saved on a
+       cache file by all_buckets_objects_report()
+    W: When the method all_buckets_objects_report() is called again with the
+       same cache_path
+    T: Then an equal DataFrame must be loaded from the file without making
+       any call to S3
+    """
+
+    backend = StubS3Backend(
+        [SyntheticBucket(f"bucket-{i}", n_keys=1500) for i in range(2)]
+    )
+    s3 = backend.s3_client()
+    cache_path = str(tmp_path / "report.arrow")
+
+    df_report = s3.all_buckets_objects_report(cache_path=cache_path)
+    calls = backend.calls
+    df_cached_report = s3.all_buckets_objects_report(cache_path=cache_path)
+
+    assert backend.calls == calls
+    pd.testing.assert_frame_equal(df_cached_report, df_report)
+
+
+@pytest.mark.s3
+@pytest.mark.bucket_objects_report
+@pytest.mark.load_report
+def test_bucket_objects_report_with_refresh_cache_rebuilds_the_cache_file(
+    tmp_path
+):
+    """
+    G: Given that a bucket report was saved on a cache file and new objects
+       were added to the bucket later
+    W: When the method bucket_objects_report() is called with
+       refresh_cache=True
+    T: Then the report must be built again and the cache file replaced
+    """
+
+    bucket = SyntheticBucket("bucket", n_keys=100)
+    s3 = StubS3Backend([bucket]).s3_client()
+    cache_path = str(tmp_path / "report.arrow")
+
+    _ = s3.bucket_objects_report("bucket", cache_path=cache_path)
+    bucket.n_keys = 200
+    df_report = s3.bucket_objects_report("bucket", cache_path=cache_path,
+                                         refresh_cache=True)
+
+    assert len(df_report) == 200
+    assert len(s3.load_report(cache_path)) == 200
+
+
+@pytest.mark.s3
+@pytest.mark.distributed_objects_report
+@pytest.mark.parametrize("prefix", ["", "orders/"])
+def test_distributed_objects_report_lists_the_same_keys_of_a_single_process(
+    prefix
+):
+    """
+    G: Given that users want to list a huge bucket with many processes
+    W: When the method distributed_objects_report() is called
+    T: Then the returned pyarrow Table must hold the same keys (in the same
+       order) of the report built by bucket_objects_report()
+    """
+
+    # Serving a bucket with many tables by a stubbed backend
+    keys = sorted(
+        str(key) for table in ["customers/", "orders/", "sales/"]
+        for key in partitioned_keys(n_keys=3000, table_prefix=table)
+    )
+    backend = StubS3Backend([StubBucket("tables", keys)])
+    s3 = backend.s3_client()
+
+    df_report = s3.bucket_objects_report("tables", prefix=prefix)
+    table_report = s3.distributed_objects_report(
+        bucket_name="tables",
+        prefix=prefix,
+        processes=2,
+        client_factory=backend.create_client
+    )
+
+    assert table_report.column_names == EXPECTED_OBJECTS_REPORT_COLS
+    assert table_report.column("Key").to_pylist() == list(df_report["Key"])
+
+
+@pytest.mark.s3
+@pytest.mark.distributed_objects_report
+@pytest.mark.key_pattern
+def test_distributed_objects_report_with_a_pattern_lists_matching_keys():
+    """
+    G: Given that users want to list only some keys of a huge bucket with
+       many processes
+    W: When the method distributed_objects_report() is called with a glob
+    T: Then the returned pyarrow Table must hold the same keys of the
+       report built by bucket_objects_report() with the same glob
+    """
+
+    backend = StubS3Backend([SyntheticBucket("tables", n_keys=20000)])
+    s3 = backend.s3_client()
+    pattern = "table/anomesdia=2000*/part-0000[0-4].parquet"
+
+    df_report = s3.bucket_objects_report("tables", pattern=pattern)
+    table_report = s3.distributed_objects_report(
+        bucket_name="tables",
+        processes=2,
+        client_factory=backend.create_client,
+        pattern=pattern
+    )
+
+    assert len(df_report) == 5 * 200
+    assert table_report.column("Key").to_pylist() == list(df_report["Key"])
+
+
+@pytest.mark.s3
+@pytest.mark.bucket_objects_report
+@pytest.mark.key_pattern
+@pytest.mark.parametrize("pattern,n_calls", [
+    ("table/anomesdia=200001*.parquet", 4),
+    (re.compile(r"^table/anomesdia=2000010[1-3]/part-0000[0-4]"), 1),
+    ("*/part-00042.parquet", 100)
+])
+def test_bucket_objects_report_only_lists_the_literal_prefix_of_a_pattern(
+    pattern, n_calls
+):
+    """
+    G: Given that users want a report of keys matching a glob or a regex
+    W: When the method bucket_objects_report() is called with a pattern
+    T: Then the report must hold every matching key and only keys under
+       the literal prefix of the pattern must be listed
+    """
+
+    bucket = SyntheticBucket("bucket", n_keys=100000)
+    backend = StubS3Backend([bucket])
+    s3 = backend.s3_client()
+
+    df_report = s3.bucket_objects_report("bucket", pattern=pattern)
+
+    key_pattern = pattern if isinstance(pattern, re.Pattern) \
+        else re.compile(fnmatch.translate(pattern))
+
+    assert list(df_report["Key"]) == \
+        [key for key in bucket if key_pattern.match(key)]
+    assert backend.calls == n_calls
+
+
+@pytest.mark.s3
+@pytest.mark.all_buckets_objects_report
+@pytest.mark.key_pattern
+def test_all_buckets_objects_report_with_a_pattern_under_a_memory_budget(
+    tmp_path
+):
+    """
+    G: Given that users want a report of keys matching a glob on all
+       buckets under a memory budget
+    W: When the method all_buckets_objects_report() is called with a pattern
+       and max_memory
+    T: Then the returned pyarrow Table must hold the same keys of the
+       DataFrame report built with the same pattern
+    """
+
+    s3 = StubS3Backend(
+        [SyntheticBucket(f"bucket-{i}", n_keys=3000 + i) for i in range(3)]
+    ).s3_client()
+    pattern = "table/anomesdia=2000010[1-5]/*"
+
+    df_report = s3.all_buckets_objects_report(pattern=pattern)
+    table_report = s3.all_buckets_objects_report(pattern=pattern,
+                                                 max_memory=64 * 1024,
+                                                 spill_dir=str(tmp_path))
+
+    assert len(df_report) == 3 * 500
+    assert table_report.column("Key").to_pylist() == list(df_report["Key"])
+
+
+@pytest.mark.s3
+@pytest.mark.all_buckets_objects_report
+def test_all_buckets_objects_report_retries_only_the_throttled_page(
+    tmp_path
+):
+    """
+    G: Given that S3 throttles the second listing page of a bucket
+    W: When the method all_buckets_objects_report() is called with and
+       without max_memory
+    T: Then only the throttled page must be listed again, so both reports
+       must hold every key exactly once and no temporary file must be left
+       behind
+    """
+
+    bucket = SyntheticBucket("bucket", n_keys=1500)
+    s3 = StubS3Backend([bucket]).s3_client()
+    keys = [bucket.object_summary(i)["Key"] for i in range(1500)]
+
+    # Throttling the second page of each report once
+    calls = {"count": 0}
+
+    def inject_throttle(**kwargs):
+        calls["count"] += 1
+        if calls["count"] in (2, 5):
+            raise slow_down_error("ListObjectsV2")
+
+    s3.client.meta.events.register_first("before-call.s3.ListObjectsV2",
+                                         inject_throttle)
+
+    df_report = s3.all_buckets_objects_report()
+    table_report = s3.all_buckets_objects_report(max_memory=1024,
+                                                 spill_dir=str(tmp_path))
+
+    assert calls["count"] == 6
+    assert list(df_report["Key"]) == keys
+    assert table_report.column("Key").to_pylist() == keys
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.s3
+@pytest.mark.bucket_objects_report
+@mock_s3
+def test_limiter_sees_throttles_retried_by_botocore(
+    s3, prepare_mocked_bucket
+):
+    """
+    G: Given that botocore retries a listing page throttled by S3
+    W: When the method bucket_objects_report() is called
+    T: Then the limiter must record the throttle while botocore retries it,
+       without retrying the call again by itself
+    """
+
+    prepare_mocked_bucket()
+
+    # Answering the first attempt of the listing with a 503 SlowDown
+    calls = Counter()
+
+    def count_call(**kwargs):
+        calls["calls"] += 1
+
+    def inject_throttle(request, **kwargs):
+        calls["attempts"] += 1
+        if calls["attempts"] == 1:
+            return slow_down_response(request.url)
+
+    s3.client.meta.events.register("before-call.s3.ListObjectsV2",
+                                   count_call)
+    s3.client.meta.events.register_first("before-send.s3.ListObjectsV2",
+                                         inject_throttle)
+    try:
+        df_report = s3.bucket_objects_report(NON_EMPTY_BUCKET_NAME)
+    finally:
+        s3.client.meta.events.unregister("before-call.s3.ListObjectsV2",
+                                         count_call)
+        s3.client.meta.events.unregister("before-send.s3.ListObjectsV2",
+                                         inject_throttle)
+
+    throttles = sum(key_stats["throttles"]
+                    for key_stats in s3.limiter.stats().values())
+
+    assert len(df_report) == len(MOCKED_BUCKET_CONTENT[NON_EMPTY_BUCKET_NAME])
+    assert calls == {"calls": 1, "attempts": 2}
+    assert throttles == 1
+
+
+@pytest.mark.s3
+@pytest.mark.bucket_objects_report
+@pytest.mark.key_pattern
+def test_bucket_objects_report_with_a_pattern_out_of_the_prefix_is_empty():
+    """
+    G: Given that users want a report of keys matching a glob
+    W: When the method bucket_objects_report() is called with a prefix that
+       no key matching the glob can start with
+    T: Then None must be returned without making any listing call
+    """
+
+    backend = StubS3Backend([SyntheticBucket("bucket", n_keys=1000)])
+    s3 = backend.s3_client()
+
+    df_report = s3.bucket_objects_report("bucket", prefix="json/",
+                                         pattern="table/*")
+
+    assert df_report is None
+    assert backend.calls == 0
+
+
 @pytest.mark.s3
 @pytest.mark.get_date_partition_value_from_prefix
 @mock_s3
@@ -423,3 +824,913 @@ def test_get_last_date_partition_method_returns_last_partition_in_monthlybasis(
     ]["expected_partition"]
 
     assert last_partition == expected_partition
+
+
+@pytest.mark.s3
+@pytest.mark.get_last_date_partition
+def test_error_on_getting_the_last_date_partition_of_an_empty_prefix():
+    """
+    G: Given that users want the last date partition of a table
+    W: When the method get_last_date_partition() is called with a prefix
+       without objects
+    T: Then a ValueError must be raised
+    """
+
+    s3 = StubS3Backend([SyntheticBucket("bucket", n_keys=10)]).s3_client()
+
+    with pytest.raises(ValueError, match="There are no objects"):
+        s3.get_last_date_partition(bucket_name="bucket",
+                                   table_prefix="no-such-table/")
+
+
+@pytest.mark.s3
+@pytest.mark.upload_object
+@mock_s3
+def test_upload_object_with_gzip_compression_sets_content_encoding(
+    s3, prepare_mocked_bucket
+):
+    """
+    G: Given that users want to upload a compressed object to S3
+    W: When the method upload_object() is called with compression="gzip"
+    T: Then the stored object must have the ContentEncoding metadata set as
+       gzip and its raw content must be smaller than the original body
+    """
+
+    # Preparing a mocked s3 environment with buckets and files
+    prepare_mocked_bucket()
+
+    # Uploading a compressed object
+    s3.upload_object(
+        bucket_name=NON_EMPTY_BUCKET_NAME,
+        key="uploads/file.csv",
+        body=MOCKED_UPLOAD_BODY,
+        compression="gzip"
+    )
+
+    # Reading object metadata and raw content
+    response = s3.client.get_object(
+        Bucket=NON_EMPTY_BUCKET_NAME,
+        Key="uploads/file.csv"
+    )
+
+    assert response["ContentEncoding"] == "gzip"
+    assert len(response["Body"].read()) < len(MOCKED_UPLOAD_BODY)
+
+
+@pytest.mark.s3
+@pytest.mark.upload_object
+@pytest.mark.read_object
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+@mock_s3
+def test_read_object_returns_the_original_body_of_a_multipart_upload(
+    s3, prepare_mocked_bucket, compression
+):
+    """
+    G: Given that users uploaded a large object with upload_object() using
+       parallel compression and multipart upload
+    W: When the method read_object() is called
+    T: Then the returned content must be equal to the original body
+    """
+
+    # Preparing a mocked s3 environment with buckets and files
+    prepare_mocked_bucket()
+
+    # Uploading a large object in multiple parts
+    s3.upload_object(
+        bucket_name=NON_EMPTY_BUCKET_NAME,
+        key="uploads/large-file.bin",
+        body=io.BytesIO(MOCKED_MULTIPART_UPLOAD_BODY),
+        compression=compression,
+        part_size=MULTIPART_MIN_PART_SIZE
+    )
+
+    content = s3.read_object(
+        bucket_name=NON_EMPTY_BUCKET_NAME,
+        key="uploads/large-file.bin"
+    )
+
+    assert content == MOCKED_MULTIPART_UPLOAD_BODY
+
+
+@pytest.mark.s3
+@pytest.mark.read_object
+def test_read_object_decodes_stacked_codings_from_the_last_applied():
+    """
+    G: Given that an object was compressed with gzip and then with zstd, as
+       told by its Content-Encoding "gzip, zstd"
+    W: When the method read_object() is called
+    T: Then the zstd coding must be decoded before the gzip one and the
+       original body must be returned
+    """
+
+    body = compress_bytes(gzip.compress(MOCKED_UPLOAD_BODY), "zstd")
+    backend = StubS3Backend([])
+    backend.put_body("bucket", "stacked.csv", body,
+                     content_encoding="gzip, zstd")
+    s3 = backend.s3_client()
+
+    assert s3.read_object("bucket", "stacked.csv") == MOCKED_UPLOAD_BODY
+    assert s3.read_object("bucket", "stacked.csv", decompress=False) == body
+
+
+@pytest.mark.s3
+@pytest.mark.upload_object
+@mock_s3
+def test_error_on_trying_to_upload_an_object_with_an_invalid_compression(
+    s3, prepare_mocked_bucket
+):
+    """
+    G: Given that users want to upload a compressed object to S3
+    W: When the method upload_object() is called with an unsupported
+       compression codec
+    T: Then a ValueError exception must be thrown
+    """
+
+    # Preparing a mocked s3 environment with buckets and files
+    prepare_mocked_bucket()
+
+    with pytest.raises(ValueError):
+        s3.upload_object(
+            bucket_name=NON_EMPTY_BUCKET_NAME,
+            key="uploads/file.csv",
+            body=MOCKED_UPLOAD_BODY,
+            compression="brotli"
+        )
+
+
+@pytest.mark.s3
+@pytest.mark.read_objects
+@mock_s3
+def test_read_objects_returns_all_contents_even_when_s3_throttles_calls(
+    s3, prepare_mocked_bucket
+):
+    """
+    G: Given that users want to read many objects under a hot prefix
+    W: When the method read_objects() is called and S3 answers some calls
+       with 503 SlowDown responses
+    T: Then the content of every object must be returned and the limiter
+       must have registered the throttled calls
+    """
+
+    # Preparing a mocked s3 environment with buckets and files
+    prepare_mocked_bucket()
+
+    # Injecting a SlowDown response on every third GetObject call
+    calls = {"count": 0}
+
+    def inject_throttle(**kwargs):
+        calls["count"] += 1
+        if calls["count"] % 3 == 0:
+            raise slow_down_error()
+
+    bucket_content = MOCKED_BUCKET_CONTENT[NON_EMPTY_BUCKET_NAME].values()
+    keys = [content["Key"] for content in bucket_content]
+
+    s3.client.meta.events.register("before-call.s3.GetObject",
+                                   inject_throttle)
+    try:
+        contents = s3.read_objects(bucket_name=NON_EMPTY_BUCKET_NAME,
+                                   keys=keys)
+    finally:
+        s3.client.meta.events.unregister("before-call.s3.GetObject",
+                                         inject_throttle)
+
+    throttles = sum(key_stats["throttles"]
+                    for key_stats in s3.limiter.stats().values())
+
+    assert contents == {c["Key"]: c["Body"] for c in bucket_content}
+    assert throttles > 0
+
+
+@pytest.mark.s3
+@pytest.mark.estimate_bucket_stats
+def test_estimate_bucket_stats_is_exact_on_a_bucket_listed_in_one_call():
+    """
+    G: Given that users want to estimate the size of a small bucket
+    W: When the method estimate_bucket_stats() is called on a bucket with
+       fewer keys than max_keys
+    T: Then exact stats must be returned after a single listing call
+    """
+
+    bucket = SyntheticBucket("small-bucket", n_keys=80)
+    backend = StubS3Backend([bucket])
+    stats = backend.s3_client().estimate_bucket_stats(bucket.name)
+
+    sizes = [bucket.object_summary(i)["Size"] for i in range(len(bucket))]
+
+    assert stats["Exact"]
+    assert stats["Requests"] == 1
+    assert stats["Objects"] == {"Estimate": 80, "Low": 80, "High": 80}
+    assert stats["Size"]["Estimate"] == sum(sizes)
+    assert stats["ObjectTypes"] == {"parquet": stats["Objects"]}
+
+
+@pytest.mark.s3
+@pytest.mark.estimate_bucket_stats
+@pytest.mark.distributed_objects_report
+def test_listing_probes_retry_throttled_calls_within_the_limiter():
+    """
+    G: Given that S3 throttles the first listing probe of a bucket
+    W: When the method estimate_bucket_stats() is called and keys are
+       sampled to split a distributed listing
+    T: Then the throttled probes must be retried by the limiter of the
+       bucket prefix, which must record each throttle
+    """
+
+    bucket = SyntheticBucket("bucket", n_keys=80)
+    s3 = StubS3Backend([bucket]).s3_client()
+
+    # Throttling the first call of each feature once
+    calls = {"count": 0}
+
+    def inject_throttle(**kwargs):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            raise slow_down_error("ListObjectsV2")
+
+    s3.client.meta.events.register_first("before-call.s3.ListObjectsV2",
+                                         inject_throttle)
+
+    stats = s3.estimate_bucket_stats(bucket.name)
+    calls["count"] = 0
+    boundaries = s3._sample_key_boundaries(bucket.name, prefix="table/",
+                                           n_boundaries=4)
+
+    assert stats["Exact"]
+    assert stats["Objects"]["Estimate"] == 80
+    assert boundaries == sorted(boundaries) and len(boundaries) == 4
+    assert s3.limiter.stats()["bucket/"]["throttles"] == 1
+    assert s3.limiter.stats()["bucket/table"]["throttles"] == 1
+
+
+@pytest.mark.s3
+@pytest.mark.estimate_bucket_stats
+def test_estimate_bucket_stats_of_a_huge_bucket_stays_within_max_requests():
+    """
+    G: Given that users want to estimate the size of a huge bucket
+    W: When the method estimate_bucket_stats() is called on a bucket with
+       1M keys and a budget of listing calls
+    T: Then the estimated number of objects must be close to the real one,
+       inside its confidence interval, and no more listing calls than the
+       budget must be made
+    """
+
+    s3 = StubS3Backend([SyntheticBucket("huge-bucket", n_keys=10 ** 6)]) \
+        .s3_client()
+    stats = s3.estimate_bucket_stats("huge-bucket", max_requests=1000,
+                                     seed=42)
+
+    objects = stats["Objects"]
+
+    assert not stats["Exact"]
+    assert stats["Requests"] <= 1000
+    assert stats["Samples"] > 1
+    assert objects["Low"] <= 10 ** 6 <= objects["High"]
+    assert abs(objects["Estimate"] / 10 ** 6 - 1) < 0.25
+    assert set(stats["SizeDistribution"]) <= {"B", "KB", "MB", "GB", "TB"}
+    assert list(stats["ObjectTypes"]) == ["parquet"]
+
+
+@pytest.mark.s3
+@pytest.mark.buckets_storage_report
+@mock_cloudwatch
+@mock_s3
+def test_buckets_storage_report_matches_the_content_of_buckets(
+    s3, prepare_mocked_bucket
+):
+    """
+    G: Given that users want the size of all buckets without listing them
+    W: When the method buckets_storage_report() is called on buckets whose
+       storage metrics are published on CloudWatch
+    T: Then the object count of each bucket must be read from CloudWatch
+       and match the content of the bucket, with its size summed over the
+       storage types
+    """
+
+    # Preparing a mocked s3 environment with buckets and files
+    prepare_mocked_bucket()
+
+    df_storage = s3.buckets_storage_report().set_index("BucketName")
+
+    assert list(df_storage.columns) == [
+        "Region", "Objects", "Size", "SizeFormatted", "StorageTypes",
+        "Timestamp", "Source"
+    ]
+    assert set(df_storage["Source"]) == {"CloudWatch"}
+    assert list(df_storage["Size"]) == \
+        [sum(sizes.values()) for sizes in df_storage["StorageTypes"]]
+    assert df_storage["Objects"].to_dict() == {
+        bucket_name: len(bucket_content)
+        for bucket_name, bucket_content in MOCKED_BUCKET_CONTENT.items()
+    }
+
+
+@pytest.mark.s3
+@pytest.mark.buckets_storage_report
+@mock_cloudwatch
+def test_buckets_storage_report_lists_buckets_without_storage_metrics():
+    """
+    G: Given that users want the size of buckets and only some of them have
+       storage metrics on CloudWatch
+    W: When the method buckets_storage_report() is called with and without
+       the listing fallback
+    T: Then the last datapoints of buckets with metrics must be used, while
+       the other buckets must be listed or left out of the report
+    """
+
+    backend = StubS3Backend([SyntheticBucket("bucket-metrics", n_keys=10),
+                             SyntheticBucket("bucket-new", n_keys=2500)])
+    s3 = backend.s3_client(region_name=MOCKED_REGION)
+
+    # Publishing metrics that don't match the stubbed bucket content
+    sizes = {"StandardStorage": 3 * 1024 ** 4, "GlacierStorage": 1024 ** 4}
+    put_storage_metrics("bucket-metrics", n_objects=10, sizes={},
+                        region_name=MOCKED_REGION, days_ago=2)
+    put_storage_metrics("bucket-metrics", n_objects=40 * 10 ** 6,
+                        sizes=sizes, region_name=MOCKED_REGION)
+
+    df_storage = s3.buckets_storage_report().set_index("BucketName")
+    df_metrics_only = s3.buckets_storage_report(fallback=False)
+
+    bucket = backend.buckets["bucket-new"]
+    expected_size = sum(bucket.object_summary(i)["Size"]
+                        for i in range(len(bucket)))
+
+    assert df_storage["Source"].to_dict() == {
+        "bucket-metrics": "CloudWatch",
+        "bucket-new": "Listing"
+    }
+    assert df_storage.loc["bucket-metrics", "Objects"] == 40 * 10 ** 6
+    assert df_storage.loc["bucket-metrics", "Size"] == 4 * 1024 ** 4
+    assert df_storage.loc["bucket-metrics", "SizeFormatted"] == "4.00 TB"
+    assert df_storage.loc["bucket-metrics", "StorageTypes"] == sizes
+    assert df_storage.loc["bucket-new", "Objects"] == 2500
+    assert df_storage.loc["bucket-new", "StorageTypes"] == \
+        {"StandardStorage": expected_size}
+    assert list(df_metrics_only["BucketName"]) == ["bucket-metrics"]
+
+
+@pytest.mark.s3
+@pytest.mark.buckets_storage_report
+@mock_cloudwatch
+def test_buckets_storage_report_reads_metrics_from_the_region_of_buckets():
+    """
+    G: Given that users want the size of buckets in two regions with a S3
+       client set up with a custom endpoint URL
+    W: When the method buckets_storage_report() is called without regions
+    T: Then the metrics of each bucket must be read from CloudWatch in the
+       region of the bucket, with clients that don't use the S3 endpoint
+    """
+
+    backend = StubS3Backend([SyntheticBucket("bucket-us", n_keys=10),
+                             SyntheticBucket("bucket-sa", n_keys=10)])
+    backend.buckets["bucket-sa"].region = "sa-east-1"
+    s3 = backend.s3_client(region_name=MOCKED_REGION,
+                           endpoint_url="http://localhost:9000")
+
+    # Metrics of a bucket are only published in its own region
+    put_storage_metrics("bucket-us", n_objects=10,
+                        sizes={"StandardStorage": 1024},
+                        region_name=MOCKED_REGION)
+    put_storage_metrics("bucket-sa", n_objects=20,
+                        sizes={"StandardStorage": 2048},
+                        region_name="sa-east-1")
+
+    df_storage = s3.buckets_storage_report(fallback=False)\
+        .set_index("BucketName")
+
+    assert df_storage["Region"].to_dict() == {
+        "bucket-us": MOCKED_REGION,
+        "bucket-sa": "sa-east-1"
+    }
+    assert df_storage["Objects"].to_dict() == {
+        "bucket-us": 10,
+        "bucket-sa": 20
+    }
+    assert set(df_storage["Source"]) == {"CloudWatch"}
+
+
+@pytest.mark.s3
+@pytest.mark.select
+def test_select_returns_the_records_of_a_gzip_csv_streamed_in_many_events():
+    """
+    G: Given that users want a few rows of a compressed CSV object
+    W: When the method select() is called and records arrive split between
+       small Records events
+    T: Then a DataFrame with the selected columns of the matching rows
+       must be returned
+    """
+
+    df_fake = fake_dataframe(n_rows=500, columns=["id", "name", "email"])
+    backend = StubS3Backend([])
+    backend.put_body("bucket", "users/users.csv.gz",
+                     gzip.compress(fake_payload(format="csv", n_rows=500,
+                                                columns=["id", "name",
+                                                         "email"])))
+    s3 = backend.s3_client()
+
+    df_select = s3.select(
+        bucket_name="bucket",
+        key="users/users.csv.gz",
+        sql="SELECT s.id, s.email FROM S3Object s WHERE s.name >= '8'"
+    )
+
+    expected = df_fake.loc[df_fake["name"] >= "8", ["id", "email"]]
+    pd.testing.assert_frame_equal(df_select,
+                                  expected.reset_index(drop=True))
+
+
+@pytest.mark.s3
+@pytest.mark.select
+def test_select_as_batches_decodes_records_as_they_arrive():
+    """
+    G: Given that users want to process the records of a big object as they
+       arrive
+    W: When the method select() is called with as_batches=True and a small
+       batch_size
+    T: Then many DataFrames must be yielded, holding every selected record
+       in order
+    """
+
+    df_fake = fake_dataframe(n_rows=300, columns=["id", "name"])
+    backend = StubS3Backend([])
+    backend.put_body("bucket", "users/users.json",
+                     df_fake.to_json(orient="records", lines=True).encode())
+    s3 = backend.s3_client()
+
+    batches = list(s3.select(
+        bucket_name="bucket",
+        key="users/users.json",
+        sql="SELECT * FROM S3Object s",
+        input_format="json",
+        as_batches=True,
+        batch_size=1024
+    ))
+
+    assert len(batches) > 5
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True),
+                                  df_fake)
+
+
+@pytest.mark.s3
+@pytest.mark.select
+def test_select_as_batches_span_lasts_until_batches_are_consumed():
+    """
+    G: Given that a RecordingTracer is the active tracer
+    W: When the method select() is called with as_batches=True
+    T: Then the select span must only be finished once every batch was
+       yielded, instead of when the generator is returned
+    """
+
+    backend = StubS3Backend([])
+    backend.put_body("bucket", "users.csv", b"id\n1\n2\n")
+    s3 = backend.s3_client()
+
+    tracer = set_tracer(RecordingTracer())
+    try:
+        batches = s3.select("bucket", "users.csv", "SELECT * FROM S3Object",
+                            as_batches=True)
+        spans_before = [s["name"] for s in tracer.spans]
+        df_select = pd.concat(batches, ignore_index=True)
+
+    finally:
+        set_tracer(None)
+
+    select_span = tracer.spans[-1]
+    children = tracer.children(select_span["span_id"])
+
+    assert spans_before == []
+    assert select_span["name"] == "S3Client.select"
+    assert [c["name"] for c in children] == ["S3Client.select.decode_records"]
+    assert list(df_select["id"]) == ["1", "2"]
+
+
+@pytest.mark.s3
+@pytest.mark.select
+def test_error_when_a_select_event_stream_ends_before_its_end_event():
+    """
+    G: Given that a S3 Select event stream may be cut before it's complete
+    W: When the method select() is called and no End event is received
+    T: Then an IOError must be raised instead of returning partial records
+    """
+
+    backend = StubS3Backend([])
+    backend.put_body("bucket", "users.csv", b"id\n1\n2\n")
+    select_object_content = backend._select_object_content
+
+    def truncated_select(params: dict) -> tuple:
+        status_code, parsed = select_object_content(params)
+        events = [e for e in parsed["Payload"] if "End" not in e]
+        return status_code, {"Payload": iter(events)}
+
+    backend._select_object_content = truncated_select
+    s3 = backend.s3_client()
+
+    with pytest.raises(IOError):
+        s3.select("bucket", "users.csv", "SELECT * FROM S3Object")
+
+
+@pytest.mark.s3
+@pytest.mark.select
+def test_error_when_selecting_records_of_an_invalid_input_format():
+    """
+    G: Given that S3 Select reads CSV, JSON and Parquet objects
+    W: When the method select() is called with another input format
+    T: Then a ValueError must be raised
+    """
+
+    s3 = StubS3Backend([]).s3_client()
+
+    with pytest.raises(ValueError):
+        s3.select("bucket", "users.avro", "SELECT * FROM S3Object",
+                  input_format="avro")
+
+
+@pytest.mark.s3
+@pytest.mark.select_objects
+def test_select_objects_queries_every_parquet_object():
+    """
+    G: Given that users want to filter every file of a Parquet table
+    W: When the method select_objects() is called with many keys
+    T: Then a DataFrame with the matching records of each key must be
+       returned
+    """
+
+    backend = StubS3Backend([])
+    keys = [f"users/part-{i:05d}.parquet" for i in range(8)]
+    for i, key in enumerate(keys):
+        backend.put_body("bucket", key, fake_payload(format="parquet",
+                                                     n_rows=100, seed=i))
+    s3 = backend.s3_client()
+
+    dfs = s3.select_objects(
+        bucket_name="bucket",
+        keys=keys,
+        sql="SELECT s.col1 FROM S3Object s WHERE s.col2 < '4'",
+        input_format="parquet"
+    )
+
+    assert list(dfs) == keys
+    for i, key in enumerate(keys):
+        df_fake = fake_dataframe(n_rows=100, seed=i)
+        assert list(dfs[key]["col1"]) == \
+            list(df_fake.loc[df_fake["col2"] < "4", "col1"])
+
+
+@pytest.fixture
+def prepare_duplicated_objects(s3):
+    # Copies of the same content across buckets and prefixes
+    body = os.urandom(5000)
+    objects = {
+        ("cloudgeass-dup-a", "raw/data.bin"): body,
+        ("cloudgeass-dup-a", "copy/data.bin"): body,
+        ("cloudgeass-dup-b", "backup/data.bin"): body,
+        ("cloudgeass-dup-b", "other.bin"): os.urandom(5000),
+        ("cloudgeass-dup-b", "unique.bin"): os.urandom(4000),
+        ("cloudgeass-dup-a", "raw/"): b"",
+        ("cloudgeass-dup-b", "backup/"): b""
+    }
+
+    def create_objects():
+        for bucket_name in ("cloudgeass-dup-a", "cloudgeass-dup-b"):
+            s3.client.create_bucket(Bucket=bucket_name)
+
+        for (bucket_name, key), content in objects.items():
+            s3.client.put_object(Bucket=bucket_name, Key=key, Body=content)
+
+    return create_objects
+
+
+@pytest.mark.s3
+@pytest.mark.duplicate_objects_report
+@mock_s3
+def test_duplicate_objects_report_groups_copies_across_buckets(
+    s3, prepare_duplicated_objects
+):
+    """
+    G: Given that the same content was copied across buckets and prefixes
+    W: When the method duplicate_objects_report() is called
+    T: Then a single group with every copy and their wasted bytes must be
+       reported, skipping objects of the same size with another ETag and
+       empty folder markers
+    """
+
+    prepare_duplicated_objects()
+
+    df_duplicates = s3.duplicate_objects_report()
+
+    assert list(df_duplicates.columns) == [
+        "Size", "SizeFormatted", "ETag", "Copies", "WastedBytes",
+        "WastedFormatted", "Objects", "Verified"
+    ]
+    assert len(df_duplicates) == 1
+    assert df_duplicates.loc[0, "Copies"] == 3
+    assert df_duplicates.loc[0, "WastedBytes"] == 10000
+    assert df_duplicates.loc[0, "Objects"] == [
+        "s3://cloudgeass-dup-a/copy/data.bin",
+        "s3://cloudgeass-dup-a/raw/data.bin",
+        "s3://cloudgeass-dup-b/backup/data.bin"
+    ]
+    assert not df_duplicates.loc[0, "Verified"]
+
+
+@pytest.mark.s3
+@pytest.mark.duplicate_objects_report
+@mock_s3
+def test_duplicate_objects_report_with_verify_drops_different_contents(
+    s3, prepare_duplicated_objects
+):
+    """
+    G: Given that objects with different contents may share an ETag that
+       isn't a MD5 digest (e.g. objects encrypted with SSE-KMS)
+    W: When the method duplicate_objects_report() is called with verify=True
+    T: Then objects must be grouped by checksums of their content ranges,
+       dropping the object whose content differs
+    """
+
+    prepare_duplicated_objects()
+
+    # Giving the object with a different content the ETag of the copies
+    def share_etags(parsed, **kwargs):
+        etags = {obj["Key"]: obj["ETag"] for obj in parsed.get("Contents", [])}
+        for obj in parsed.get("Contents", []):
+            if obj["Key"] == "other.bin":
+                obj["ETag"] = etags["backup/data.bin"]
+
+    s3.client.meta.events.register("after-call.s3.ListObjectsV2",
+                                   share_etags)
+    try:
+        df_candidates = s3.duplicate_objects_report()
+        df_duplicates = s3.duplicate_objects_report(verify=True,
+                                                    verify_bytes=1000)
+    finally:
+        s3.client.meta.events.unregister("after-call.s3.ListObjectsV2",
+                                         share_etags)
+
+    assert list(df_candidates["Copies"]) == [4]
+    assert list(df_duplicates["Copies"]) == [3]
+    assert "s3://cloudgeass-dup-b/other.bin" not in \
+        df_duplicates.loc[0, "Objects"]
+    assert df_duplicates.loc[0, "Verified"]
+
+
+@pytest.mark.s3
+@pytest.mark.duplicate_objects_report
+@mock_s3
+def test_duplicate_objects_report_verifies_empty_objects_without_reading(
+    s3, prepare_duplicated_objects
+):
+    """
+    G: Given that empty objects have no byte range to be read
+    W: When the method duplicate_objects_report() is called with verify=True
+       and min_size=0
+    T: Then empty objects must be verified as duplicates without any
+       GetObject call
+    """
+
+    prepare_duplicated_objects()
+
+    read_keys = []
+
+    def record_read(params, **kwargs):
+        read_keys.append(params["Key"])
+
+    s3.client.meta.events.register("provide-client-params.s3.GetObject",
+                                   record_read)
+    try:
+        df_duplicates = s3.duplicate_objects_report(min_size=0, verify=True)
+    finally:
+        s3.client.meta.events.unregister("provide-client-params.s3.GetObject",
+                                         record_read)
+
+    df_empty = df_duplicates[df_duplicates["Size"] == 0]
+
+    assert list(df_empty["Objects"]) == [[
+        "s3://cloudgeass-dup-a/raw/",
+        "s3://cloudgeass-dup-b/backup/"
+    ]]
+    assert df_empty["Verified"].all()
+    assert "raw/" not in read_keys and "backup/" not in read_keys
+
+
+@pytest.mark.s3
+@pytest.mark.build_key_index
+def test_build_key_index_lists_a_bucket_once_and_reuses_its_cache(tmp_path):
+    """
+    G: Given that pipelines check whether thousands of keys exist
+    W: When the method build_key_index() is called with a cache path and
+       keys are checked with the method exists() using the index
+    T: Then the bucket must be listed only once, every key must be answered
+       without any other call and the cached index must be reused
+    """
+
+    bucket = SyntheticBucket("indexed-bucket", n_keys=3000)
+    backend = StubS3Backend([bucket])
+    s3 = backend.s3_client()
+    cache_path = str(tmp_path / "indexed-bucket.keyindex")
+
+    index = s3.build_key_index(bucket.name, prefix="table/",
+                               cache_path=cache_path)
+    listing_calls = backend.calls
+
+    existing_keys = [bucket.object_summary(i)["Key"]
+                     for i in range(0, 3000, 30)]
+    missing_keys = [key.replace("part-", "missing-") for key in existing_keys]
+    found = s3.exists(bucket.name, missing_keys + existing_keys, index=index)
+
+    assert listing_calls == 3
+    assert backend.calls == listing_calls
+    assert list(found) == missing_keys + existing_keys
+    assert not any(found[key] for key in missing_keys)
+    assert all(found[key] for key in existing_keys)
+
+    cached_index = s3.build_key_index(bucket.name, prefix="table/",
+                                      cache_path=cache_path)
+
+    assert backend.calls == listing_calls
+    assert len(cached_index) == 3000
+    assert cached_index.covers(bucket.name, existing_keys[0])
+
+
+@pytest.mark.s3
+@pytest.mark.exists
+@mock_s3
+def test_exists_only_requests_keys_the_index_cannot_rule_out(s3):
+    """
+    G: Given that a bucket was indexed with a prefix and then changed
+    W: When the method exists() is called with and without verify=True
+    T: Then keys out of the prefix must be checked with HeadObject calls and
+       only verify=True must see keys deleted after the index was built
+    """
+
+    bucket_name = "cloudgeass-key-index"
+    s3.client.create_bucket(Bucket=bucket_name)
+    for key in ("csv/a.csv", "csv/b.csv", "json/a.json"):
+        s3.client.put_object(Bucket=bucket_name, Key=key, Body=b"x")
+
+    index = s3.build_key_index(bucket_name, prefix="csv/")
+    s3.client.delete_object(Bucket=bucket_name, Key="csv/b.csv")
+
+    keys = ["csv/a.csv", "csv/b.csv", "csv/c.csv", "json/a.json",
+            "json/b.json"]
+
+    assert len(index) == 2
+    assert s3.exists(bucket_name, keys, index=index) == {
+        "csv/a.csv": True, "csv/b.csv": True, "csv/c.csv": False,
+        "json/a.json": True, "json/b.json": False
+    }
+    assert s3.exists(bucket_name, keys, index=index, verify=True) == {
+        "csv/a.csv": True, "csv/b.csv": False, "csv/c.csv": False,
+        "json/a.json": True, "json/b.json": False
+    }
+    assert s3.exists(bucket_name, keys) == \
+        s3.exists(bucket_name, keys, index=index, verify=True)
+
+
+@pytest.fixture
+def count_enrichment_calls(s3):
+    # Counting HeadObject and GetObjectTagging calls made by the client
+    def start_counting() -> Counter:
+        calls = Counter()
+
+        def count_call(model, **kwargs):
+            calls[model.name] += 1
+
+        s3.client.meta.events.register("before-call.s3.HeadObject",
+                                       count_call)
+        s3.client.meta.events.register("before-call.s3.GetObjectTagging",
+                                       count_call)
+        return calls
+
+    return start_counting
+
+
+@pytest.mark.s3
+@pytest.mark.enrich_objects_report
+@mock_s3
+def test_enrich_objects_report_only_fetches_new_or_changed_objects(
+    s3, count_enrichment_calls, tmp_path
+):
+    """
+    G: Given that users want the content type, metadata and tags of objects
+       on reports that are built again and again
+    W: When the method enrich_objects_report() is called with a cache path
+       before and after an object is changed
+    T: Then fields must be added to the report and only the changed object
+       must be fetched again
+    """
+
+    calls = count_enrichment_calls()
+    bucket_name = "cloudgeass-enrichment"
+    s3.client.create_bucket(Bucket=bucket_name)
+    for i in range(5):
+        s3.client.put_object(Bucket=bucket_name, Key=f"csv/file-{i}.csv",
+                             Body=f"col\n{i}\n", ContentType="text/csv",
+                             Metadata={"source": f"job-{i}"},
+                             Tagging=f"layer=raw&index={i}")
+
+    cache_path = str(tmp_path / "enrichment.arrow")
+    df_report = s3.bucket_objects_report(bucket_name)
+    df_enriched = s3.enrich_objects_report(df_report, max_rate=1000,
+                                           cache_path=cache_path)
+
+    assert list(df_enriched.columns) == \
+        EXPECTED_OBJECTS_REPORT_COLS + ["ContentType", "Metadata", "Tags"]
+    assert list(df_enriched["ContentType"]) == ["text/csv"] * 5
+    assert df_enriched.loc[3, "Metadata"] == {"source": "job-3"}
+    assert df_enriched.loc[3, "Tags"] == {"layer": "raw", "index": "3"}
+    assert calls == {"HeadObject": 5, "GetObjectTagging": 5}
+
+    s3.client.put_object(Bucket=bucket_name, Key="csv/file-3.csv",
+                         Body=b"col\nchanged\n", ContentType="text/plain")
+    calls.clear()
+
+    df_enriched = s3.enrich_objects_report(
+        s3.bucket_objects_report(bucket_name), cache_path=cache_path
+    )
+
+    assert calls == {"HeadObject": 1, "GetObjectTagging": 1}
+    assert df_enriched.loc[3, "ContentType"] == "text/plain"
+    assert df_enriched.loc[3, "Tags"] == {}
+    assert df_enriched.loc[4, "Tags"] == {"layer": "raw", "index": "4"}
+
+
+@pytest.mark.s3
+@pytest.mark.enrich_objects_report
+@mock_s3
+def test_enrich_objects_report_caches_fields_fetched_as_none(
+    s3, count_enrichment_calls, tmp_path
+):
+    """
+    G: Given that an object has no content type
+    W: When the method enrich_objects_report() is called twice with the same
+       cache path
+    T: Then its missing content type must be cached as None and no call must
+       be made on the second run
+    """
+
+    calls = count_enrichment_calls()
+    bucket_name = "cloudgeass-enrichment"
+    s3.client.create_bucket(Bucket=bucket_name)
+    s3.client.put_object(Bucket=bucket_name, Key="raw/file.bin", Body=b"1")
+
+    def drop_content_type(parsed, **kwargs):
+        parsed.pop("ContentType", None)
+
+    s3.client.meta.events.register("after-call.s3.HeadObject",
+                                   drop_content_type)
+
+    cache_path = str(tmp_path / "enrichment.arrow")
+    df_report = s3.bucket_objects_report(bucket_name)
+    _ = s3.enrich_objects_report(df_report, cache_path=cache_path)
+    calls.clear()
+
+    df_enriched = s3.enrich_objects_report(df_report, cache_path=cache_path)
+
+    assert calls == {}
+    assert df_enriched.loc[0, "ContentType"] is None
+    assert df_enriched.loc[0, "Metadata"] == {}
+    assert df_enriched.loc[0, "Tags"] == {}
+
+
+@pytest.mark.s3
+@pytest.mark.enrich_objects_report
+@mock_s3
+def test_enrich_objects_report_only_makes_calls_of_the_given_fields(
+    s3, count_enrichment_calls
+):
+    """
+    G: Given that users only want the tags of some rows of a report
+    W: When the method enrich_objects_report() is called with fields=["Tags"]
+       on the selected rows
+    T: Then only GetObjectTagging calls must be made for those rows
+    """
+
+    calls = count_enrichment_calls()
+    s3.client.create_bucket(Bucket="cloudgeass-tags")
+    for key in ("raw/a.csv", "raw/b.json", "trusted/a.parquet"):
+        s3.client.put_object(Bucket="cloudgeass-tags", Key=key, Body=b"x",
+                             Tagging="owner=data-team")
+
+    df_report = s3.bucket_objects_report("cloudgeass-tags")
+    df_raw = df_report[df_report["Key"].str.startswith("raw/")]
+    df_enriched = s3.enrich_objects_report(df_raw, fields=["Tags"])
+
+    assert calls == {"GetObjectTagging": 2}
+    assert list(df_enriched.columns) == EXPECTED_OBJECTS_REPORT_COLS + ["Tags"]
+    assert list(df_enriched["Tags"]) == [{"owner": "data-team"}] * 2
+
+
+@pytest.mark.s3
+@pytest.mark.enrich_objects_report
+def test_error_when_enriching_a_report_with_an_invalid_field(s3):
+    """
+    G: Given that only some fields can be added to objects reports
+    W: When the method enrich_objects_report() is called with another field
+    T: Then a ValueError exception must be raised
+    """
+
+    df_report = pd.DataFrame(columns=EXPECTED_OBJECTS_REPORT_COLS)
+
+    with pytest.raises(ValueError):
+        s3.enrich_objects_report(df_report, fields=["ContentLength"])
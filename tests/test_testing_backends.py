@@ -0,0 +1,134 @@
+"""Test cases for features defined on cloudgeass.testing.backends module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_s3
+
+from cloudgeass.testing.backends import (
+    StubBucket,
+    StubS3Backend,
+    StubSecretsManagerBackend,
+    SyntheticBucket,
+    load_into_moto
+)
+from cloudgeass.testing.data import partitioned_keys
+
+
+@pytest.mark.testing_backends
+@pytest.mark.stub_s3_backend
+def test_stub_backend_serves_all_pages_of_a_synthetic_bucket():
+    """
+    G: Given that users want to test cloudgeass with a large bucket
+    W: When the method bucket_objects_report() is called on a S3Client served
+       by a StubS3Backend with a SyntheticBucket
+    T: Then the report must have all keys, listed in 1000 objects pages
+    """
+
+    backend = StubS3Backend([SyntheticBucket("synthetic", n_keys=2500)])
+    s3 = backend.s3_client()
+
+    df_report = s3.bucket_objects_report(bucket_name="synthetic")
+
+    assert len(df_report) == 2500
+    assert backend.calls == 3
+
+
+@pytest.mark.testing_backends
+@pytest.mark.stub_s3_backend
+def test_stub_backend_filters_keys_by_prefix():
+    """
+    G: Given that users want to test cloudgeass with a large bucket
+    W: When the method get_last_date_partition() is called on a S3Client
+       served by a StubS3Backend with many tables
+    T: Then only the keys of the given table must be considered
+    """
+
+    keys = sorted([
+        *partitioned_keys(300, table_prefix="orders/"),
+        *partitioned_keys(500, table_prefix="sales/")
+    ])
+    s3 = StubS3Backend([StubBucket("tables", keys)]).s3_client()
+
+    last_partition = s3.get_last_date_partition(
+        bucket_name="tables",
+        table_prefix="orders/"
+    )
+
+    assert last_partition == 20000103
+
+
+@pytest.mark.testing_backends
+@pytest.mark.load_into_moto
+@mock_s3
+def test_load_into_moto_creates_objects_visible_to_boto3(s3):
+    """
+    G: Given that users want a mocked bucket with many objects
+    W: When the function load_into_moto() is called
+    T: Then all objects must be listed by S3Client
+    """
+
+    n_objects = load_into_moto("bulk-loaded", partitioned_keys(1500))
+
+    assert n_objects == 1500
+    assert len(s3.bucket_objects_report(bucket_name="bulk-loaded")) == 1500
+
+
+@pytest.mark.testing_backends
+@pytest.mark.stub_s3_backend
+def test_stub_backend_serves_stored_bodies_to_read_objects():
+    """
+    G: Given that users want to test reading objects without AWS
+    W: When the method read_objects() is called on a S3Client served by a
+       StubS3Backend with stored bodies
+    T: Then the content of each stored body must be returned
+    """
+
+    backend = StubS3Backend([])
+    backend.put_body("bodies", "a.csv", b"a")
+    backend.put_body("bodies", "b.csv", b"b")
+    s3 = backend.s3_client()
+
+    contents = s3.read_objects(bucket_name="bodies", keys=["a.csv", "b.csv"])
+
+    assert contents == {"a.csv": b"a", "b.csv": b"b"}
+
+
+@pytest.mark.testing_backends
+@pytest.mark.stub_s3_backend
+def test_stub_backend_rejects_select_expressions_it_cant_run():
+    """
+    G: Given that StubS3Backend only runs a small subset of S3 Select SQL
+    W: When the method select() is called with an expression out of it
+    T: Then a ClientError with a ParseUnsupportedSyntax code must be raised
+    """
+
+    backend = StubS3Backend([])
+    backend.put_body("bodies", "a.csv", b"id,name\n1,a\n")
+    s3 = backend.s3_client()
+
+    with pytest.raises(ClientError) as error:
+        s3.select("bodies", "a.csv", "SELECT COUNT(*) FROM S3Object s "
+                  "GROUP BY s.name")
+
+    assert error.value.response["Error"]["Code"] == "ParseUnsupportedSyntax"
+
+
+@pytest.mark.testing_backends
+@pytest.mark.stub_secrets_manager_backend
+def test_stub_secrets_backend_serves_secret_strings():
+    """
+    G: Given that users want to test secret retrieval without AWS
+    W: When the method get_secret_string() is called on a
+       SecretsManagerClient served by a StubSecretsManagerBackend
+    T: Then the stored secret string must be returned
+    """
+
+    backend = StubSecretsManagerBackend({"my-secret": "s3cr3t"})
+    sm = backend.secrets_client()
+
+    assert sm.get_secret_string("my-secret") == "s3cr3t"
+    assert backend.calls == 1
@@ -0,0 +1,78 @@
+"""Test cases for features defined on cloudgeass.testing.data module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+import pandas as pd
+
+import io
+
+from cloudgeass.testing.data import fake_payload, partitioned_keys
+
+
+@pytest.mark.testing_data
+@pytest.mark.fake_payload
+@pytest.mark.parametrize("format", ["csv", "json", "parquet"])
+def test_fake_payload_generates_files_readable_by_pandas(format):
+    """
+    G: Given that users want large fake files for tests and benchmarks
+    W: When the function fake_payload() is called for a supported format
+    T: Then the payload must be read by pandas with the expected shape
+    """
+
+    payload = fake_payload(format=format, n_rows=1000, columns=["a", "b"])
+
+    readers = {
+        "csv": pd.read_csv,
+        "json": pd.read_json,
+        "parquet": pd.read_parquet
+    }
+    df = readers[format](io.BytesIO(payload))
+
+    assert df.shape == (1000, 2)
+    assert list(df.columns) == ["a", "b"]
+
+
+@pytest.mark.testing_data
+@pytest.mark.fake_payload
+def test_fake_payload_is_reproducible_with_the_same_seed():
+    """
+    G: Given that users want deterministic fixtures
+    W: When the function fake_payload() is called twice with the same seed
+    T: Then both payloads must be equal
+    """
+
+    assert fake_payload(n_rows=100, seed=7) == fake_payload(n_rows=100, seed=7)
+
+
+@pytest.mark.testing_data
+@pytest.mark.fake_payload
+def test_error_on_calling_fake_payload_with_an_invalid_format():
+    """
+    G: Given that users want to generate a fake payload
+    W: When the function fake_payload() is called with an invalid format
+    T: Then a ValueError exception must be raised
+    """
+
+    with pytest.raises(ValueError):
+        _ = fake_payload(format="xlsx")
+
+
+@pytest.mark.testing_data
+@pytest.mark.partitioned_keys
+def test_partitioned_keys_are_sorted_and_split_in_date_partitions():
+    """
+    G: Given that users want keys of a table partitioned by date
+    W: When the function partitioned_keys() is called
+    T: Then keys must be sorted, unique and grouped by date partitions
+    """
+
+    keys = partitioned_keys(n_keys=250, table_prefix="sales/",
+                            files_per_partition=100)
+
+    assert len(keys) == 250
+    assert list(keys) == sorted(set(keys))
+    assert keys[0] == "sales/anomesdia=20000101/part-00000.parquet"
+    assert keys[-1] == "sales/anomesdia=20000103/part-00049.parquet"
@@ -0,0 +1,113 @@
+"""Test cases for features defined on cloudgeass.utils.arrow module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+import pyarrow as pa
+
+from cloudgeass.utils.arrow import SpillBuffer
+
+
+# Schema of the batches used on tests
+SCHEMA = pa.schema([("partition", pa.int64()), ("value", pa.int64())])
+
+
+def make_batch(partition: int, start: int, n_rows: int = 100):
+    return pa.record_batch(
+        [[partition] * n_rows, list(range(start, start + n_rows))],
+        schema=SCHEMA
+    )
+
+
+@pytest.mark.utils_arrow
+@pytest.mark.spill_buffer
+def test_spill_buffer_returns_batches_in_partitions_order(tmp_path):
+    """
+    G: Given that batches of many partitions are added out of order to a
+       SpillBuffer with a budget smaller than the batches
+    W: When the method finish() is called
+    T: Then batches must have been spilled to disk and the returned table
+       must hold all rows ordered by partition (and by arrival within each
+       partition), with no temporary files left behind
+    """
+
+    buffer = SpillBuffer(schema=SCHEMA, max_memory=1024, n_partitions=3,
+                         spill_dir=str(tmp_path))
+    for partition, start in [(2, 0), (0, 0), (1, 0), (0, 100), (2, 100)]:
+        buffer.add(make_batch(partition, start), partition=partition)
+
+    table = buffer.finish()
+
+    assert buffer.spilled_bytes > 0
+    assert table.column("partition").to_pylist() == \
+        [0] * 200 + [1] * 100 + [2] * 200
+    assert table.column("value").to_pylist()[:200] == list(range(200))
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.utils_arrow
+@pytest.mark.spill_buffer
+def test_spill_buffer_without_batches_returns_an_empty_table(tmp_path):
+    """
+    G: Given that no batches were added to a SpillBuffer
+    W: When the method finish() is called
+    T: Then an empty table with the buffer schema must be returned
+    """
+
+    table = SpillBuffer(schema=SCHEMA, max_memory=1024,
+                        spill_dir=str(tmp_path)).finish()
+
+    assert table.num_rows == 0
+    assert table.schema == SCHEMA
+
+
+@pytest.mark.utils_arrow
+@pytest.mark.spill_buffer
+def test_spill_buffer_only_keeps_files_of_open_partitions_open(tmp_path):
+    """
+    G: Given that a SpillBuffer has one partition for each of many buckets
+    W: When each partition is closed after its batches were added
+    T: Then at most one file must be open at a time and the returned table
+       must still hold every batch in partitions order
+    """
+
+    n_partitions = 200
+    buffer = SpillBuffer(schema=SCHEMA, max_memory=0,
+                         n_partitions=n_partitions, spill_dir=str(tmp_path))
+
+    max_open_files = 0
+    for partition in range(n_partitions):
+        buffer.add(make_batch(partition, 0, n_rows=2), partition=partition)
+        max_open_files = max(max_open_files, len(buffer._writers))
+        buffer.close_partition(partition)
+
+    table = buffer.finish()
+
+    assert max_open_files == 1
+    assert table.column("partition").to_pylist() == \
+        [p for p in range(n_partitions) for _ in range(2)]
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.utils_arrow
+@pytest.mark.spill_buffer
+def test_spill_buffer_close_removes_files_of_an_unfinished_buffer(tmp_path):
+    """
+    G: Given that batches were spilled to disk and the build failed
+    W: When the method close() is called instead of finish()
+    T: Then every file must be closed and removed
+    """
+
+    buffer = SpillBuffer(schema=SCHEMA, max_memory=0, n_partitions=2,
+                         spill_dir=str(tmp_path))
+    buffer.add(make_batch(0, 0), partition=0)
+    buffer.add(make_batch(1, 0), partition=1)
+
+    assert len(list(tmp_path.iterdir())) == 1
+
+    buffer.close()
+
+    assert buffer._writers == {}
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,82 @@
+"""Test cases for features defined on cloudgeass.utils.compression module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+
+from cloudgeass.utils.compression import (
+    compress_bytes,
+    decompress_bytes
+)
+
+from tests.helpers.user_inputs import MOCKED_UPLOAD_BODY
+
+
+@pytest.mark.utils_compression
+@pytest.mark.compress_bytes
+@pytest.mark.decompress_bytes
+@pytest.mark.parametrize("content_encoding", ["gzip", "zstd"])
+def test_concatenated_compressed_chunks_are_decompressed_as_a_single_stream(
+    content_encoding
+):
+    """
+    G: Given that a payload was compressed in independent chunks that were
+       concatenated together (as done on parallel compressed uploads)
+    W: When the function decompress_bytes() is called on the whole payload
+    T: Then the original content must be returned
+    """
+
+    # Compressing two halves of the body independently
+    half = len(MOCKED_UPLOAD_BODY) // 2
+    compressed = compress_bytes(MOCKED_UPLOAD_BODY[:half], content_encoding)
+    compressed += compress_bytes(MOCKED_UPLOAD_BODY[half:], content_encoding)
+
+    assert decompress_bytes(compressed, content_encoding) == MOCKED_UPLOAD_BODY
+
+
+@pytest.mark.utils_compression
+@pytest.mark.compress_bytes
+def test_error_on_trying_to_compress_with_an_unsupported_content_encoding():
+    """
+    G: Given that users want to compress a payload
+    W: When the function compress_bytes() is called with an unsupported codec
+    T: Then a ValueError exception must be thrown
+    """
+
+    with pytest.raises(ValueError):
+        _ = compress_bytes(MOCKED_UPLOAD_BODY, "brotli")
+
+
+@pytest.mark.utils_compression
+@pytest.mark.compress_bytes
+def test_compress_bytes_honors_gzip_level_zero():
+    """
+    G: Given that 0 is a valid gzip level, which stores payloads as they are
+    W: When the function compress_bytes() is called with level=0
+    T: Then the payload must be stored uncompressed instead of being
+       compressed with the default level
+    """
+
+    compressed = compress_bytes(MOCKED_UPLOAD_BODY, "gzip", level=0)
+
+    assert MOCKED_UPLOAD_BODY in compressed
+    assert decompress_bytes(compressed, "gzip") == MOCKED_UPLOAD_BODY
+
+
+@pytest.mark.utils_compression
+@pytest.mark.compress_bytes
+def test_gzip_payloads_are_deterministic_for_equal_inputs():
+    """
+    G: Given that equal payloads must produce equal objects
+    W: When the function compress_bytes() is called twice with gzip
+    T: Then both outputs must be equal, with no timestamp on the header
+    """
+
+    first = compress_bytes(MOCKED_UPLOAD_BODY, "gzip")
+    second = compress_bytes(MOCKED_UPLOAD_BODY, "gzip")
+
+    assert first == second
+    assert first[4:8] == b"\x00\x00\x00\x00"
+    assert decompress_bytes(first, "gzip") == MOCKED_UPLOAD_BODY
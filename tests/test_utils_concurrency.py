@@ -0,0 +1,181 @@
+"""Test cases for features defined on cloudgeass.utils.concurrency module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cloudgeass.utils.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    is_throttling_error,
+    limiter_key,
+    record_retried_throttle
+)
+
+from tests.helpers.throttling import ThrottlingStub, slow_down_error
+
+
+@pytest.mark.utils_concurrency
+@pytest.mark.is_throttling_error
+def test_slow_down_client_error_is_recognized_as_a_throttling_error():
+    """
+    G: Given that S3 answered a call with a 503 SlowDown response
+    W: When the function is_throttling_error() is called with the exception
+    T: Then it must return True (and False for regular exceptions)
+    """
+
+    assert is_throttling_error(slow_down_error())
+    assert not is_throttling_error(ValueError("not a throttle"))
+
+
+@pytest.mark.utils_concurrency
+@pytest.mark.limiter_key
+def test_limiter_key_uses_the_bucket_and_the_leading_key_prefix():
+    """
+    G: Given that S3 scales its request rate by key prefix
+    W: When the function limiter_key() is called with an object key
+    T: Then the key must be made of the bucket name and the first key level
+    """
+
+    key = limiter_key("my-bucket", "table/anomesdia=20230101/file.csv")
+
+    assert key == "my-bucket/table"
+
+
+@pytest.mark.utils_concurrency
+@pytest.mark.limiter_key
+def test_limiter_key_of_a_prefix_is_the_key_of_its_objects():
+    """
+    G: Given that listings are limited by their prefix and reads by their
+       object keys
+    W: When the function limiter_key() is called with prefixes (with and
+       without a trailing slash) and with keys under them
+    T: Then all of them must share the same limiter key, while objects on
+       the root of the bucket share the root key
+    """
+
+    prefix_keys = {limiter_key("my-bucket", prefix, is_prefix=True)
+                   for prefix in ("table", "table/", "table/anomesdia=")}
+    object_keys = {limiter_key("my-bucket", key)
+                   for key in ("table/file.csv",
+                               "table/anomesdia=20230101/file.csv")}
+
+    assert prefix_keys == object_keys == {"my-bucket/table"}
+    assert limiter_key("my-bucket", "file.csv") == \
+        limiter_key("my-bucket", "", is_prefix=True) == "my-bucket/"
+
+
+@pytest.mark.utils_concurrency
+@pytest.mark.adaptive_concurrency_limiter
+def test_limiter_shrinks_on_throttling_and_grows_back_on_success():
+    """
+    G: Given that an AdaptiveConcurrencyLimiter controls calls for a key
+    W: When a call is throttled and then many calls succeed
+    T: Then the limit must be cut multiplicatively and then grow back
+    """
+
+    limiter = AdaptiveConcurrencyLimiter(max_limit=16, initial_limit=8)
+
+    started_at = limiter.acquire("key")
+    limiter.release("key", started_at, throttled=True)
+    assert limiter.limit("key") == 4
+
+    for _ in range(50):
+        limiter.release("key", limiter.acquire("key"))
+    assert limiter.limit("key") > 4
+
+
+@pytest.mark.utils_concurrency
+@pytest.mark.adaptive_concurrency_limiter
+def test_limiter_converges_under_the_capacity_of_a_throttling_stub():
+    """
+    G: Given a stub that throttles more than 4 concurrent calls
+    W: When 300 calls are made by 32 threads through the limiter
+    T: Then all calls must succeed and the limit must settle near the
+       capacity of the stub, throttling much less than without the limiter
+    """
+
+    stub = ThrottlingStub(capacity=4)
+    limiter = AdaptiveConcurrencyLimiter(max_limit=32, initial_limit=32,
+                                         backoff_base=0.001)
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        results = list(executor.map(
+            lambda i: limiter.run("bucket/hot-prefix", stub, i),
+            range(300)
+        ))
+
+    assert results == list(range(300))
+    assert limiter.limit("bucket/hot-prefix") <= 8
+    assert stub.throttles < 300
+
+
+@pytest.mark.utils_concurrency
+@pytest.mark.adaptive_concurrency_limiter
+def test_limiter_counts_attempts_retried_by_botocore():
+    """
+    G: Given a call whose throttled attempts are retried by botocore before
+       it raises a SlowDown error
+    W: When the call is run by a limiter with max_attempts=8
+    T: Then each throttled attempt must shrink the limit while the call is
+       running and attempts retried by botocore must count toward
+       max_attempts, so the call is run twice instead of eight times
+    """
+
+    limiter = AdaptiveConcurrencyLimiter(max_limit=16, initial_limit=16,
+                                         max_attempts=8, backoff_base=0.001)
+    limits = []
+
+    def throttled_call():
+        # botocore feeds each of its 5 attempts before raising
+        for _ in range(5):
+            record_retried_throttle(slow_down_error().response)
+        limits.append(limiter.limit("key"))
+        raise slow_down_error()
+
+    with pytest.raises(Exception):
+        limiter.run("key", throttled_call)
+
+    assert len(limits) == 2
+    assert limits[0] == 8
+    assert limiter.stats()["key"]["throttles"] == 10
+    assert limiter.stats()["key"]["in_flight"] == 0
+
+
+@pytest.mark.utils_concurrency
+@pytest.mark.rate_limiter
+def test_rate_limiter_spaces_calls_of_many_threads():
+    """
+    G: Given a rate limiter of 200 calls per second with a burst of 10
+    W: When 50 calls are made by 8 threads through the limiter
+    T: Then the burst must be served at once and the remaining calls must
+       take at least the time of the rate
+    """
+
+    rate_limiter = RateLimiter(rate=200, burst=10)
+
+    started_at = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        waits = list(executor.map(lambda _: rate_limiter.acquire(),
+                                  range(50)))
+    elapsed = time.monotonic() - started_at
+
+    assert sum(wait == 0 for wait in waits) >= 10
+    assert elapsed >= 40 / 200 * 0.95
+
+
+@pytest.mark.utils_concurrency
+@pytest.mark.rate_limiter
+def test_error_when_creating_a_rate_limiter_without_a_positive_rate():
+    """
+    G: Given that rates are calls per second
+    W: When a RateLimiter is created with a rate of zero
+    T: Then a ValueError exception must be raised
+    """
+
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
@@ -0,0 +1,101 @@
+"""Test cases for features defined on cloudgeass.utils.keyindex module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+
+from cloudgeass.testing.data import partitioned_keys
+from cloudgeass.utils.keyindex import KeyIndex
+
+
+# Keys of a partitioned table, sorted as listed by S3
+KEYS = sorted(partitioned_keys(n_keys=5000))
+
+
+@pytest.mark.utils_keyindex
+@pytest.mark.key_index
+def test_key_index_answers_every_indexed_and_missing_key():
+    """
+    G: Given that keys of a partitioned table were indexed
+    W: When keys are searched on the index
+    T: Then every indexed key must be found, no missing key must be found
+       and the Bloom filter must reject most missing keys
+    """
+
+    index = KeyIndex.from_keys(KEYS, false_positive_rate=0.01)
+    missing_keys = [key + ".tmp" for key in KEYS]
+
+    assert len(index) == len(KEYS)
+    assert list(index) == KEYS
+    assert all(key in index for key in KEYS)
+    assert not any(key in index for key in missing_keys)
+    assert sum(map(index.might_contain, missing_keys)) < 0.03 * len(KEYS)
+    assert len(index.data) < sum(len(key) for key in KEYS) / 2
+
+
+@pytest.mark.utils_keyindex
+@pytest.mark.key_index
+def test_key_index_is_the_same_after_being_saved_and_loaded(tmp_path):
+    """
+    G: Given that an index of a bucket prefix was saved on a file
+    W: When the file is loaded with KeyIndex.load()
+    T: Then the loaded index must hold the same keys, bucket and prefix
+    """
+
+    path = str(tmp_path / "index" / "table.keyindex")
+    KeyIndex.from_keys(KEYS, bucket_name="bucket", prefix="table/").save(path)
+
+    index = KeyIndex.load(path)
+
+    assert list(index) == KEYS
+    assert KEYS[1234] in index
+    assert index.covers("bucket", KEYS[0])
+    assert not index.covers("other-bucket", KEYS[0])
+    assert not index.covers("bucket", "other/" + KEYS[0])
+
+
+@pytest.mark.utils_keyindex
+@pytest.mark.key_index
+def test_empty_key_index_finds_no_key():
+    """
+    G: Given that a prefix without objects was indexed
+    W: When keys are searched on the index
+    T: Then no key must be found
+    """
+
+    index = KeyIndex.from_keys([])
+
+    assert len(index) == 0
+    assert "table/file.csv" not in index
+    assert "" not in index
+
+
+@pytest.mark.utils_keyindex
+@pytest.mark.key_index
+def test_error_when_indexing_keys_out_of_order():
+    """
+    G: Given that keys must be indexed in the order of S3 listings
+    W: When KeyIndex.from_keys() is called with unsorted keys
+    T: Then a ValueError exception must be raised
+    """
+
+    with pytest.raises(ValueError):
+        KeyIndex.from_keys(["b.csv", "a.csv"])
+
+
+@pytest.mark.utils_keyindex
+@pytest.mark.key_index
+def test_error_when_loading_a_file_that_is_not_a_key_index(tmp_path):
+    """
+    G: Given that a file wasn't saved by KeyIndex.save()
+    W: When KeyIndex.load() is called on it
+    T: Then a ValueError exception must be raised
+    """
+
+    path = tmp_path / "report.arrow"
+    path.write_bytes(b"ARROW1")
+
+    with pytest.raises(ValueError):
+        KeyIndex.load(str(path))
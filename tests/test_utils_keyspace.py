@@ -0,0 +1,56 @@
+"""Test cases for features defined on cloudgeass.utils.keyspace module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+
+from cloudgeass.utils.keyspace import branch_midpoint, key_ranges
+
+
+@pytest.mark.utils_keyspace
+@pytest.mark.branch_midpoint
+@pytest.mark.parametrize("low,high,level", [
+    ("table/a", "table/c", 6),
+    ("sales/anomesdia=20000101/", "sales/anomesdia=20270518/", 18),
+    ("dados/ação", "dados/ônibus", 6)
+])
+def test_branch_midpoint_returns_a_string_between_both_keys(low, high, level):
+    """
+    G: Given that users want to split the branches between two keys
+    W: When the function branch_midpoint() is called
+    T: Then the returned string must be sorted between both keys and share
+       their first characters
+    """
+
+    midpoint = branch_midpoint(low, high, level)
+
+    assert low < midpoint < high
+    assert midpoint[:level] == low[:level]
+
+
+@pytest.mark.utils_keyspace
+@pytest.mark.branch_midpoint
+def test_branch_midpoint_of_adjacent_branches_is_none():
+    """
+    G: Given that two keys differ by adjacent characters
+    W: When the function branch_midpoint() is called
+    T: Then None must be returned, as there's no branch between them
+    """
+
+    assert branch_midpoint("table/a1", "table/b0", level=6) is None
+
+
+@pytest.mark.utils_keyspace
+@pytest.mark.key_ranges
+def test_key_ranges_cover_the_whole_keyspace():
+    """
+    G: Given that users want to split the keyspace on sorted boundaries
+    W: When the function key_ranges() is called
+    T: Then ranges must be open on both ends of the keyspace and each
+       boundary must end a range and start the next one
+    """
+
+    assert key_ranges(["b", "d"]) == [(None, "b"), ("b", "d"), ("d", None)]
+    assert key_ranges([]) == [(None, None)]
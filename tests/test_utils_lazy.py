@@ -0,0 +1,53 @@
+"""Test cases for features defined on cloudgeass.utils.lazy module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+
+import subprocess
+import sys
+
+from cloudgeass.utils.lazy import lazy_import
+
+
+@pytest.mark.utils_lazy
+@pytest.mark.lazy_import
+def test_lazy_import_only_imports_the_module_on_first_attribute_access():
+    """
+    G: Given that users want to defer the import of a module
+    W: When the function lazy_import() is called and an attribute of the
+       returned proxy is accessed
+    T: Then the attribute of the real module must be returned
+    """
+
+    json_module = lazy_import("json")
+
+    assert json_module.loads("[1, 2]") == [1, 2]
+
+
+@pytest.mark.utils_lazy
+@pytest.mark.parametrize("module_name", [
+    "cloudgeass.aws.s3",
+    "cloudgeass.aws.ec2",
+    "cloudgeass.aws.secrets"
+])
+def test_importing_cloudgeass_modules_does_not_load_heavy_dependencies(
+    module_name
+):
+    """
+    G: Given that users want fast cold starts when importing cloudgeass
+    W: When a cloudgeass service module is imported in a fresh interpreter
+    T: Then pandas, boto3, botocore and requests must not be loaded
+    """
+
+    check_code = (
+        f"import sys, {module_name}; "
+        "print([m for m in ('pandas', 'boto3', 'botocore', 'requests') "
+        "if m in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", check_code],
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
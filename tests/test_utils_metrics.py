@@ -0,0 +1,63 @@
+"""Test cases for features defined on cloudgeass.utils.metrics module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+
+from cloudgeass.utils.metrics import MetricsRegistry
+
+
+@pytest.mark.utils_metrics
+@pytest.mark.metrics_registry
+def test_snapshot_returns_counters_and_histogram_quantiles():
+    """
+    G: Given that users recorded counters and latencies in a registry
+    W: When the method snapshot() is called
+    T: Then counters must be summed by labels and histograms must expose
+       count, sum and quantiles
+    """
+
+    registry = MetricsRegistry()
+    registry.inc("calls_total", {"operation": "ListObjectsV2"})
+    registry.inc("calls_total", {"operation": "ListObjectsV2"})
+    for latency in (0.001, 0.02, 0.02, 0.3):
+        registry.observe("latency_seconds", {"operation": "ListObjectsV2"},
+                         latency)
+
+    snapshot = registry.snapshot()
+    histogram = snapshot["histograms"]["latency_seconds"][0]
+
+    assert snapshot["counters"]["calls_total"][0]["value"] == 2
+    assert histogram["count"] == 4
+    assert histogram["p50"] == 0.025
+    assert histogram["p99"] == 0.5
+
+
+@pytest.mark.utils_metrics
+@pytest.mark.metrics_registry
+def test_prometheus_export_follows_the_text_exposition_format():
+    """
+    G: Given that users recorded counters and latencies in a registry
+    W: When the method to_prometheus() is called
+    T: Then the output must have TYPE lines, labeled samples and the
+       histogram buckets, sum and count series
+    """
+
+    registry = MetricsRegistry(latency_buckets=(0.1, 1.0))
+    registry.inc("calls_total", {"service": "s3"}, 3)
+    registry.observe("latency_seconds", {"service": "s3"}, 0.5)
+
+    expected = "\n".join([
+        "# TYPE calls_total counter",
+        'calls_total{service="s3"} 3',
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{service="s3",le="0.1"} 0',
+        'latency_seconds_bucket{service="s3",le="1.0"} 1',
+        'latency_seconds_bucket{service="s3",le="+Inf"} 1',
+        'latency_seconds_sum{service="s3"} 0.5',
+        'latency_seconds_count{service="s3"} 1'
+    ]) + "\n"
+
+    assert registry.to_prometheus() == expected
@@ -0,0 +1,129 @@
+"""Test cases for features defined on cloudgeass.utils.patterns module.
+
+___
+"""
+
+# Importing libraries
+import re
+
+import pytest
+
+from cloudgeass.utils import patterns
+from cloudgeass.utils.patterns import (
+    compile_key_pattern,
+    literal_prefix,
+    pushdown_prefix
+)
+
+
+@pytest.mark.utils_patterns
+@pytest.mark.literal_prefix
+@pytest.mark.parametrize("pattern,expected_prefix", [
+    ("sales/anomesdia=2023*.parquet", "sales/anomesdia=2023"),
+    ("sales/part-0000?.csv", "sales/part-0000"),
+    ("sales/[ab]*", "sales/"),
+    ("*.parquet", ""),
+    ("sales/file.csv", "sales/file.csv"),
+    (re.compile(r"^sales/anomesdia=2023\d{4}/"), "sales/anomesdia=2023"),
+    (re.compile(r"\Asales/(?:csv|json)/"), "sales/"),
+    (re.compile(r"^sales/(csv)/x+"), "sales/csv/"),
+    (re.compile(r"^sales/ab?"), "sales/a")
+])
+def test_literal_prefix_of_globs_and_anchored_regexes(pattern,
+                                                      expected_prefix):
+    """
+    G: Given that users want to filter keys with a glob or a regex
+    W: When the function literal_prefix() is called
+    T: Then the literal characters at the start of the pattern must be
+       returned
+    """
+
+    assert literal_prefix(pattern) == expected_prefix
+
+
+@pytest.mark.utils_patterns
+@pytest.mark.literal_prefix
+@pytest.mark.parametrize("pattern", [
+    re.compile(r"sales/"),
+    re.compile(r"^sales/", re.IGNORECASE),
+    re.compile(r"(?m)^sales/"),
+    re.compile(r"^sales/|^orders/")
+])
+def test_literal_prefix_of_regexes_not_bound_to_a_prefix_is_empty(pattern):
+    """
+    G: Given that a regex may match keys with different prefixes
+    W: When the function literal_prefix() is called with a regex not
+       anchored at the start, case insensitive, multiline or with
+       alternatives
+    T: Then an empty prefix must be returned
+    """
+
+    assert literal_prefix(pattern) == ""
+
+
+@pytest.mark.utils_patterns
+@pytest.mark.literal_prefix
+def test_literal_prefix_is_empty_without_the_private_regex_parser(
+    monkeypatch
+):
+    """
+    G: Given that the regex parser is private to the re module and may be
+       missing on some Python versions
+    W: When the function literal_prefix() is called without it
+    T: Then an empty prefix must be returned, so keys are fully listed
+    """
+
+    monkeypatch.setattr(patterns, "sre_parse", None)
+
+    assert literal_prefix("sales/*.csv") == ""
+
+
+@pytest.mark.utils_patterns
+@pytest.mark.compile_key_pattern
+def test_compiled_globs_match_whole_keys():
+    """
+    G: Given that users want to filter keys with a glob
+    W: When the function compile_key_pattern() is called
+    T: Then searching the compiled pattern must only match whole keys,
+       with "*" matching "/" too
+    """
+
+    key_pattern = compile_key_pattern("*/anomesdia=2023*.parquet")
+
+    assert key_pattern.search("sales/anomesdia=20230101/part-0.parquet")
+    assert not key_pattern.search("sales/anomesdia=20230101/part-0.csv")
+    assert not key_pattern.search("x/sales/anomesdia=2022/2023.parquet.gz")
+
+
+@pytest.mark.utils_patterns
+@pytest.mark.compile_key_pattern
+def test_error_on_compiling_a_pattern_of_an_invalid_type():
+    """
+    G: Given that key patterns are globs or compiled regexes
+    W: When the function compile_key_pattern() is called with bytes
+    T: Then a TypeError must be raised
+    """
+
+    with pytest.raises(TypeError):
+        compile_key_pattern(b"*.parquet")
+
+
+@pytest.mark.utils_patterns
+@pytest.mark.pushdown_prefix
+@pytest.mark.parametrize("prefix,pattern,expected_prefix", [
+    ("", "sales/*.csv", "sales/"),
+    ("sales/", "sales/anomesdia=2023*", "sales/anomesdia=2023"),
+    ("sales/anomesdia=2023", "sales/*", "sales/anomesdia=2023"),
+    ("orders/", "sales/*", None)
+])
+def test_pushdown_prefix_keeps_the_longest_compatible_prefix(
+    prefix, pattern, expected_prefix
+):
+    """
+    G: Given that users want to list keys with a prefix and a pattern
+    W: When the function pushdown_prefix() is called
+    T: Then the longest of both prefixes must be returned if one starts
+       with the other, or None otherwise
+    """
+
+    assert pushdown_prefix(prefix, pattern) == expected_prefix
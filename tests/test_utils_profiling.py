@@ -0,0 +1,132 @@
+"""Test cases for features defined on cloudgeass.utils.profiling module.
+
+___
+"""
+
+# Importing libraries
+import pytest
+
+import json
+import os
+import pstats
+import tracemalloc
+
+from cloudgeass.testing.backends import StubS3Backend, SyntheticBucket
+from cloudgeass.utils.profiling import (
+    PROFILE_ENV_VAR,
+    PROFILES_INDEX_FILE,
+    Profiler,
+    profiling
+)
+
+
+def read_index(output_dir) -> list:
+    with open(os.path.join(output_dir, PROFILES_INDEX_FILE)) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def stub_s3():
+    # A S3Client served by a synthetic bucket
+    backend = StubS3Backend([SyntheticBucket("profiled", n_keys=1500)])
+    backend.put_body("profiled", "a.csv", b"a")
+    backend.put_body("profiled", "b.csv", b"b")
+    return backend.s3_client()
+
+
+@pytest.mark.utils_profiling
+@pytest.mark.profiling
+def test_profiling_writes_cpu_and_memory_profiles_of_each_method_call(
+    stub_s3, tmp_path
+):
+    """
+    G: Given that users want to find out where a report spends its time
+    W: When the method bucket_objects_report() is called within profiling()
+    T: Then a cProfile file with pandas calls, a tracemalloc snapshot and a
+       summary line must be written for the method call
+    """
+
+    with profiling(output_dir=str(tmp_path)):
+        stub_s3.bucket_objects_report(bucket_name="profiled")
+
+    records = read_index(tmp_path)
+    prof_file, snapshot_file = records[0]["files"]
+    profiled_files = {f for f, _, _ in pstats.Stats(prof_file).stats}
+
+    assert [r["method"] for r in records] == ["S3Client.bucket_objects_report"]
+    assert any("pandas" in f for f in profiled_files)
+    assert os.path.exists(snapshot_file)
+    assert records[0]["peak_memory_bytes"] > 0
+
+
+@pytest.mark.utils_profiling
+@pytest.mark.profiling
+def test_profiling_is_turned_on_by_environment_variable(
+    stub_s3, tmp_path, monkeypatch
+):
+    """
+    G: Given that users can't edit the code of an application
+    W: When the environment variable CLOUDGEASS_PROFILE is set
+    T: Then cloudgeass method calls must be profiled in the given directory
+    """
+
+    monkeypatch.setenv(PROFILE_ENV_VAR, str(tmp_path))
+    stub_s3.list_buckets()
+
+    assert read_index(tmp_path)[0]["method"] == "S3Client.list_buckets"
+
+
+@pytest.mark.utils_profiling
+@pytest.mark.profiling
+def test_only_the_outermost_call_is_profiled(stub_s3, tmp_path):
+    """
+    G: Given that a method calls other cloudgeass methods on thread pools
+    W: When the method read_objects() is called within profiling()
+    T: Then only the read_objects() call must be recorded
+    """
+
+    with profiling(output_dir=str(tmp_path), memory=False):
+        stub_s3.read_objects(bucket_name="profiled", keys=["a.csv", "b.csv"])
+
+    assert [r["method"] for r in read_index(tmp_path)] == \
+        ["S3Client.read_objects"]
+
+
+@pytest.mark.utils_profiling
+@pytest.mark.profiling
+def test_profiling_without_tracemalloc_reset_peak_leaves_the_peak_unknown(
+    stub_s3, tmp_path, monkeypatch
+):
+    """
+    G: Given that tracemalloc.reset_peak() only exists on Python 3.9+ and
+       tracemalloc is already tracing
+    W: When a method call is profiled without reset_peak()
+    T: Then the call must be profiled with an unknown peak instead of
+       failing or reporting the peak of earlier allocations
+    """
+
+    monkeypatch.delattr(tracemalloc, "reset_peak")
+    tracemalloc.start()
+    try:
+        with profiling(output_dir=str(tmp_path)):
+            stub_s3.list_buckets()
+    finally:
+        tracemalloc.stop()
+
+    record = read_index(tmp_path)[0]
+
+    assert record["method"] == "S3Client.list_buckets"
+    assert record["peak_memory_bytes"] is None
+
+
+@pytest.mark.utils_profiling
+@pytest.mark.profiling
+def test_error_on_creating_a_profiler_with_an_invalid_engine():
+    """
+    G: Given that users want to profile cloudgeass calls
+    W: When a Profiler is created with an invalid engine
+    T: Then a ValueError exception must be raised
+    """
+
+    with pytest.raises(ValueError):
+        _ = Profiler(engine="perf")
@@ -0,0 +1,228 @@
+"""Test cases for features defined on cloudgeass.utils.tracing module.
+
+___
+"""
+
+# Importing libraries
+import asyncio
+import pytest
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from moto import mock_s3
+
+from cloudgeass.utils.tracing import (
+    NoopTracer,
+    RecordingTracer,
+    get_tracer,
+    set_tracer,
+    span,
+    traced,
+    propagate
+)
+
+from tests.helpers.user_inputs import NON_EMPTY_BUCKET_NAME
+
+
+@pytest.fixture
+def tracer():
+    # Recording spans in memory for each test case
+    tracer = set_tracer(RecordingTracer())
+    yield tracer
+    set_tracer(None)
+
+
+@pytest.mark.utils_tracing
+@pytest.mark.set_tracer
+def test_noop_tracer_is_used_by_default_without_opentelemetry():
+    """
+    G: Given that OpenTelemetry isn't installed in the environment
+    W: When the default tracer is restored with set_tracer(None)
+    T: Then the active tracer must be a NoopTracer
+    """
+
+    try:
+        import opentelemetry  # noqa: F401
+        pytest.skip("OpenTelemetry is installed")
+    except ImportError:
+        pass
+
+    assert isinstance(set_tracer(None), NoopTracer)
+    assert get_tracer() is get_tracer()
+
+
+@pytest.mark.utils_tracing
+@pytest.mark.traced
+def test_traced_functions_nest_spans_across_thread_pools(tracer):
+    """
+    G: Given that a traced function submits propagated calls to a pool
+    W: When the traced function is called
+    T: Then spans opened on the pool threads must be children of the
+       traced function span
+    """
+
+    def child(i):
+        with span("child", index=i):
+            return i
+
+    @traced("parent")
+    def parent():
+        with ThreadPoolExecutor(4) as executor:
+            return list(executor.map(propagate(child), range(8)))
+
+    assert parent() == list(range(8))
+
+    parent_span = [s for s in tracer.spans if s["name"] == "parent"][0]
+    children = tracer.children(parent_span["span_id"])
+
+    assert len(children) == 8
+    assert {c["attributes"]["index"] for c in children} == set(range(8))
+
+
+@pytest.mark.utils_tracing
+@pytest.mark.traced
+def test_traced_coroutines_keep_their_spans_apart_on_one_loop(tracer):
+    """
+    G: Given that traced coroutines run concurrently on the same event loop
+    W: When many traced coroutines are gathered
+    T: Then each span must last until its coroutine is done and spans
+       opened within each coroutine must be children of its own span
+    """
+
+    @traced("coroutine")
+    async def coroutine(i):
+        await asyncio.sleep(0.01)
+        with span("child", index=i):
+            return i
+
+    async def main():
+        return await asyncio.gather(*(coroutine(i) for i in range(8)))
+
+    assert asyncio.run(main()) == list(range(8))
+
+    parents = [s for s in tracer.spans if s["name"] == "coroutine"]
+    assert len(parents) == 8
+    assert all(s["duration"] >= 0.01 for s in parents)
+    assert sorted(c["attributes"]["index"] for p in parents
+                  for c in tracer.children(p["span_id"])) == list(range(8))
+
+
+@pytest.mark.utils_tracing
+@pytest.mark.traced
+def test_traced_generators_keep_their_spans_until_exhausted(tracer):
+    """
+    G: Given that a traced generator function yields items lazily
+    W: When its items are consumed by a loop that opens spans of its own
+    T: Then the generator span must only be finished once the generator is
+       exhausted, with the spans of its body as children and without the
+       spans of the consumer
+    """
+
+    @traced("generator")
+    def generator():
+        for i in range(3):
+            with span("item", index=i):
+                pass
+            yield i
+
+    items = generator()
+    assert tracer.spans == []
+
+    for i in items:
+        with span("consumer", index=i):
+            pass
+
+    generator_span = [s for s in tracer.spans if s["name"] == "generator"][0]
+    children = tracer.children(generator_span["span_id"])
+
+    assert tracer.spans[-1] is generator_span
+    assert [c["name"] for c in children] == ["item"] * 3
+    assert all(s["parent_id"] is None for s in tracer.spans
+               if s["name"] == "consumer")
+
+
+@pytest.mark.utils_tracing
+@pytest.mark.traced
+@mock_s3
+def test_aws_call_spans_are_not_left_open_when_a_before_call_handler_raises(
+    tracer, s3
+):
+    """
+    G: Given that a before-call handler registered after the tracing hook
+       fails a boto3 call
+    W: When a span is opened after the failed call
+    T: Then no AWS call span must be left open as its parent
+    """
+
+    def reject(**kwargs):
+        raise RuntimeError("Rejected by a before-call handler")
+
+    events = s3.client.meta.events
+    events.register_last("before-call", reject,
+                         unique_id="test-reject-list-buckets")
+    try:
+        # The error keeps the call frames (and their context) alive
+        with pytest.raises(RuntimeError) as error:
+            s3.client.list_buckets()
+
+    finally:
+        events.unregister("before-call",
+                          unique_id="test-reject-list-buckets")
+
+    with span("after_failure"):
+        pass
+
+    assert error.value.args == ("Rejected by a before-call handler",)
+    assert tracer.spans[-1]["name"] == "after_failure"
+    assert tracer.spans[-1]["parent_id"] is None
+
+
+@pytest.mark.utils_tracing
+@pytest.mark.traced
+@mock_s3
+def test_s3_method_span_has_aws_call_and_processing_children(
+    tracer, s3, prepare_mocked_bucket
+):
+    """
+    G: Given that a RecordingTracer is the active tracer
+    W: When the method bucket_objects_report() is called from S3Client
+    T: Then the method span must have both the ListObjectsV2 call span and
+       the DataFrame building span as children
+    """
+
+    # Preparing a mocked s3 environment with buckets and files
+    prepare_mocked_bucket()
+    tracer.spans.clear()
+
+    s3.bucket_objects_report(bucket_name=NON_EMPTY_BUCKET_NAME)
+
+    method_span = [s for s in tracer.spans
+                   if s["name"] == "S3Client.bucket_objects_report"][0]
+    children = [c["name"] for c in tracer.children(method_span["span_id"])]
+
+    assert "aws.s3.ListObjectsV2" in children
+    assert "S3Client.bucket_objects_report.build_dataframe" in children
+
+
+@pytest.mark.utils_tracing
+@pytest.mark.traced
+def test_traced_functions_only_load_profiling_when_it_is_turned_on(
+    monkeypatch
+):
+    """
+    G: Given that profiling is off unless CLOUDGEASS_PROFILE is set
+    W: When a traced method is called in a fresh interpreter
+    T: Then neither the profiling module nor inspect must be loaded
+    """
+
+    monkeypatch.delenv("CLOUDGEASS_PROFILE", raising=False)
+    check_code = (
+        "import sys; from cloudgeass.utils.tracing import traced; "
+        "traced('noop')(lambda: None)(); "
+        "print([m for m in ('cloudgeass.utils.profiling', 'inspect') "
+        "if m in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", check_code],
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"